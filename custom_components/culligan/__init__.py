@@ -2,13 +2,21 @@
 from .const import (
     API_TIMEOUT,
     CLIENT,
+    CONF_PUSH_UPDATES,
     CULLIGAN_APP_ID,
+    DATA_SESSIONS,
+    DEFAULT_PUSH_UPDATES,
     DOMAIN,
+    LIVE_OPTIONS,
     LOGGER,
     PLATFORMS,
     STARTUP_MESSAGE,
 )
+from .openmetrics import CulliganMetricsView
+from .push import WebhookPushTransport
+from .services import async_setup_services
 from .update_coordinator import CulliganUpdateCoordinator
+from .websocket_api import async_setup_websocket_api
 
 import asyncio
 import async_timeout
@@ -17,6 +25,7 @@ from ayla_iot_unofficial.device import Softener
 from culligan.culliganiot_device import CulliganIoTRO, CulliganIoTSoftener
 
 from contextlib import suppress
+from datetime import datetime, timedelta
 
 from culligan import (
     CulliganApi,
@@ -28,8 +37,14 @@ from culligan import (
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_WEBHOOK_ID
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.event import async_track_time_interval
+
+
+# How often the account is checked for devices added or removed since setup
+DISCOVERY_INTERVAL = timedelta(hours=6)
 
 
 class CannotConnect(HomeAssistantError):
@@ -46,7 +61,6 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     #       data.user_info (UI entry data just in case re-auth is needed)
     #       data.instance (title, devices, dsn[0], culligan_api)
     LOGGER.debug("title %s", config_entry.title)
-    LOGGER.debug("data %s", config_entry.data)
     LOGGER.debug("options %s", config_entry.options)
     LOGGER.debug("unique_id %s", config_entry.unique_id) # set to DSN
     LOGGER.debug("source %s", config_entry.source)
@@ -58,12 +72,20 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
         LOGGER.debug("No DOMAIN ... setting %s", DOMAIN)
         hass.data.setdefault(DOMAIN, {})
         LOGGER.info(STARTUP_MESSAGE)
-    LOGGER.debug(f"Domain is now: {hass.data[DOMAIN]}")
+        async_setup_websocket_api(hass)
+        async_setup_services(hass)
+        hass.http.register_view(CulliganMetricsView(hass))
+
+    # a reload reuses the session signed in before the unload, unless the credentials changed
+    session = hass.data.setdefault(DATA_SESSIONS, {}).pop(config_entry.entry_id, None)
 
     # if we entered from UI ... a connection check was made and an object exists already
     # don't recreate ... but also can't serialize culligan_api objects in the config_entry
     if "culligan_api" in config_entry.data["instance"].keys():
         culligan_api = config_entry.data["instance"]["culligan_api"]
+    elif session is not None and session[0] == config_entry.data["user_input"]:
+        LOGGER.debug("Reusing the CulliganApi session from before the reload")
+        culligan_api = session[1]
     #except KeyError:
     else:
         LOGGER.debug("CulliganApi instance was not passed from config_entry ... creating one")
@@ -78,70 +100,25 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
             raise ConfigEntryNotReady from exc
 
     # connect_or_timeout will set API token and CulliganAPI.Ayla
-    try:
-        LOGGER.debug("Calling connect_or_timeout to sign in and ensure API tokens")
-        # if successful, culligan_api.Ayla will be initialized
-        if not await async_connect_or_timeout(culligan_api):
-            return False
-    except CannotConnect as exc:
-        raise ConfigEntryNotReady from exc
+    # a reused session is already signed in, the coordinator refreshes its tokens
+    if session is None or culligan_api is not session[1]:
+        try:
+            LOGGER.debug("Calling connect_or_timeout to sign in and ensure API tokens")
+            # if successful, culligan_api.Ayla will be initialized
+            if not await async_connect_or_timeout(culligan_api):
+                return False
+        except CannotConnect as exc:
+            raise ConfigEntryNotReady from exc
+        if session is not None:
+            # credentials changed, the old session is not needed anymore
+            hass.async_create_background_task(
+                async_disconnect_or_timeout(session[1]), f"{DOMAIN} sign out replaced session"
+            )
     
-    # get device registry from Culligan
-    LOGGER.debug("Asking for devices from Culligan")
-    culliganiot_devices = await culligan_api.async_get_devices()
-    device_names = ", ".join(d.name for d in culliganiot_devices)
-    LOGGER.debug("Found %d Culligan device(s): %s", len(culliganiot_devices), device_names)
-    if len(culliganiot_devices) > 0:
-        for d in culliganiot_devices:
-            LOGGER.debug(f"    of type: {type(d)}")
-
-    # get device registry from ayla
-    if culligan_api.Ayla:
-        LOGGER.debug("Asking for devices from Ayla")
-        culligan_devices = await culligan_api.Ayla.async_get_devices()
-        device_names = ", ".join(d.name for d in culligan_devices)
-        LOGGER.debug("Found %d Ayla-connected Culligan device(s): %s", len(culligan_devices), device_names)
-        if len(culligan_devices) > 0:
-            for d in culligan_devices:
-                LOGGER.debug(f"    of type: {type(d)}")
-    else:
-        culligan_devices = False
-        LOGGER.debug("No Ayla instance to query devices from")
+    supported_devices = await async_get_supported_devices(culligan_api)
 
-    # combine the list of devices from both to all_devices
-    if culliganiot_devices and culligan_devices:
-        if len(culliganiot_devices) > 0 and len(culligan_devices) > 0:
-            LOGGER.debug("Adding CulliganIoT and Ayla devices together")
-            all_devices = culliganiot_devices + culligan_devices
-        elif len(culliganiot_devices) > 0 and len(culligan_devices) < 1:
-            LOGGER.debug("Only found CulliganIoT devices")
-            all_devices = culliganiot_devices
-        elif len(culliganiot_devices) < 1 and len(culligan_devices) > 0:
-            LOGGER.debug("Only found Ayla-connected devices")
-            all_devices = culligan_devices
-    elif culliganiot_devices:
-        if len(culliganiot_devices) > 0:
-            LOGGER.debug("Only found CulliganIoT devices and not culligan_devices")
-            all_devices = culliganiot_devices
-    elif culligan_devices:
-        if len(culligan_devices) > 0:
-            LOGGER.debug("Only found Ayla-connected devices and not culliganiot_devices")
-            all_devices = culligan_devices
-    else:
-        LOGGER.debug("Bad logic in devices selection")
-
-    # separate devices from supported devices since processing unsupported devices results in too many errors.
-    # CulliganIoTRO support is read-only and surfaces Smart RO cloud datapoints
-    # without enabling unknown device commands.
-    SUPPORTED_DEVICE_CLASSES = [Softener, CulliganIoTSoftener, CulliganIoTRO]
-    supported_devices = []
-    for device in all_devices:
-        if type(device) in SUPPORTED_DEVICE_CLASSES:
-            LOGGER.debug(f"Adding supported device {device.name} of {type(device)}")
-            supported_devices += [device]
-    
     # instance the data update coordinator with only supported_devices instead of all_devices
-    LOGGER.debug(f"Setting coordinator with supported_devices: {supported_devices}")
+    LOGGER.debug("Setting coordinator with %d supported device(s)", len(supported_devices))
     coordinator = CulliganUpdateCoordinator(
         hass, config_entry, culligan_api, supported_devices
     )
@@ -167,14 +144,38 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     # don't overwrite the entry_id itself ... add a properpty
     #     coordinator has an instance of api coordinator.culligan_api
     # hass.data[DOMAIN][config_entry.entry_id] = coordinator
-    LOGGER.debug(f"entry_id was: {config_entry.entry_id}")
+    LOGGER.debug("entry_id was: %s", config_entry.entry_id)
     hass.data[DOMAIN][config_entry.entry_id] = {}
     hass.data[DOMAIN][config_entry.entry_id]["coordinator"] = coordinator
+    # options the entry is running with, to tell live changes from ones that need a reload
+    hass.data[DOMAIN][config_entry.entry_id]["options"] = dict(config_entry.options)
 
     LOGGER.debug("Calling forward_entry_setup")
     # might be replaced with setups ... https://developers.home-assistant.io/docs/config_entries_index/
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
+    if config_entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES):
+        transport = WebhookPushTransport(hass, coordinator, config_entry.options[CONF_WEBHOOK_ID])
+        transport.async_start()
+        config_entry.async_on_unload(transport.async_stop)
+
+    async def async_discover_devices(now: datetime) -> None:
+        """Attach devices added to the account since setup and retire removed ones."""
+        try:
+            devices = await async_get_supported_devices(culligan_api)
+        except Exception as err:  # pylint: disable=broad-except
+            LOGGER.debug("Device discovery failed, trying again later: %s", err)
+            return
+        if not devices:
+            # an empty account is more likely a cloud hiccup, don't retire everything
+            LOGGER.debug("Device discovery returned no devices, keeping the tracked ones")
+            return
+        await coordinator.async_sync_devices(devices)
+
+    config_entry.async_on_unload(
+        async_track_time_interval(hass, async_discover_devices, DISCOVERY_INTERVAL)
+    )
+
     # HA docs signal updates
     config_entry.async_on_unload(config_entry.add_update_listener(async_update_options))
     # config_entry.add_update_listener(async_update_options)
@@ -184,6 +185,38 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     return True
 
 
+async def async_get_supported_devices(culligan_api: CulliganApi) -> list:
+    """Return the account's CulliganIoT and Ayla devices that the integration supports."""
+    # get device registry from Culligan
+    LOGGER.debug("Asking for devices from Culligan")
+    all_devices = list(await culligan_api.async_get_devices())
+    device_names = ", ".join(d.name for d in all_devices)
+    LOGGER.debug("Found %d Culligan device(s): %s", len(all_devices), device_names)
+
+    # get device registry from ayla
+    if culligan_api.Ayla:
+        LOGGER.debug("Asking for devices from Ayla")
+        ayla_devices = await culligan_api.Ayla.async_get_devices()
+        device_names = ", ".join(d.name for d in ayla_devices)
+        LOGGER.debug("Found %d Ayla-connected Culligan device(s): %s", len(ayla_devices), device_names)
+        all_devices += ayla_devices
+    else:
+        LOGGER.debug("No Ayla instance to query devices from")
+
+    # separate devices from supported devices since processing unsupported devices results in too many errors.
+    # CulliganIoTRO support is read-only and surfaces Smart RO cloud datapoints
+    # without enabling unknown device commands.
+    SUPPORTED_DEVICE_CLASSES = [Softener, CulliganIoTSoftener, CulliganIoTRO]
+    supported_devices = []
+    for device in all_devices:
+        if type(device) in SUPPORTED_DEVICE_CLASSES:
+            LOGGER.debug("Adding supported device %s of %s", device.name, type(device))
+            supported_devices += [device]
+        else:
+            LOGGER.debug("Skipping unsupported device %s of %s", device.name, type(device))
+    return supported_devices
+
+
 async def async_connect_or_timeout(culligan: CulliganApi) -> bool:
     """Connect to Ayla."""
     LOGGER.debug("async_connect_or_timeout")
@@ -204,25 +237,37 @@ async def async_connect_or_timeout(culligan: CulliganApi) -> bool:
         raise CannotConnect from exc
 
 
-async def async_disconnect_or_timeout(coordinator: CulliganUpdateCoordinator):
+async def async_disconnect_or_timeout(culligan: CulliganApi):
     """Disconnect - Invalidate Access Token"""
     LOGGER.debug("Disconnecting from Ayla Api")
-    async with async_timeout.timeout(API_TIMEOUT):
-        with suppress(
-            CulliganAuthError, CulliganAuthExpiringError, CulliganNotAuthedError
-        ):
-            await coordinator.culligan_api.async_sign_out()
-            return True
+    with suppress(asyncio.TimeoutError):
+        async with async_timeout.timeout(API_TIMEOUT):
+            with suppress(
+                CulliganAuthError, CulliganAuthExpiringError, CulliganNotAuthedError
+            ):
+                await culligan.async_sign_out()
+                return True
 
 
 async def async_update_options(hass: HomeAssistant, config_entry: ConfigEntry):
     """Update options function for options flow events"""
     LOGGER.debug("async_update_options")
-    # Reload the integration to re-instance the coordinator with a new update_interval / options
-    # hass.config_entries.async_update_entry(
-    #     config_entry, options=dict(config_entry.options)
-    # )
-    # await async_reload_entry(hass, config_entry)
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    options = dict(config_entry.options)
+    changed = {
+        key
+        for key in entry_data["options"].keys() | options.keys()
+        if entry_data["options"].get(key) != options.get(key)
+    }
+    entry_data["options"] = options
+
+    if changed and changed <= LIVE_OPTIONS:
+        LOGGER.debug("Applying options in place: %s", changed)
+        entry_data["coordinator"].async_apply_options(options)
+        return
+
+    # Reload the integration to re-instance the coordinator and entities with the new options,
+    # or with new entry data (credentials, region) when no option changed
     await hass.config_entries.async_reload(config_entry.entry_id)
 
 
@@ -230,6 +275,7 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     """Unload a config entry."""
     LOGGER.debug("async_unload_entry")
 
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     unloaded = all(
         await asyncio.gather(
             *[
@@ -239,17 +285,38 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
         )
     )
 
-    # coordinator = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
-
-    await async_disconnect_or_timeout(coordinator)
-
     if unloaded:
+        # cancel polls and commands in flight, a failed unload keeps the entry running
+        await coordinator.async_shutdown()
         hass.data[DOMAIN].pop(config_entry.entry_id)
+        # keep the signed in session for a reload, async_remove_entry signs it out
+        hass.data.setdefault(DATA_SESSIONS, {})[config_entry.entry_id] = (
+            config_entry.data["user_input"],
+            coordinator.culligan_api,
+        )
 
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Sign out the session kept for a config entry that was deleted."""
+    LOGGER.debug("async_remove_entry")
+    session = hass.data.get(DATA_SESSIONS, {}).pop(config_entry.entry_id, None)
+    if session is not None:
+        await async_disconnect_or_timeout(session[1])
+
+
+async def async_remove_config_entry_device(
+    hass: HomeAssistant, config_entry: ConfigEntry, device_entry: DeviceEntry
+) -> bool:
+    """Let a device be removed from the UI once the account no longer has it."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    return not any(
+        domain == DOMAIN and dsn in coordinator.culligan_devices
+        for domain, dsn in device_entry.identifiers
+    )
+
+
 async def async_reload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
     """Reload config entry."""
     LOGGER.debug("async_reload_entry")
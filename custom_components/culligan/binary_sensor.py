@@ -1,15 +1,22 @@
 """Binary Sensor Entities"""
-from .const import DOMAIN, LOGGER, PROPERTY_VALUE_MAP
+from .const import DOMAIN, LOGGER, SIGNAL_NEW_DEVICES
 from .entity import CulliganBaseEntity
+from .entity_descriptions import SOFTENER_BINARY_SENSORS
 from .update_coordinator import CulliganUpdateCoordinator
 from ayla_iot_unofficial.device import Device
 from collections.abc import Iterable
 from culligan.culliganiot_device import CulliganIoTDevice, CulliganIoTSoftener
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.components.binary_sensor import (
+    ENTITY_ID_FORMAT,
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import generate_entity_id
+from homeassistant.util import slugify
 
 
 async def async_setup_entry(
@@ -30,87 +37,49 @@ async def async_setup_entry(
         ", ".join([d.name for d in devices]),
     )
 
-    # id (property map key)
-    # description (name)
-    # icon
-    # device_class
-    binary_sensor_config = [
-        (
-            # Regen pending tonight
-            "regen_tonight_pending",
-            "regenerate tonight",
-            "mdi:refresh-circle",
-            None,
-        ),
-        (
-            # Vacation mode ('Gotcha', property name is 'set_vacation_mode', but ayla-iot-unofficial will 'clean' property name)
-            "vacation_mode",
-            "vacation mode",
-            "mdi:airplane",
-            BinarySensorDeviceClass.PRESENCE,
-        ),
-        (
-            # Away mode water use (alerts)
-            "away_mode_water_use",
-            "away mode alerts",
-            "mdi:water-alert",
-            BinarySensorDeviceClass.PRESENCE,
-        ),
-        (
-            # Salt level low ... mapped to salt_alarm_mode in culliganiot ... probably not correct
-            "sbt_salt_level_low",
-            "salt level low",
-            "mdi:shaker-outline",
-            None,
-        ),
-        (
-            # Valve position
-            "valve_position",
-            "bypass",
-            "mdi:valve",
-            BinarySensorDeviceClass.OPENING,
-        ),
-    ]
-
-    # Method two ... create individual sensors from a map of defined sensor attributes
-    for device in devices:
-        LOGGER.debug("Working on device: %s", device._device_serial_number)
-
-        # Generic CulliganIoT devices are exposed read-only from sensor.py only.
-        # Do not create softener-specific binary sensors for devices such as Smart RO.
-        if isinstance(device, CulliganIoTDevice) and not isinstance(device, CulliganIoTSoftener):
-            LOGGER.debug("Skipping softener binary sensors for generic CulliganIoT device: %s", device._device_serial_number)
-            continue
-
+    def _new_binary_sensors(devices: Iterable[Device] | Iterable[CulliganIoTDevice]) -> list[BinarySensorEntity]:
+        """Create the softener binary sensors of some devices."""
         binary_sensors = []
-        for sensor in binary_sensor_config:
-            LOGGER.debug("binary sensor calling async_add: %s", sensor[0])
-            binary_sensors += [
-                SoftenerBinarySensor(
-                    coordinator,
-                    config_entry,
-                    device,
-                    sensor[0],  # id (property map key)
-                    sensor[1],  # description (name)
-                    sensor[2],  # icon
-                    sensor[3],  # device class
-                )
-            ]
-
-        # add devices will add a new device (with area selection)
-        if len(binary_sensors) > 0:
+        for device in devices:
+            LOGGER.debug("Working on device: %s", device._device_serial_number)
+
+            # Generic CulliganIoT devices are exposed read-only from sensor.py only.
+            # Do not create softener-specific binary sensors for devices such as Smart RO.
+            if isinstance(device, CulliganIoTDevice) and not isinstance(device, CulliganIoTSoftener):
+                LOGGER.debug("Skipping softener binary sensors for generic CulliganIoT device: %s", device._device_serial_number)
+                continue
+
+            for description in SOFTENER_BINARY_SENSORS:
+                LOGGER.debug("binary sensor calling async_add: %s", description.key)
+                binary_sensors += [SoftenerBinarySensor(coordinator, config_entry, device, description)]
+        return binary_sensors
+
+    # Method two ... create individual sensors from the shared description catalog
+    binary_sensors = _new_binary_sensors(devices)
+
+    # one batched add for the whole fleet, add devices will add a new device (with area selection)
+    if len(binary_sensors) > 0:
+        async_add_devices(binary_sensors)
+
+    @callback
+    def _async_add_new_devices(new_devices: list[Device] | list[CulliganIoTDevice]) -> None:
+        """Add binary sensors for devices discovered after setup."""
+        if binary_sensors := _new_binary_sensors(new_devices):
             async_add_devices(binary_sensors)
 
-        LOGGER.debug("Finished binary_sensor async_add_devices")
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICES.format(config_entry.entry_id), _async_add_new_devices
+        )
+    )
+
+    LOGGER.debug("Finished binary_sensor async_add_devices")
 
 
 #class SoftenerBinarySensor(CulliganWaterSoftenerEntity):
 class SoftenerBinarySensor(CulliganBaseEntity, BinarySensorEntity):
     """Generic binary sensor template for water softener"""
 
-    has_entity_name = True
-    use_device_name = False
-
     # should_poll should be provided by the UpdateCoordinator
 
     def __init__(
@@ -118,53 +87,32 @@ class SoftenerBinarySensor(CulliganBaseEntity, BinarySensorEntity):
         coordinator: CulliganUpdateCoordinator,
         config_entry: ConfigEntry,
         device: Device | CulliganIoTDevice,
-        sensor_id: str,
-        description: str,
-        icon: str,
-        device_class: BinarySensorDeviceClass,
+        description: BinarySensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, device)
 
-        self._attr_description                              = description
-        self._attr_device_class: BinarySensorDeviceClass    = device_class
-        self._attr_icon                                     = icon
+        sensor_id                                           = description.key
+        self.entity_description                             = description
+        self._attr_name                                     = description.name
+        self._attr_device_class: BinarySensorDeviceClass    = description.device_class
+        self._attr_icon                                     = description.icon
         self._attr_sensor_id                                = sensor_id
+        self.bind_properties(sensor_id)
 
         self._attr_unique_id                                = device._device_serial_number + "_" + sensor_id
-        self.entity_id                                      = generate_entity_id("binary_sensor.{}", self._attr_unique_id, None, coordinator.hass)
+        self.entity_id                                      = ENTITY_ID_FORMAT.format(slugify(self._attr_unique_id))
 
         # self.io_culligan                                    = isinstance(device, CulliganIoTDevice)
         # self.io_ayla                                        = isinstance(device, Device)
+        self._update_from_snapshot()
 
+    def _update_from_snapshot(self) -> None:
+        """On based on the snapshot value"""
+        self._attr_is_on = bool(self.snapshot_value(self._attr_sensor_id))
 
-    @property
-    def state(self) -> bool:
-        """Overwrite state instead of creating new entity class"""
-        #LOGGER.debug(f"For {self._attr_sensor_id} got {self.device.get_property_value(self._attr_sensor_id)}")
-        if self.io_culligan:
-            SENSOR_ID         = PROPERTY_VALUE_MAP[self._attr_sensor_id]
-        else:
-            SENSOR_ID         = self._attr_sensor_id
-
-        return bool(self.device.get_property_value(SENSOR_ID))
-
-    @property
-    def is_on(self) -> bool:
-        """On based on state"""
-        return self.state
-
-    @property
-    def icon(self) -> str | None:
-        """Define the icon"""
-        return self._attr_icon
-
-    @property
-    def name(self) -> str | None:
-        """Define name as description"""
-        return f"{self._attr_description}"
-
-    @property
-    def device_class(self) -> BinarySensorDeviceClass | None:
-        """Return the set device_class"""
-        return self._attr_device_class
\ No newline at end of file
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Re-read the value and write state."""
+        self._update_from_snapshot()
+        self.async_write_ha_state()
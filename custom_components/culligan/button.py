@@ -5,13 +5,14 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.components.button import ButtonEntity
+from homeassistant.components.button import ENTITY_ID_FORMAT, ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 # from homeassistant.helpers import entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import generate_entity_id
+from homeassistant.util import slugify
 
 from .const import (
     DEFAULT_TIMED_BYPASS_MINUTES,
@@ -20,17 +21,16 @@ from .const import (
     MAX_TIMED_BYPASS_MINUTES,
     MIN_TIMED_BYPASS_MINUTES,
     PROPERTY_VALUE_MAP,
+    SIGNAL_NEW_DEVICES,
 )
+from .command_queue import SLOT_BYPASS, DeviceCommand, bypass_command
 from .entity import CulliganBaseEntity
+from .entity_descriptions import SOFTENER_BUTTONS, CulliganButtonEntityDescription
 from .update_coordinator import CulliganUpdateCoordinator
 
-from ayla_iot_unofficial.device import Device, Softener
+from ayla_iot_unofficial.device import Device
 from collections.abc import Iterable
-from culligan.culliganiot_device import CulliganIoTDevice, CulliganIoTSoftener
-
-AYLA_DEVICES = [Softener]
-CULLIGAN_IOT_DEVICES = [CulliganIoTSoftener]
-ALL_DEVICES = AYLA_DEVICES + CULLIGAN_IOT_DEVICES
+from culligan.culliganiot_device import CulliganIoTDevice
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -43,102 +43,80 @@ async def async_setup_entry(
     coordinator: CulliganUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     devices: Iterable[Device] | Iterable[CulliganIoTDevice] = coordinator.culligan_devices.values()
 
-    # name/description to be displayed in UI
-    # icon
-    # supported devices
-    softener_buttons = [
-        (
-            "clear bypass",
-            "mdi:valve-open",
-            ALL_DEVICES,
-        ),
-        (
-            "start timed bypass",
-            "mdi:timer-play-outline",
-            CULLIGAN_IOT_DEVICES,
-        )
-    ]
-
-    for device in devices:
-        LOGGER.debug("Working on adding buttons to device: %s", device._device_serial_number)
+    def _new_buttons(devices: Iterable[Device] | Iterable[CulliganIoTDevice]) -> list[SoftenerButton]:
+        """Create the buttons supported by some devices."""
         buttons = []
-        for button in softener_buttons:
-            if type(device) in button[2]:
-                LOGGER.debug("button calling async_add: %s", button[0])
-                buttons += [
-                    SoftenerButton(
-                        coordinator,
-                        # config_entry,
-                        device,
-                        button[0],  # id (property map key)
-                        button[1],  # icon on
-                    )
-                ]
-            else:
-                LOGGER.debug(f"{button[0]} not supported for {type(device)}")
-    
-        if len(buttons) > 0:
+        for device in devices:
+            LOGGER.debug("Working on adding buttons to device: %s", device._device_serial_number)
+            for description in SOFTENER_BUTTONS:
+                if type(device) in description.supported_devices:
+                    LOGGER.debug("button calling async_add: %s", description.key)
+                    buttons += [SoftenerButton(coordinator, device, description)]
+                else:
+                    LOGGER.debug("%s not supported for %s", description.key, type(device))
+        return buttons
+
+    buttons = _new_buttons(devices)
+
+    # one batched add for the whole fleet
+    if len(buttons) > 0:
+        async_add_devices(buttons)
+
+    @callback
+    def _async_add_new_devices(new_devices: list[Device] | list[CulliganIoTDevice]) -> None:
+        """Add buttons for devices discovered after setup."""
+        if buttons := _new_buttons(new_devices):
             async_add_devices(buttons)
 
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICES.format(config_entry.entry_id), _async_add_new_devices
+        )
+    )
+
     LOGGER.debug("Finished button async_add_devices")
 
 
 class SoftenerButton(CulliganBaseEntity, ButtonEntity):
     """Switch class for the Flo by Moen valve."""
 
-    # default ... sensor name is the property name alone (similar to specifying has_entity_name = True and use_device_name = False)
-    has_entity_name = True  # sensor name is Softener property name ... because device exists by default
-    use_device_name = False # sensor name is property name ... because device name is turned off by this flag
-
     def __init__(
             self, 
             coordinator: CulliganUpdateCoordinator, 
             #config_entry: ConfigEntry, 
             device: Device | CulliganIoTDevice, 
-            sensor_id: str, 
-            icon: str
+            description: CulliganButtonEntityDescription,
         ) -> None:
         """Initialize the Softener switch."""
         super().__init__(coordinator, device)
 
+        sensor_id                               = description.key
+        self.entity_description                 = description
+
         # # if CulliganIoT device
         # if self.io_culligan: # isinstance(device, CulliganIoTDevice):
         #     self._attr_sensor_id                = PROPERTY_VALUE_MAP[sensor_id]   # this is the mapped Culligan sensor data value
         # else:
         self._attr_sensor_id                    = sensor_id             # this is the ayla property map key to get sensor data value
+        self.bind_properties()                                          # buttons hold no device state
         
-        # self._attr_description                  = description
-        self._attr_icon                         = icon
+        self._attr_name                         = description.name
+        self._attr_icon                         = description.icon
 
         self._attr_unique_id                    = device._device_serial_number + "_" + self._attr_sensor_id
-        self.entity_id                          = generate_entity_id("button.{}", self._attr_unique_id, None, coordinator.hass)
+        self.entity_id                          = ENTITY_ID_FORMAT.format(slugify(self._attr_unique_id))
 
     @property
     def sensor_id(self):
         """Return the property key needed to get values"""
         return self._attr_sensor_id
 
-    @property
-    def icon(self):
-        """Define the icon"""
-        return self._attr_icon
-
-    @property
-    def name(self) -> str | None:
-        """Define name as sensor ID. This shows in the Sensor Name column of entities."""
-        return f"{self._attr_sensor_id}"
-    
-    @property
-    def unique_id(self) -> str | None:
-        """Suggest the unique id of the entity. User never sees these."""
-        return f"{self._attr_unique_id}"
-
     async def async_press(self, **kwargs: Any) -> None:
         """Close the thing / turn off the thing."""
-        LOGGER.debug(f"Pressed: {self.sensor_id}")
+        LOGGER.debug("Pressed: %s", self.sensor_id)
         if self.sensor_id in ["clear bypass"]:
             LOGGER.debug("Pressing clear bypass")
-            await self.device.async_stop_bypass_mode() # device should be a property and set with BaseEntity
+            await self.coordinator.async_run_command(self._dsn, *bypass_command(self.device, False))
         elif self.sensor_id in ["start timed bypass"]:
             duration_map = getattr(self.coordinator, "timed_bypass_minutes", {})
             if not isinstance(duration_map, dict):
@@ -149,13 +127,22 @@ class SoftenerButton(CulliganBaseEntity, ButtonEntity):
                 minutes = DEFAULT_TIMED_BYPASS_MINUTES
             minutes = max(MIN_TIMED_BYPASS_MINUTES, min(MAX_TIMED_BYPASS_MINUTES, minutes))
             LOGGER.debug("Starting timed bypass for %s minutes", minutes)
-            payload = self.device.set_command_payload("bypass.timed.on", True, minutes)
-            async with await self.device.culligan_api.async_request(
-                "post",
-                self.device.command_endpoint,
-                json=payload,
-            ) as resp:
-                json_resp = await resp.json()
-            if json_resp.get("success") is not True:
-                raise HomeAssistantError(f"Culligan timed bypass command failed: {json_resp}")
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_run_command(
+                self._dsn,
+                SLOT_BYPASS,
+                DeviceCommand(lambda: self._async_start_timed_bypass(minutes)),
+                {"time_rem_in_position": minutes},
+                lambda snapshot: (snapshot.get("time_rem_in_position") or 0) > 0,
+            )
+
+    async def _async_start_timed_bypass(self, minutes: int) -> None:
+        """Send the CulliganIoT timed bypass command."""
+        payload = self.device.set_command_payload("bypass.timed.on", True, minutes)
+        async with await self.device.culligan_api.async_request(
+            "post",
+            self.device.command_endpoint,
+            json=payload,
+        ) as resp:
+            json_resp = await resp.json()
+        if json_resp.get("success") is not True:
+            raise HomeAssistantError(f"Culligan timed bypass command failed: {json_resp}")
@@ -0,0 +1,196 @@
+"""Per-device command queue that serializes cloud writes with reads."""
+from __future__ import annotations
+
+from .const import API_TIMEOUT, LOGGER
+from .snapshot import STATUS_BYPASS, DeviceSnapshot, switch_is_on
+
+import asyncio
+from async_timeout import timeout
+
+from ayla_iot_unofficial.device import Device, Softener
+from culligan.culliganiot_device import CulliganIoTDevice
+
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+# Commands for the same slot submitted within this many seconds replace each other
+COMMAND_COALESCE_WINDOW = 0.3
+
+# Command slots, a newer command supersedes an unsent one in the same slot
+SLOT_VACATION = "vacation"
+SLOT_BYPASS = "bypass"
+
+
+class DeviceCommand(NamedTuple):
+    """One device command.
+
+    Ayla property writes also carry the property and value so that several of them
+    can be sent in a single batch_datapoints request instead of calling send.
+    """
+
+    send: Callable[[], Awaitable[Any]]
+    datapoint: tuple[str, Any] | None = None
+
+
+class PreparedCommand(NamedTuple):
+    """A command with the state to show until the cloud confirms it."""
+
+    slot: str
+    command: DeviceCommand
+    overrides: Mapping[str, Any]
+    confirmed: Callable[[DeviceSnapshot], bool]
+
+
+def vacation_command(device: Device | CulliganIoTDevice, on: bool) -> PreparedCommand:
+    """Start or stop vacation mode."""
+    return PreparedCommand(
+        SLOT_VACATION,
+        DeviceCommand(
+            device.async_start_vacation_mode if on else device.async_stop_vacation_mode,
+            ("vacation_mode", 1 if on else 0),
+        ),
+        {"vacation_mode": 1 if on else 0},
+        lambda snapshot: switch_is_on("vacation_mode", snapshot) is on,
+    )
+
+
+def bypass_command(device: Device | CulliganIoTDevice, on: bool) -> PreparedCommand:
+    """Start permanent bypass, or clear any permanent or timed bypass."""
+    if on:
+        return PreparedCommand(
+            SLOT_BYPASS,
+            DeviceCommand(device.async_start_bypass_mode, ("standard_bypass", 6)),
+            {"standard_bypass": 6, "time_rem_in_position": 255},
+            lambda snapshot: switch_is_on("standard_bypass", snapshot),
+        )
+    return PreparedCommand(
+        SLOT_BYPASS,
+        DeviceCommand(device.async_stop_bypass_mode, ("standard_bypass", 0)),
+        {"standard_bypass": 255, "time_rem_in_position": 0},
+        lambda snapshot: snapshot.get("status") != STATUS_BYPASS,
+    )
+
+
+class DeviceCommandQueue:
+    """Send one device's commands in order, never overlapping a read of the device.
+
+    Commands are held for COMMAND_COALESCE_WINDOW seconds. A newer command for the
+    same slot (e.g. vacation or bypass) replaces one that has not been sent yet, and
+    all queued Ayla property writes go out in one request.
+    """
+
+    def __init__(self, hass: HomeAssistant, device: Device | CulliganIoTDevice) -> None:
+        """Initialize the queue for one device."""
+        self.hass = hass
+        self.device = device
+        # held around every cloud write and every refresh of this device
+        self.lock = asyncio.Lock()
+        self._pending: dict[str, tuple[DeviceCommand, asyncio.Future]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+
+    async def async_submit(self, slot: str, command: DeviceCommand) -> bool:
+        """Queue a command and wait until it is sent.
+
+        Returns False if a newer command for the same slot replaced it before it was sent.
+        """
+        future = self.hass.loop.create_future()
+        if (previous := self._pending.pop(slot, None)) is not None:
+            LOGGER.debug("Coalescing %s command for %s", slot, self.device.device_serial_number)
+            previous[1].set_result(False)
+        self._pending[slot] = (command, future)
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(
+                COMMAND_COALESCE_WINDOW,
+                self._start_flush,
+            )
+        return await future
+
+    def _start_flush(self) -> None:
+        """Start sending what was queued during the coalesce window."""
+        self._flush_handle = None
+        task = self.hass.async_create_task(self._async_flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def cancel(self) -> None:
+        """Drop queued commands and cancel a send in progress."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for task in self._flush_tasks:
+            task.cancel()
+        for _, future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    async def _async_flush(self) -> None:
+        """Send everything queued, Ayla property writes as one batch."""
+        pending: dict[str, tuple[DeviceCommand, asyncio.Future]] = {}
+        try:
+            async with self.lock:
+                pending, self._pending = self._pending, {}
+                batch, single = [], []
+                for command, future in pending.values():
+                    if command.datapoint is not None and isinstance(self.device, Softener):
+                        batch.append((command, future))
+                    else:
+                        single.append((command, future))
+
+                if batch:
+                    await self._async_resolve(
+                        [future for _, future in batch],
+                        self._async_send_datapoints([command.datapoint for command, _ in batch]),
+                    )
+                for command, future in single:
+                    await self._async_resolve([future], command.send())
+        except asyncio.CancelledError:
+            for _, future in pending.values():
+                future.cancel()
+            raise
+
+    @staticmethod
+    async def _async_resolve(futures: list[asyncio.Future], send: Awaitable[Any]) -> None:
+        """Await a send and hand its outcome to everyone waiting on it.
+
+        The CulliganIoT library returns False when the cloud rejects a command.
+        """
+        try:
+            async with timeout(API_TIMEOUT):
+                if await send is False:
+                    raise HomeAssistantError("Culligan cloud rejected the command")
+        except Exception as err:  # pylint: disable=broad-except
+            for future in futures:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        for future in futures:
+            if not future.done():
+                future.set_result(True)
+
+    async def _async_send_datapoints(self, datapoints: list[tuple[str, Any]]) -> None:
+        """Write several Ayla properties with one batch_datapoints request.
+
+        Unlike Softener.async_set_property_value this does not re-read every property
+        afterwards, the coordinator's confirmation refresh takes care of that.
+        """
+        device = self.device
+        alternates = getattr(device, "alternate_mapping", None) or {}
+        batch = []
+        for key, value in datapoints:
+            if key not in device.properties_full:
+                key = alternates.get(key, key)
+            name = device.properties_full.get(key, {}).get("name", key)
+            batch += device.set_datapoint_payload(name, value)["batch_datapoints"]
+
+        LOGGER.debug("Writing %d datapoints to %s", len(batch), device.device_serial_number)
+        async with await device.ayla_api.async_request(
+            "post",
+            device.datapoints_endpoint,
+            json={"batch_datapoints": batch},
+        ) as resp:
+            if resp.status >= 400:
+                raise HomeAssistantError(f"Culligan datapoint write failed with status {resp.status}")
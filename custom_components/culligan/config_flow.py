@@ -9,7 +9,8 @@ from culligan import CulliganApi, CulliganAuthError
 from homeassistant import config_entries, core, exceptions
 from homeassistant.config_entries import ConfigEntry, OptionsFlow
 from homeassistant.core import callback
-from homeassistant.const import CONF_PASSWORD, CONF_REGION, CONF_USERNAME
+from homeassistant.components import persistent_notification, webhook
+from homeassistant.const import CONF_PASSWORD, CONF_REGION, CONF_USERNAME, CONF_WEBHOOK_ID
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
@@ -25,7 +26,15 @@ from .const import (
     API_TIMEOUT,
     AYLA_REGION_DEFAULT,
     AYLA_REGION_OPTIONS,
+    CONF_COMPACT_USAGE,
+    CONF_METRICS_ENDPOINT,
+    CONF_PUSH_UPDATES,
+    CONF_RO_DATAPOINT_ALLOWLIST,
+    CONF_RO_DATAPOINT_DENYLIST,
     CULLIGAN_APP_ID,
+    DEFAULT_COMPACT_USAGE,
+    DEFAULT_METRICS_ENDPOINT,
+    DEFAULT_PUSH_UPDATES,
     DOMAIN,
     LOGGER,
 )
@@ -268,8 +277,31 @@ class CulliganOptionsFlowHandler(config_entries.OptionsFlow):
             {
                 vol.Optional(
                     "update_interval",
-                    default=self.config_entry.data["user_input"]["update_interval"],
-                ): cv.positive_int
+                    default=self.config_entry.options.get(
+                        "update_interval",
+                        self.config_entry.data["user_input"]["update_interval"],
+                    ),
+                ): cv.positive_int,
+                vol.Optional(
+                    CONF_COMPACT_USAGE,
+                    default=self.config_entry.options.get(CONF_COMPACT_USAGE, DEFAULT_COMPACT_USAGE),
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_RO_DATAPOINT_ALLOWLIST,
+                    default=self.config_entry.options.get(CONF_RO_DATAPOINT_ALLOWLIST, ""),
+                ): cv.string,
+                vol.Optional(
+                    CONF_RO_DATAPOINT_DENYLIST,
+                    default=self.config_entry.options.get(CONF_RO_DATAPOINT_DENYLIST, ""),
+                ): cv.string,
+                vol.Optional(
+                    CONF_PUSH_UPDATES,
+                    default=self.config_entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES),
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_METRICS_ENDPOINT,
+                    default=self.config_entry.options.get(CONF_METRICS_ENDPOINT, DEFAULT_METRICS_ENDPOINT),
+                ): cv.boolean,
             }
         )
 
@@ -301,6 +333,22 @@ class CulliganOptionsFlowHandler(config_entries.OptionsFlow):
             #     },
             # )
 
+            # keep the webhook id once push updates were enabled, also while they are
+            # turned off, so the bridge keeps posting to the same path
+            webhook_id = self.config_entry.options.get(CONF_WEBHOOK_ID)
+            if user_input.get(CONF_PUSH_UPDATES):
+                if webhook_id is None:
+                    webhook_id = webhook.async_generate_id()
+                    persistent_notification.async_create(
+                        self.hass,
+                        "Post Culligan datapoint updates to "
+                        f"`{webhook.async_generate_path(webhook_id)}` on your Home Assistant.",
+                        "Culligan push updates",
+                        f"{DOMAIN}_push_{self.config_entry.entry_id}",
+                    )
+            if webhook_id is not None:
+                user_input[CONF_WEBHOOK_ID] = webhook_id
+
             # update the config entry instead of re-creating
             self.hass.config_entries.async_update_entry(
                 self.config_entry, options=user_input
@@ -0,0 +1,84 @@
+"""Per-device connectivity tracking with exponential backoff for offline devices."""
+from __future__ import annotations
+
+from .const import LOGGER
+
+from collections.abc import Mapping
+from typing import Any
+
+# Seconds until the first probe of a device that went offline, doubled after each failed probe
+PROBE_BACKOFF_BASE = 60
+PROBE_BACKOFF_MAX = 3600
+
+
+def listed_online(listing: Mapping[str, Any]) -> bool:
+    """Return whether a cloud device listing reports the device as connected.
+
+    Ayla lists carry connection_status, the CulliganIoT registry carries
+    status.connection.online. A listing without either counts as online.
+    """
+    if "connection_status" in listing:
+        return listing["connection_status"] == "Online"
+    connection = (listing.get("status") or {}).get("connection") or {}
+    if "online" in connection:
+        return bool(connection["online"])
+    return True
+
+
+class DeviceConnectivity:
+    """Connectivity of one device, and when an offline device may be probed again.
+
+    An online device is polled every refresh. A device the cloud lists offline is
+    not polled at all until it is listed online again. Once a poll fails the device
+    is only probed, whatever the listing says, first after PROBE_BACKOFF_BASE seconds
+    and then twice as long after every probe that fails, up to PROBE_BACKOFF_MAX.
+    """
+
+    def __init__(self, dsn: str) -> None:
+        """Start out online, so the first refresh polls every device."""
+        self.dsn = dsn
+        self.online = True
+        self.listed_offline = False
+        self.failures = 0
+        self.next_probe = 0.0
+
+    def should_poll(self, now: float) -> bool:
+        """Return whether a device listed online is online or due for a probe."""
+        return self.online or now >= self.next_probe
+
+    def mark_online(self) -> bool:
+        """Record a successful poll, returning whether the device came back."""
+        changed = not self.online
+        if changed:
+            LOGGER.info("Culligan device %s is back online", self.dsn)
+        self.online = True
+        self.listed_offline = False
+        self.failures = 0
+        return changed
+
+    def mark_listed_offline(self) -> bool:
+        """Record an offline listing, returning whether the device just went offline.
+
+        The backoff starts over, the device is polled as soon as it is listed online again.
+        """
+        changed = self.online
+        if changed:
+            LOGGER.info("Culligan device %s is listed offline", self.dsn)
+        self.online = False
+        self.listed_offline = True
+        self.failures = 0
+        self.next_probe = 0.0
+        return changed
+
+    def mark_offline(self, now: float) -> bool:
+        """Record a failed poll, returning whether the device just went offline."""
+        changed = self.online
+        if changed:
+            LOGGER.info("Culligan device %s is offline, probing it at a lower rate", self.dsn)
+        self.online = False
+        self.listed_offline = False
+        delay = min(PROBE_BACKOFF_BASE * 2**self.failures, PROBE_BACKOFF_MAX)
+        self.failures += 1
+        self.next_probe = now + delay
+        LOGGER.debug("Next probe of %s in %ss", self.dsn, delay)
+        return changed
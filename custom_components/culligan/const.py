@@ -10,6 +10,8 @@ LOGGER = getLogger(__package__)
 CLIENT: Final = "client"
 DOMAIN: Final = "culligan"
 DEFAULT_NAME = DOMAIN
+# hass.data key of signed in CulliganApi sessions kept across unload, by entry_id
+DATA_SESSIONS: Final = f"{DOMAIN}_sessions"
 NAME = "Culligan"
 ISSUE_URL = "https://github.com/rewardone/homeassistant-culligan-water-softener/issues"
 VERSION = "1.3.7"
@@ -17,6 +19,16 @@ VERSION = "1.3.7"
 # Polling
 API_TIMEOUT = 20
 
+# Events
+EVENT_DATAPOINTS_CHANGED: Final = "culligan_datapoints_changed"
+
+# Dispatcher signals, formatted with the config entry id
+SIGNAL_NEW_DATAPOINTS: Final = "culligan_new_datapoints_{}"
+# Dispatcher signal, formatted with the config entry id, carrying the devices discovery attached
+SIGNAL_NEW_DEVICES: Final = "culligan_new_devices_{}"
+# Dispatcher signal, formatted with the config entry id, carrying the dsn of a device discovery retired
+SIGNAL_DEVICE_RETIRED: Final = "culligan_device_retired_{}"
+
 # Ayla currently has domains for EU, CN, and everywhere else
 AYLA_REGION_ELSEWHERE: Final = "Elsewhere"
 AYLA_REGION_EU: Final = "Europe"
@@ -25,6 +37,20 @@ AYLA_REGION_OPTIONS = [AYLA_REGION_ELSEWHERE, AYLA_REGION_EU]
 
 # Configuration and options
 CONF_ENABLED = "enabled"
+CONF_COMPACT_USAGE = "compact_usage"
+DEFAULT_COMPACT_USAGE = False
+# comma separated Smart RO datapoint ids, * and ? wildcards allowed
+CONF_RO_DATAPOINT_ALLOWLIST = "ro_datapoint_allowlist"
+CONF_RO_DATAPOINT_DENYLIST = "ro_datapoint_denylist"
+CONF_UPDATE_INTERVAL = "update_interval"
+# accept datapoint updates pushed to a webhook, cloud polling then only reconciles
+CONF_PUSH_UPDATES = "push_updates"
+DEFAULT_PUSH_UPDATES = False
+# serve coordinator and API counters as OpenMetrics text on /api/culligan/metrics
+CONF_METRICS_ENDPOINT = "metrics_endpoint"
+DEFAULT_METRICS_ENDPOINT = False
+# options the running coordinator applies in place, changing any other one reloads the entry
+LIVE_OPTIONS: Final = frozenset({CONF_UPDATE_INTERVAL, CONF_METRICS_ENDPOINT})
 
 # Culligans App ID
 CULLIGAN_APP_ID = "OAhRjZjfBSwKLV8MTCjscAdoyJKzjxQW"
@@ -48,6 +74,11 @@ If you have any issues with this you need to open an issue here:
 -------------------------------------------------------------------
 """
 
+# Rolling usage windows reported by softeners, in slot order (slot 1 is the most recent)
+HOURLY_USAGE_KEYS = [f"hourly_usage_hour_{hour}" for hour in range(1, 25)]
+DAILY_USAGE_KEYS = [f"daily_usage_day_{day}" for day in range(1, 8)]
+WEEKDAY_AVERAGE_KEYS = ["avg_sun", "avg_mon", "avg_tue", "avg_wed", "avg_thr", "avg_fri", "avg_sat"]
+
 # key is Ayla property, value is culliganIoT property
 PROPERTY_VALUE_MAP = {
     "actual_state_dealer_bypass": "actual_state_dealer_bypass",        # no sensor created
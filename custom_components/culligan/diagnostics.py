@@ -0,0 +1,107 @@
+"""Diagnostics support for Culligan."""
+from __future__ import annotations
+
+from .const import DOMAIN
+from .update_coordinator import CulliganUpdateCoordinator
+
+from collections import Counter
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntry
+
+TO_REDACT = {
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_WEBHOOK_ID,
+    # runtime CulliganApi and device objects handed over by the config flow
+    "instance",
+    "gbe_serial_number",
+    "ip",
+    "lan_ip",
+    "mac",
+    "ssid",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: CulliganUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    entities = er.async_entries_for_config_entry(er.async_get(hass), config_entry.entry_id)
+    return {
+        "entry": {
+            "data": async_redact_data(config_entry.data, TO_REDACT),
+            "options": async_redact_data(config_entry.options, TO_REDACT),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "online_devices": sorted(coordinator.online_dsns),
+            "auth_expiration": _auth_expiration(coordinator),
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "entities_per_platform": dict(Counter(entry.domain for entry in entities)),
+        "devices": {
+            dsn: _device_diagnostics(coordinator, dsn) for dsn in coordinator.culligan_devices
+        },
+    }
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry, device: DeviceEntry
+) -> dict[str, Any]:
+    """Return diagnostics for one device, with the errors and connectivity changes it caused."""
+    coordinator: CulliganUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    dsns = [identifier for domain, identifier in device.identifiers if domain == DOMAIN]
+    metrics = coordinator.metrics.as_dict()
+    return {
+        dsn: {
+            **_device_diagnostics(coordinator, dsn),
+            "errors": [error for error in metrics["errors"] if error["dsn"] == dsn],
+            "connectivity_history": [
+                change for change in metrics["connectivity"] if change["dsn"] == dsn
+            ],
+        }
+        for dsn in dsns
+        if dsn in coordinator.culligan_devices
+    }
+
+
+def _device_diagnostics(coordinator: CulliganUpdateCoordinator, dsn: str) -> dict[str, Any]:
+    """Return the redacted snapshot, connectivity state and data freshness of one device."""
+    device = coordinator.culligan_devices[dsn]
+    snapshot = coordinator.get_snapshot(dsn)
+    connectivity = coordinator.connectivity(dsn)
+    freshness = coordinator.freshness(dsn)
+    return {
+        "type": type(device).__name__,
+        "online": coordinator.device_is_online(dsn),
+        "probe_failures": connectivity.failures if connectivity else None,
+        "snapshot_updated_at": snapshot.updated_at.isoformat() if snapshot else None,
+        "fresh": coordinator.device_is_fresh(dsn),
+        "freshness": freshness.as_dict() if freshness else None,
+        "snapshot": async_redact_data(dict(snapshot.values), TO_REDACT) if snapshot else None,
+        "known_keys": sorted(coordinator.known_keys(dsn)),
+        "needed_properties": sorted(needed)
+        if (needed := coordinator.needed_properties(dsn)) is not None
+        else None,
+    }
+
+
+def _auth_expiration(coordinator: CulliganUpdateCoordinator) -> dict[str, str | None]:
+    """Return when the Culligan and Ayla sessions expire."""
+    expirations = {"culligan": coordinator.culligan_api.auth_expiration}
+    if coordinator.culligan_api.Ayla:
+        expirations["ayla"] = coordinator.culligan_api.Ayla.auth_expiration
+    return {
+        name: expiration.isoformat() if expiration is not None else None
+        for name, expiration in expirations.items()
+    }
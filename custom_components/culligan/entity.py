@@ -1,6 +1,7 @@
 """CulliganEntity class"""
 from .const import DOMAIN, LOGGER
-from .update_coordinator import CulliganUpdateCoordinator
+from .snapshot import DeviceSnapshot
+from .update_coordinator import CulliganUpdateCoordinator, ListenerContext
 from ayla_iot_unofficial.device import Device, Softener
 from culligan.culliganiot_device import CulliganIoTDevice, CulliganIoTRO, CulliganIoTSoftener
 from homeassistant.helpers.entity import DeviceInfo, Entity
@@ -9,15 +10,15 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 class CulliganBaseEntity(CoordinatorEntity, Entity):
     """Base methods for Culligan entities."""
 
-    has_entity_name = True  # sensor name is Softener property name ... because device exists by default
-    use_device_name = False # sensor name is property name ... because device name is turned off by this flag
+    _attr_has_entity_name = True  # sensor name is Softener property name ... because device exists by default
 
     def __init__(self, coordinator: CulliganUpdateCoordinator, device: Device) -> None:
         """Init base methods."""
-        super().__init__(coordinator, device)
-        
+        super().__init__(coordinator, ListenerContext(device.device_serial_number))
+
         self.device         = device
         self.coordinator    = coordinator
+        self._dsn           = device.device_serial_number
 
         # at a high level, we want to know if it's a culligan 'thing' or an ayla 'thing'
         self._io_culligan    = isinstance(device, CulliganIoTDevice)
@@ -29,7 +30,7 @@ class CulliganBaseEntity(CoordinatorEntity, Entity):
         
         # Similar, if Ayla, but not classified as 'softener' ... expect things to break
         if not self._io_culligan and not isinstance(device, Softener):
-            LOGGER.warning(f"Device {device.device_serial_number} is an Ayla device, but was not cast as a Softener. Expect things to break!")
+            LOGGER.warning("Device %s is an Ayla device, but was not cast as a Softener. Expect things to break!", device.device_serial_number)
 
         # self.base_unique_id = device.name + "_" + device.device_serial_number
         model = getattr(self.device, "device_model_number", None) or getattr(self.device, "_model", None)
@@ -43,4 +44,29 @@ class CulliganBaseEntity(CoordinatorEntity, Entity):
     @property
     def io_culligan(self) -> bool:
         """Return whether is instance of Culligan"""
-        return self._io_culligan
\ No newline at end of file
+        return self._io_culligan
+
+    @property
+    def available(self) -> bool:
+        """Unavailable once the device is listed offline, otherwise available while its data is fresh or it is online"""
+        if self.coordinator.device_is_listed_offline(self._dsn):
+            return False
+        if self.coordinator.device_is_fresh(self._dsn):
+            return True
+        return super().available and self.coordinator.device_is_online(self._dsn)
+
+    @property
+    def snapshot(self) -> DeviceSnapshot | None:
+        """Return the coordinator's latest decoded snapshot for this device"""
+        return self.coordinator.get_snapshot(self._dsn)
+
+    def bind_properties(self, *keys: str) -> None:
+        """Only wake this entity when one of these snapshot keys changes, or with no keys when its availability may have"""
+        self.coordinator_context = ListenerContext(self._dsn, frozenset(keys))
+
+    def snapshot_value(self, key: str):
+        """Return a decoded value from the latest snapshot, or None if not reported"""
+        snapshot = self.coordinator.get_snapshot(self._dsn)
+        if snapshot is None:
+            return None
+        return snapshot.get(key)
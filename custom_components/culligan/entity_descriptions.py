@@ -0,0 +1,362 @@
+"""Entity description catalog shared by every Culligan platform.
+
+Built once at import. Platforms only pair these descriptions with devices.
+"""
+from __future__ import annotations
+
+from .const import DAILY_USAGE_KEYS, HOURLY_USAGE_KEYS, WEEKDAY_AVERAGE_KEYS
+
+from ayla_iot_unofficial.device import Softener
+from culligan.culliganiot_device import CulliganIoTSoftener
+from dataclasses import dataclass
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntityDescription,
+)
+from homeassistant.components.button import ButtonEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.components.switch import SwitchEntityDescription
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    UnitOfMass,
+    UnitOfTime,
+    UnitOfVolume,
+)
+
+AYLA_DEVICES = (Softener,)
+CULLIGAN_IOT_DEVICES = (CulliganIoTSoftener,)
+ALL_DEVICES = AYLA_DEVICES + CULLIGAN_IOT_DEVICES
+
+
+@dataclass(frozen=True)
+class WriteFilter:
+    """Deadband and minimum write interval for a noisy numeric sensor.
+
+    A new value is only written when it moved at least `absolute` units or `percent`
+    percent away from the last written value (whichever is configured), and not
+    sooner than `min_interval` seconds after the previous write. Changes held back by
+    the interval are written once it expires.
+    """
+
+    absolute: float | None = None
+    percent: float | None = None
+    min_interval: float = 0
+
+    def is_significant(self, written, value) -> bool:
+        """Return True if value differs enough from the last written value."""
+        if not isinstance(written, (int, float)) or not isinstance(value, (int, float)):
+            return written != value
+        delta = abs(value - written)
+        if delta == 0:
+            return False
+        if self.absolute is None and self.percent is None:
+            return True
+        if self.absolute is not None and delta >= self.absolute:
+            return True
+        if self.percent is not None:
+            if written == 0:
+                return True
+            return delta / abs(written) * 100 >= self.percent
+        return False
+
+
+@dataclass(frozen=True, kw_only=True)
+class CulliganSensorEntityDescription(SensorEntityDescription):
+    """Softener sensor keyed by its Ayla property map key."""
+
+    write_filter: WriteFilter | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class CulliganUsageHistogramEntityDescription(SensorEntityDescription):
+    """One rolling usage series, slot 1 (most recent) first."""
+
+    slot_keys: tuple[str, ...]
+
+
+@dataclass(frozen=True, kw_only=True)
+class CulliganSwitchEntityDescription(SwitchEntityDescription):
+    """Softener switch keyed by its Ayla property map key."""
+
+    icon_off: str
+    supported_devices: tuple[type, ...] = ALL_DEVICES
+
+
+@dataclass(frozen=True, kw_only=True)
+class CulliganButtonEntityDescription(ButtonEntityDescription):
+    """Softener command button, keyed by its command name."""
+
+    supported_devices: tuple[type, ...] = ALL_DEVICES
+
+
+SOFTENER_SENSORS: tuple[CulliganSensorEntityDescription, ...] = (
+    # generic softener status
+    CulliganSensorEntityDescription(
+        key="status",
+        name="status",
+        icon="mdi:water",
+    ),
+    CulliganSensorEntityDescription(
+        key="total_gallons_today",
+        name="total gallons today",
+        native_unit_of_measurement=UnitOfVolume.GALLONS,
+        icon="mdi:water-circle",
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    # doesn't match app and not sure why ... longer period?
+    CulliganSensorEntityDescription(
+        key="average_daily_usage",
+        name="average daily water usage",
+        native_unit_of_measurement=UnitOfVolume.GALLONS,
+        icon="mdi:cup-water",
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    # remaining capacity before regen in gallons
+    CulliganSensorEntityDescription(
+        key="capacity_remaining_gallons",
+        name="capacity remaining before regeneration",
+        native_unit_of_measurement=UnitOfVolume.GALLONS,
+        icon="mdi:water-minus",
+        device_class=SensorDeviceClass.VOLUME_STORAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    CulliganSensorEntityDescription(
+        key="current_flow_rate",
+        name="current flow rate",
+        native_unit_of_measurement="gpm",
+        icon="mdi:waves",
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.MEASUREMENT,
+        write_filter=WriteFilter(absolute=0.2, min_interval=30),
+    ),
+    # requested by user
+    CulliganSensorEntityDescription(
+        key="days_salt_remaining",
+        name="salt remaining",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        icon="mdi:calendar-clock",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    # manual salt level as displayed in the app
+    CulliganSensorEntityDescription(
+        key="manual_salt_level_rem_calc",
+        name="salt remaining",
+        native_unit_of_measurement=PERCENTAGE,
+        icon="mdi:calendar-clock",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    # Salt dosage in lbs (storage size)
+    CulliganSensorEntityDescription(
+        key="salt_dosage_in_lbs",
+        name="total salt capacity",
+        native_unit_of_measurement=UnitOfMass.POUNDS,
+        icon="mdi:shaker-outline",
+        device_class=SensorDeviceClass.WEIGHT,
+        state_class=SensorStateClass.TOTAL,
+    ),
+    CulliganSensorEntityDescription(
+        key="days_since_last_regen",
+        name="days since last regeneration",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        icon="mdi:calendar-refresh",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    CulliganSensorEntityDescription(
+        key="last_regen_date_time",
+        name="last regeneration date",
+        icon="mdi:calendar-check",
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+    CulliganSensorEntityDescription(
+        key="next_regen_on_date",
+        name="next regeneration date",
+        icon="mdi:calendar-arrow-right",
+        device_class=SensorDeviceClass.DATE,
+    ),
+    # not applicable if smart sensing
+    CulliganSensorEntityDescription(
+        key="regen_interval_days_setting",
+        name="programmed days between regenerations",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        icon="mdi:calendar-refresh",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    # smart 'aqua sensor', micro? Siemens per meter (conductivity)
+    CulliganSensorEntityDescription(
+        key="aqua_sensor_Zmin",
+        name="aqua sensor threshold",
+        native_unit_of_measurement="μS/cm",
+        icon="mdi:water-alert",
+        state_class=SensorStateClass.TOTAL,
+    ),
+    CulliganSensorEntityDescription(
+        key="aqua_sensor_Zratio_current",
+        name="aqua sensor",
+        native_unit_of_measurement="μS/cm",
+        icon="mdi:water-opacity",
+        state_class=SensorStateClass.MEASUREMENT,
+        write_filter=WriteFilter(percent=2, min_interval=300),
+    ),
+    CulliganSensorEntityDescription(
+        key="avg_no_of_days_btwn_reg",
+        name="average days between regenerations",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        icon="mdi:calendar",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    CulliganSensorEntityDescription(
+        key="hardness_in_grains_per_gal",
+        name="programmed water hardness",
+        native_unit_of_measurement="gpg",
+        icon="mdi:water-percent",
+        state_class=SensorStateClass.TOTAL,
+    ),
+    CulliganSensorEntityDescription(
+        key="rssi",
+        name="WiFi strength",
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        icon="mdi:wifi-arrow-up-down",
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        state_class=SensorStateClass.MEASUREMENT,
+        write_filter=WriteFilter(absolute=3, min_interval=300),
+    ),
+    CulliganSensorEntityDescription(
+        key="time_rem_in_position",
+        name="valve position time remaining",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        icon="mdi:clock-end",
+        state_class=SensorStateClass.MEASUREMENT,
+        write_filter=WriteFilter(absolute=5, min_interval=60),
+    ),
+    CulliganSensorEntityDescription(
+        key="total_gallons_since_install",
+        name="total gallons softened since install",
+        native_unit_of_measurement=UnitOfVolume.GALLONS,
+        icon="mdi:cup-water",
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    CulliganSensorEntityDescription(
+        key="total_regens_since_install",
+        name="total regenerations since install",
+        icon="mdi:refresh-circle",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    CulliganSensorEntityDescription(
+        key="error_flags",
+        name="error codes",
+        icon="mdi:alert-circle",
+    ),
+) + tuple(
+    # per-slot daily / weekday / hourly usages
+    CulliganSensorEntityDescription(
+        key=key,
+        name=name,
+        native_unit_of_measurement=UnitOfVolume.GALLONS,
+        icon="mdi:cup-water",
+        device_class=SensorDeviceClass.WATER,
+        state_class=SensorStateClass.MEASUREMENT,
+    )
+    for key, name in (
+        [(key, f"daily usage today - {key.split('_')[3]}d") for key in DAILY_USAGE_KEYS]
+        + [(key, f"average usage {key[-3:]}") for key in WEEKDAY_AVERAGE_KEYS]
+        + [(key, f"hourly usage now - {key.split('_')[3]}h") for key in HOURLY_USAGE_KEYS]
+    )
+)
+
+# In compact mode each series is one entity and the per-slot sensors are disabled by default
+USAGE_HISTOGRAMS: tuple[CulliganUsageHistogramEntityDescription, ...] = (
+    CulliganUsageHistogramEntityDescription(
+        key="hourly_usage",
+        name="hourly usage last 24h",
+        icon="mdi:chart-bar",
+        slot_keys=tuple(HOURLY_USAGE_KEYS),
+    ),
+    CulliganUsageHistogramEntityDescription(
+        key="daily_usage",
+        name="daily usage last 7d",
+        icon="mdi:chart-bar",
+        slot_keys=tuple(DAILY_USAGE_KEYS),
+    ),
+    CulliganUsageHistogramEntityDescription(
+        key="weekday_average_usage",
+        name="average weekly usage",
+        icon="mdi:chart-bar",
+        slot_keys=tuple(WEEKDAY_AVERAGE_KEYS),
+    ),
+)
+USAGE_SLOT_KEYS = frozenset(HOURLY_USAGE_KEYS + DAILY_USAGE_KEYS + WEEKDAY_AVERAGE_KEYS)
+
+SOFTENER_BINARY_SENSORS: tuple[BinarySensorEntityDescription, ...] = (
+    BinarySensorEntityDescription(
+        key="regen_tonight_pending",
+        name="regenerate tonight",
+        icon="mdi:refresh-circle",
+    ),
+    # 'Gotcha', property name is 'set_vacation_mode', but ayla-iot-unofficial will 'clean' property name
+    BinarySensorEntityDescription(
+        key="vacation_mode",
+        name="vacation mode",
+        icon="mdi:airplane",
+        device_class=BinarySensorDeviceClass.PRESENCE,
+    ),
+    # Away mode water use (alerts)
+    BinarySensorEntityDescription(
+        key="away_mode_water_use",
+        name="away mode alerts",
+        icon="mdi:water-alert",
+        device_class=BinarySensorDeviceClass.PRESENCE,
+    ),
+    # mapped to salt_alarm_mode in culliganiot ... probably not correct
+    BinarySensorEntityDescription(
+        key="sbt_salt_level_low",
+        name="salt level low",
+        icon="mdi:shaker-outline",
+    ),
+    BinarySensorEntityDescription(
+        key="valve_position",
+        name="bypass",
+        icon="mdi:valve",
+        device_class=BinarySensorDeviceClass.OPENING,
+    ),
+)
+
+SOFTENER_SWITCHES: tuple[CulliganSwitchEntityDescription, ...] = (
+    # 'Gotcha', property name is 'set_vacation_mode', but ayla-iot-unofficial will 'clean' property name
+    CulliganSwitchEntityDescription(
+        key="vacation_mode",
+        name="vacation mode",
+        icon="mdi:airplane",
+        icon_off="mdi:airplane-off",
+    ),
+    # 'Gotcha', property name is 'set_standard_bypass', but ayla-iot-unofficial will 'clean' property name
+    CulliganSwitchEntityDescription(
+        key="standard_bypass",
+        name="permanent bypass",
+        icon="mdi:valve-closed",
+        icon_off="mdi:valve-open",
+    ),
+)
+
+SOFTENER_BUTTONS: tuple[CulliganButtonEntityDescription, ...] = (
+    CulliganButtonEntityDescription(
+        key="clear bypass",
+        name="clear bypass",
+        icon="mdi:valve-open",
+    ),
+    CulliganButtonEntityDescription(
+        key="start timed bypass",
+        name="start timed bypass",
+        icon="mdi:timer-play-outline",
+        supported_devices=CULLIGAN_IOT_DEVICES,
+    ),
+)
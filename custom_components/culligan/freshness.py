@@ -0,0 +1,57 @@
+"""Per-device and per-datapoint tracking of when data was last confirmed and last changed."""
+from __future__ import annotations
+
+from .snapshot import DeviceSnapshot
+
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+# Data not confirmed for this many update intervals is stale, entities then follow connectivity again
+STALE_INTERVALS = 3
+# Pseudo snapshot key in refresh change sets, wakes listeners of a device whenever its data is confirmed
+FRESHNESS_KEY = "__freshness__"
+
+
+class DeviceFreshness:
+    """When a device's data was confirmed by a poll or push, and when each datapoint changed.
+
+    A filtered poll only confirms the datapoints it fetched, a push only the ones it
+    carried. Changes include optimistic values shown for unconfirmed commands.
+    """
+
+    def __init__(self) -> None:
+        """Start with nothing confirmed."""
+        self.confirmed: datetime | None = None
+        self.changed: datetime | None = None
+        self.property_confirmed: dict[str, datetime] = {}
+        self.property_changed: dict[str, datetime] = {}
+
+    def confirm(self, now: datetime, keys: Iterable[str]) -> None:
+        """Record a successful poll or push that reported the given datapoints."""
+        self.confirmed = now
+        for key in keys:
+            self.property_confirmed[key] = now
+
+    def record_changes(self, now: datetime, snapshot: DeviceSnapshot, changed: frozenset[str] | None) -> None:
+        """Record the datapoints a new snapshot changed, None meaning all of them."""
+        keys = snapshot.values if changed is None else changed
+        if keys:
+            self.changed = now
+        for key in keys:
+            self.property_changed[key] = now
+
+    def age(self, now: datetime) -> float | None:
+        """Return the seconds since the data was last confirmed, None if it never was."""
+        if self.confirmed is None:
+            return None
+        return (now - self.confirmed).total_seconds()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the confirmation and change times as ISO strings, datapoints sorted."""
+        return {
+            "confirmed": self.confirmed.isoformat() if self.confirmed else None,
+            "changed": self.changed.isoformat() if self.changed else None,
+            "last_confirmed": {key: at.isoformat() for key, at in sorted(self.property_confirmed.items())},
+            "last_changed": {key: at.isoformat() for key, at in sorted(self.property_changed.items())},
+        }
@@ -0,0 +1,131 @@
+"""Refresh timing histograms, API call counts and error history of a coordinator."""
+from __future__ import annotations
+
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import monotonic
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+# Upper bounds in seconds of the timing histogram buckets, the last bucket is unbounded
+TIMING_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0)
+# Recent errors and connectivity changes kept for diagnostics
+HISTORY_SIZE = 50
+
+
+class TimingHistogram:
+    """Cumulative histogram of durations, Prometheus style."""
+
+    def __init__(self) -> None:
+        """Start empty."""
+        self.counts = [0] * (len(TIMING_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Add one duration."""
+        self.count += 1
+        self.total += seconds
+        for index, bound in enumerate(TIMING_BUCKETS):
+            if seconds <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cumulative bucket counts, count and sum."""
+        buckets, running = {}, 0
+        for bound, count in zip((*TIMING_BUCKETS, "+Inf"), self.counts):
+            running += count
+            buckets[str(bound)] = running
+        return {"buckets": buckets, "count": self.count, "sum": round(self.total, 4)}
+
+
+class CoordinatorMetrics:
+    """Counters a coordinator keeps about its own refreshes.
+
+    Timings are kept for whole refreshes and each refresh phase (auth and listing
+    per cloud, devices, snapshots, listeners). Cloud requests are counted and timed
+    per backend and endpoint.
+    """
+
+    def __init__(self) -> None:
+        """Start with no history."""
+        self.phases: dict[str, TimingHistogram] = {}
+        # (backend, endpoint) -> requests, failed requests, latency
+        self.requests: Counter[tuple[str, str]] = Counter()
+        self.request_errors: Counter[tuple[str, str]] = Counter()
+        self.request_timings: dict[tuple[str, str], TimingHistogram] = {}
+        # entity state updates caused by refreshes and pushes, in total and in the last one
+        self.listener_updates = 0
+        self.last_listener_updates = 0
+        self.errors: deque[dict[str, Any]] = deque(maxlen=HISTORY_SIZE)
+        self.connectivity: deque[dict[str, Any]] = deque(maxlen=HISTORY_SIZE)
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """Record the duration of a refresh phase."""
+        if (histogram := self.phases.get(phase)) is None:
+            histogram = self.phases[phase] = TimingHistogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def track_request(self, backend: str, endpoint: str) -> Iterator[None]:
+        """Count and time one cloud request made inside the block.
+
+        The histogram exists from the first request on, so readers never find a
+        counted request without one. Its count trails while requests are in flight.
+        """
+        key = (backend, endpoint)
+        if (histogram := self.request_timings.get(key)) is None:
+            histogram = self.request_timings[key] = TimingHistogram()
+        self.requests[key] += 1
+        started = monotonic()
+        try:
+            yield
+        except Exception:
+            self.request_errors[key] += 1
+            raise
+        finally:
+            histogram.observe(monotonic() - started)
+
+    def count_listener_updates(self, updates: int) -> None:
+        """Record how many entities one refresh or push updated."""
+        self.listener_updates += updates
+        self.last_listener_updates = updates
+
+    def record_error(self, error: BaseException, dsn: str | None = None) -> None:
+        """Remember a failed refresh or device update."""
+        self.errors.append(
+            {"time": dt_util.utcnow().isoformat(), "dsn": dsn, "error": repr(error)}
+        )
+
+    def record_connectivity(self, dsn: str, online: bool, next_probe_in: float | None) -> None:
+        """Remember a device going offline, being backed off further, or coming back."""
+        self.connectivity.append(
+            {
+                "time": dt_util.utcnow().isoformat(),
+                "dsn": dsn,
+                "online": online,
+                "next_probe_in": round(next_probe_in, 1) if next_probe_in is not None else None,
+            }
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return everything for diagnostics."""
+        return {
+            "phases": {phase: histogram.as_dict() for phase, histogram in self.phases.items()},
+            "requests": {
+                f"{backend}/{endpoint}": {
+                    "count": count,
+                    "errors": self.request_errors[backend, endpoint],
+                    "timing": self.request_timings[backend, endpoint].as_dict(),
+                }
+                for (backend, endpoint), count in self.requests.items()
+            },
+            "listener_updates": self.listener_updates,
+            "last_listener_updates": self.last_listener_updates,
+            "errors": list(self.errors),
+            "connectivity": list(self.connectivity),
+        }
@@ -4,12 +4,13 @@ from __future__ import annotations
 from collections.abc import Iterable
 
 from culligan.culliganiot_device import CulliganIoTDevice, CulliganIoTSoftener
-from homeassistant.components.number import NumberEntity, NumberMode
+from homeassistant.components.number import ENTITY_ID_FORMAT, NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTime
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import generate_entity_id
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import slugify
 
 from .const import (
     DEFAULT_TIMED_BYPASS_MINUTES,
@@ -17,6 +18,7 @@ from .const import (
     LOGGER,
     MAX_TIMED_BYPASS_MINUTES,
     MIN_TIMED_BYPASS_MINUTES,
+    SIGNAL_NEW_DEVICES,
     STEP_TIMED_BYPASS_MINUTES,
 )
 from .entity import CulliganBaseEntity
@@ -38,23 +40,35 @@ async def async_setup_entry(
     if not isinstance(coordinator.timed_bypass_minutes, dict):
         coordinator.timed_bypass_minutes = {}
 
-    numbers = []
-    for device in devices:
-        if isinstance(device, CulliganIoTSoftener):
-            numbers.append(TimedBypassMinutesNumber(coordinator, device))
+    def _new_numbers(devices: Iterable[CulliganIoTDevice]) -> list[TimedBypassMinutesNumber]:
+        """Create the timed bypass duration of every CulliganIoT softener."""
+        return [
+            TimedBypassMinutesNumber(coordinator, device)
+            for device in devices
+            if isinstance(device, CulliganIoTSoftener)
+        ]
 
-    if numbers:
+    if numbers := _new_numbers(devices):
         async_add_devices(numbers)
 
+    @callback
+    def _async_add_new_devices(new_devices: list[CulliganIoTDevice]) -> None:
+        """Add numbers for devices discovered after setup."""
+        if numbers := _new_numbers(new_devices):
+            async_add_devices(numbers)
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_DEVICES.format(config_entry.entry_id), _async_add_new_devices
+        )
+    )
+
     LOGGER.debug("Finished number async_add_devices")
 
 
 class TimedBypassMinutesNumber(CulliganBaseEntity, NumberEntity):
     """Dashboard-selectable timed bypass duration for CulliganIoT softeners."""
 
-    has_entity_name = True
-    use_device_name = False
-
     _attr_mode = NumberMode.SLIDER
     _attr_native_min_value = MIN_TIMED_BYPASS_MINUTES
     _attr_native_max_value = MAX_TIMED_BYPASS_MINUTES
@@ -65,9 +79,10 @@ class TimedBypassMinutesNumber(CulliganBaseEntity, NumberEntity):
     def __init__(self, coordinator: CulliganUpdateCoordinator, device: CulliganIoTSoftener) -> None:
         """Initialize the timed bypass duration number."""
         super().__init__(coordinator, device)
-        self._attr_description = "timed bypass duration"
+        self._attr_name = "timed bypass duration"
+        self.bind_properties()  # the selected duration is local, not device state
         self._attr_unique_id = f"{device.device_serial_number}_timed_bypass_minutes"
-        self.entity_id = generate_entity_id("number.{}", self._attr_unique_id, None, coordinator.hass)
+        self.entity_id = ENTITY_ID_FORMAT.format(slugify(self._attr_unique_id))
         self._attr_native_value = int(
             coordinator.timed_bypass_minutes.get(
                 device.device_serial_number,
@@ -76,16 +91,6 @@ class TimedBypassMinutesNumber(CulliganBaseEntity, NumberEntity):
         )
         self.coordinator.timed_bypass_minutes[device.device_serial_number] = self._attr_native_value
 
-    @property
-    def name(self) -> str | None:
-        """Define name as description."""
-        return self._attr_description
-
-    @property
-    def unique_id(self) -> str | None:
-        """Return the unique ID."""
-        return self._attr_unique_id
-
     @property
     def native_value(self) -> int:
         """Return the currently selected bypass duration."""
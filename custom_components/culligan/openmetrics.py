@@ -0,0 +1,143 @@
+"""OpenMetrics text export of coordinator and cloud API performance counters."""
+from __future__ import annotations
+
+from .const import CONF_METRICS_ENDPOINT, DEFAULT_METRICS_ENDPOINT, DOMAIN
+from .metrics import TimingHistogram
+from .update_coordinator import CulliganUpdateCoordinator
+
+from collections.abc import Iterator
+from http import HTTPStatus
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _labels(**labels: str) -> str:
+    """Format a label set, escaping values as the text format requires."""
+    return "{" + ",".join(
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels.items()
+    ) + "}"
+
+
+def _histogram(name: str, histogram: TimingHistogram, **labels: str) -> Iterator[str]:
+    """Yield the bucket, count and sum samples of one histogram."""
+    summary = histogram.as_dict()
+    for bound, count in summary["buckets"].items():
+        yield f"{name}_bucket{_labels(**labels, le=bound)} {count}"
+    yield f"{name}_count{_labels(**labels)} {summary['count']}"
+    yield f"{name}_sum{_labels(**labels)} {histogram.total}"
+
+
+def _device_states(coordinator: CulliganUpdateCoordinator) -> dict[str, int]:
+    """Count devices that are online, offline, or online without fresh data."""
+    states = {"online": 0, "offline": 0, "stale": 0}
+    for dsn in coordinator.culligan_devices:
+        if not coordinator.device_is_online(dsn):
+            states["offline"] += 1
+        elif coordinator.device_is_fresh(dsn):
+            states["online"] += 1
+        else:
+            states["stale"] += 1
+    return states
+
+
+def render_openmetrics(coordinators: dict[str, CulliganUpdateCoordinator]) -> str:
+    """Render the counters of each config entry's coordinator, labelled by entry id.
+
+    Samples of one metric family are contiguous, as the format requires, so every
+    family walks all coordinators before the next one starts.
+    """
+    lines = [
+        "# TYPE culligan_refresh_phase_seconds histogram",
+        "# UNIT culligan_refresh_phase_seconds seconds",
+        "# HELP culligan_refresh_phase_seconds Duration of whole refreshes and each refresh phase.",
+    ]
+    for entry_id, coordinator in coordinators.items():
+        for phase, histogram in coordinator.metrics.phases.items():
+            lines.extend(_histogram("culligan_refresh_phase_seconds", histogram, entry=entry_id, phase=phase))
+
+    lines += [
+        "# TYPE culligan_request_seconds histogram",
+        "# UNIT culligan_request_seconds seconds",
+        "# HELP culligan_request_seconds Latency of cloud requests per backend and endpoint.",
+    ]
+    for entry_id, coordinator in coordinators.items():
+        for (backend, endpoint), histogram in coordinator.metrics.request_timings.items():
+            lines.extend(
+                _histogram("culligan_request_seconds", histogram, entry=entry_id, backend=backend, endpoint=endpoint)
+            )
+
+    for family, help_text, attribute in (
+        ("culligan_requests", "Cloud requests per backend and endpoint.", "requests"),
+        ("culligan_request_errors", "Failed cloud requests per backend and endpoint.", "request_errors"),
+    ):
+        lines += [f"# TYPE {family} counter", f"# HELP {family} {help_text}"]
+        for entry_id, coordinator in coordinators.items():
+            for (backend, endpoint), count in getattr(coordinator.metrics, attribute).items():
+                lines.append(f"{family}_total{_labels(entry=entry_id, backend=backend, endpoint=endpoint)} {count}")
+
+    lines += [
+        "# TYPE culligan_token_refreshes counter",
+        "# HELP culligan_token_refreshes Access token refreshes per backend.",
+    ]
+    for entry_id, coordinator in coordinators.items():
+        for (backend, endpoint), count in coordinator.metrics.requests.items():
+            if endpoint == "refresh_auth":
+                lines.append(f"culligan_token_refreshes_total{_labels(entry=entry_id, backend=backend)} {count}")
+
+    lines += [
+        "# TYPE culligan_devices gauge",
+        "# HELP culligan_devices Devices by connectivity, stale ones are online without fresh data.",
+    ]
+    for entry_id, coordinator in coordinators.items():
+        for state, count in _device_states(coordinator).items():
+            lines.append(f"culligan_devices{_labels(entry=entry_id, state=state)} {count}")
+
+    lines += [
+        "# TYPE culligan_entity_updates counter",
+        "# HELP culligan_entity_updates Entity state updates caused by refreshes and pushes.",
+    ]
+    for entry_id, coordinator in coordinators.items():
+        lines.append(f"culligan_entity_updates_total{_labels(entry=entry_id)} {coordinator.metrics.listener_updates}")
+    lines += [
+        "# TYPE culligan_entity_updates_last_cycle gauge",
+        "# HELP culligan_entity_updates_last_cycle Entity state updates caused by the latest refresh or push.",
+    ]
+    for entry_id, coordinator in coordinators.items():
+        lines.append(
+            f"culligan_entity_updates_last_cycle{_labels(entry=entry_id)} {coordinator.metrics.last_listener_updates}"
+        )
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class CulliganMetricsView(HomeAssistantView):
+    """Serve the counters of entries with the metrics endpoint option enabled."""
+
+    url = "/api/culligan/metrics"
+    name = "api:culligan:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics, 404 while no entry has the endpoint enabled."""
+        coordinators = {
+            entry_id: entry_data["coordinator"]
+            for entry_id, entry_data in self.hass.data.get(DOMAIN, {}).items()
+            if entry_data["options"].get(CONF_METRICS_ENDPOINT, DEFAULT_METRICS_ENDPOINT)
+        }
+        if not coordinators:
+            return web.Response(status=HTTPStatus.NOT_FOUND, text="Culligan metrics endpoint is disabled")
+        return web.Response(
+            body=render_openmetrics(coordinators).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
@@ -0,0 +1,114 @@
+"""Profile coordinator refreshes and their listener fan-out on demand."""
+from __future__ import annotations
+
+from .const import LOGGER
+from .update_coordinator import CulliganUpdateCoordinator
+
+import asyncio
+import cProfile
+import pstats
+import tracemalloc
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+# Rows written to the allocation report, the service response carries the first few
+PROFILE_TOP = 25
+SUMMARY_TOP = 10
+# Frames kept per allocation, enough to see which caller an allocation site serves
+TRACEMALLOC_FRAMES = 5
+
+_PROFILE_LOCK = asyncio.Lock()
+
+
+async def async_profile_cycles(
+    hass: HomeAssistant, coordinators: list[CulliganUpdateCoordinator], cycles: int
+) -> dict[str, Any]:
+    """Run cycles refreshes of every coordinator under cProfile and tracemalloc.
+
+    Each cycle is a full refresh including the listener fan-out to entities. The
+    profiler only runs while a cycle is in progress, but it sees everything the event
+    loop does meanwhile, so other integrations can show up in the stats. cProfile
+    stats and the top allocation sites are written to the config directory.
+    """
+    if _PROFILE_LOCK.locked():
+        raise HomeAssistantError("A Culligan profile is already running")
+
+    async with _PROFILE_LOCK:
+        profiler = cProfile.Profile()
+        start_tracing = not tracemalloc.is_tracing()
+        if start_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        started = monotonic()
+        try:
+            for cycle in range(cycles):
+                LOGGER.debug("Profiling Culligan refresh cycle %d of %d", cycle + 1, cycles)
+                try:
+                    profiler.enable()
+                except ValueError as err:
+                    # another profiler, e.g. the profiler integration, is running
+                    raise HomeAssistantError(f"Cannot start profiling: {err}") from err
+                try:
+                    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+                finally:
+                    profiler.disable()
+            allocations = await hass.async_add_executor_job(tracemalloc.take_snapshot)
+        finally:
+            if start_tracing:
+                tracemalloc.stop()
+        duration = monotonic() - started
+
+        stamp = dt_util.utcnow().strftime("%Y%m%d_%H%M%S")
+        stats_path = hass.config.path(f"culligan_profile_{stamp}.cprof")
+        allocations_path = hass.config.path(f"culligan_allocations_{stamp}.txt")
+        summary = await hass.async_add_executor_job(
+            _write_results, profiler, allocations, stats_path, allocations_path
+        )
+
+    LOGGER.info("Culligan profile of %d cycles written to %s and %s", cycles, stats_path, allocations_path)
+    return {
+        "cycles": cycles,
+        "duration_s": round(duration, 3),
+        "stats_file": stats_path,
+        "allocations_file": allocations_path,
+        **summary,
+    }
+
+
+def _write_results(
+    profiler: cProfile.Profile,
+    allocations: tracemalloc.Snapshot,
+    stats_path: str,
+    allocations_path: str,
+) -> dict[str, Any]:
+    """Write the profile and allocation report, returning the top entries of each."""
+    profiler.dump_stats(stats_path)
+    stats = pstats.Stats(profiler)
+    by_cumulative = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+    functions = [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "total_s": round(total, 4),
+            "cumulative_s": round(cumulative, 4),
+        }
+        for (filename, line, name), (_, calls, total, cumulative, _) in by_cumulative[:SUMMARY_TOP]
+    ]
+
+    top_sites = allocations.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+    ).statistics("lineno")[:PROFILE_TOP]
+    with open(allocations_path, "w", encoding="utf-8") as report:
+        report.write("\n".join(str(stat) for stat in top_sites))
+        report.write("\n")
+    sites = [
+        {"site": str(stat.traceback[0]), "size_kib": round(stat.size / 1024, 1), "count": stat.count}
+        for stat in top_sites[:SUMMARY_TOP]
+    ]
+    return {"top_functions": functions, "top_allocations": sites}
@@ -0,0 +1,113 @@
+"""Transports that push datapoint updates into the coordinator instead of polling."""
+from __future__ import annotations
+
+from .const import DOMAIN, LOGGER
+from .update_coordinator import CulliganUpdateCoordinator
+
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import web
+
+from homeassistant.components import webhook
+from homeassistant.core import HomeAssistant, callback
+
+
+class PushTransport(ABC):
+    """Source of pushed datapoint updates for one config entry.
+
+    A transport hands every update to CulliganUpdateCoordinator.async_push_datapoints,
+    which merges it into the device and publishes it like a refresh. Cloud polling
+    keeps running at a slow interval to reconcile anything a push missed.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: CulliganUpdateCoordinator) -> None:
+        """Initialize the transport."""
+        self.hass = hass
+        self.coordinator = coordinator
+
+    @abstractmethod
+    @callback
+    def async_start(self) -> None:
+        """Start accepting pushed updates."""
+
+    @abstractmethod
+    @callback
+    def async_stop(self) -> None:
+        """Stop accepting pushed updates."""
+
+    @callback
+    def async_ingest(self, payload: Any) -> int | None:
+        """Merge a pushed payload, returning how many devices it updated.
+
+        The payload is one update or a list of them, each
+        {"dsn": "<dsn>", "datapoints": {"<snapshot key>": value, ...}} with decoded
+        values, as in the datapoints changed event. Returns None if the payload is
+        malformed.
+        """
+        updates = payload if isinstance(payload, list) else [payload]
+        if not all(
+            isinstance(update, Mapping)
+            and isinstance(update.get("dsn"), str)
+            and isinstance(update.get("datapoints"), Mapping)
+            for update in updates
+        ):
+            return None
+        return sum(
+            self.coordinator.async_push_datapoints(update["dsn"], update["datapoints"])
+            for update in updates
+        )
+
+
+class WebhookPushTransport(PushTransport):
+    """Accept pushed updates as JSON POSTed to a local Home Assistant webhook.
+
+    A bridge or the device's local interface posts to /api/webhook/<webhook_id>.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: CulliganUpdateCoordinator, webhook_id: str
+    ) -> None:
+        """Initialize the transport for a webhook id."""
+        super().__init__(hass, coordinator)
+        self.webhook_id = webhook_id
+
+    @callback
+    def async_start(self) -> None:
+        """Register the webhook."""
+        LOGGER.debug("Accepting pushed datapoints on webhook %s", self.webhook_id)
+        webhook.async_register(
+            self.hass,
+            DOMAIN,
+            "Culligan datapoint push",
+            self.webhook_id,
+            self._async_handle_webhook,
+            local_only=True,
+            allowed_methods=["POST"],
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Unregister the webhook."""
+        webhook.async_unregister(self.hass, self.webhook_id)
+
+    async def _async_handle_webhook(
+        self, hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response:
+        """Merge the posted datapoints, 404 if none of the devices belong to this entry."""
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text="Body is not JSON")
+
+        updated = self.async_ingest(payload)
+        if updated is None:
+            return web.Response(
+                status=HTTPStatus.BAD_REQUEST,
+                text='Expected {"dsn": ..., "datapoints": {...}} or a list of them',
+            )
+        if not updated:
+            return web.Response(status=HTTPStatus.NOT_FOUND, text="Unknown device")
+        return web.Response(status=HTTPStatus.OK)
@@ -1,30 +1,65 @@
 """Culligan Sensor Entities."""
 from __future__ import annotations
 
-from .const import DOMAIN, LOGGER, PROPERTY_VALUE_MAP
+from .const import (
+    CONF_COMPACT_USAGE,
+    CONF_RO_DATAPOINT_ALLOWLIST,
+    CONF_RO_DATAPOINT_DENYLIST,
+    DEFAULT_COMPACT_USAGE,
+    DOMAIN,
+    LOGGER,
+    PROPERTY_VALUE_MAP,
+    SIGNAL_DEVICE_RETIRED,
+    SIGNAL_NEW_DATAPOINTS,
+)
 from .entity import CulliganBaseEntity
+from .entity_descriptions import (
+    SOFTENER_SENSORS,
+    USAGE_HISTOGRAMS,
+    USAGE_SLOT_KEYS,
+    CulliganSensorEntityDescription,
+    CulliganUsageHistogramEntityDescription,
+)
+from .freshness import FRESHNESS_KEY
+from .snapshot import STATUS_BYPASS, STATUS_SOFTENING, STATUS_VACATION
+from .trace import TRACER
 from .update_coordinator import CulliganUpdateCoordinator
 
 from ayla_iot_unofficial.device import Device
-from collections.abc import Iterable
-from culligan.culliganiot_device import CulliganIoTDevice, CulliganIoTRO, CulliganIoTSoftener
+from collections.abc import Callable, Iterable, Mapping
+from datetime import date, datetime
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from culligan.culliganiot_device import CulliganIoTDevice, CulliganIoTRO
 import hashlib
 import re
-
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (
-    FORMAT_DATETIME,
-    PERCENTAGE,
-    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
-    EntityCategory,
-    UnitOfMass,
-    UnitOfTime,
-    UnitOfVolume,
+from time import monotonic
+from typing import Any
+
+from homeassistant.components.sensor import (
+    ENTITY_ID_FORMAT,
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfVolume
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import generate_entity_id
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util, slugify
+
+# marks the Smart RO datapoints snapshot sensor in the per-device created set
+RO_SNAPSHOT_ENTITY = "__datapoints_snapshot__"
+# marks the data age sensor in the per-device created set
+DATA_AGE_ENTITY = "__data_age__"
+
+STATUS_ICONS = {
+    STATUS_VACATION: "mdi:airplane",
+    STATUS_BYPASS: "mdi:water-off",
+    STATUS_SOFTENING: "mdi:water",
+}
 
 
 def _slugify_datapoint_id(datapoint_id: str) -> str:
@@ -50,14 +85,37 @@ def _coerce_datapoint_state(value):
     return None
 
 
-def _get_datapoint_properties(device: CulliganIoTDevice) -> dict:
-    """Return a generic CulliganIoT device's datapoint dictionary if available."""
-    properties = getattr(device, "properties", {})
-    return properties if isinstance(properties, dict) else {}
-
-
+def _as_datetime(value) -> datetime | None:
+    """Parse a reported timestamp, epoch seconds or ISO string, assuming local time when naive."""
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return dt_util.utc_from_timestamp(value) if value > 0 else None
+    elif isinstance(value, str):
+        parsed = dt_util.parse_datetime(value)
+    else:
+        return None
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return parsed
+
+
+def _as_date(value) -> date | None:
+    """Parse a reported date, accepting anything _as_datetime understands."""
+    if isinstance(value, str) and (parsed := dt_util.parse_date(value)) is not None:
+        return parsed
+    parsed = _as_datetime(value)
+    return dt_util.as_local(parsed).date() if parsed else None
+
+
+@lru_cache(maxsize=1024)
 def _datapoint_unique_suffix(datapoint_id: str) -> str:
-    """Return a stable suffix that avoids collisions from slug normalization."""
+    """Return a stable suffix that avoids collisions from slug normalization.
+
+    Cached, Smart RO datapoint names repeat for every device and every discovery pass.
+    """
     slug = _slugify_datapoint_id(datapoint_id) or "datapoint"
     digest = hashlib.sha1(datapoint_id.encode("utf-8")).hexdigest()[:8]
     return f"{slug}_{digest}"
@@ -81,295 +139,155 @@ async def async_setup_entry(
         ", ".join([d.name for d in devices]),
     )
 
-    softener_sensors = [
-        (
-            # generic softener status
-            "status",
-            "status",
-            None,
-            "mdi:water",
-            None,
-            None,
-        ),
-        (
-            # total gallons today
-            "total_gallons_today",
-            "total gallons today",
-            UnitOfVolume.GALLONS,
-            "mdi:water-circle",
-            SensorDeviceClass.WATER,
-            SensorStateClass.TOTAL_INCREASING,
-        ),
-        (
-            # average daily usage sensor
-            # doesn't match app and not sure why ... longer period?
-            "average_daily_usage",
-            "average daily water usage",
-            UnitOfVolume.GALLONS,
-            "mdi:cup-water",
-            SensorDeviceClass.WATER,
-            SensorStateClass.MEASUREMENT,
-        ),
-        (
-            # remaining capacity before regen in gallons
-            "capacity_remaining_gallons",
-            "capacity remaining before regeneration",
-            UnitOfVolume.GALLONS,
-            "mdi:water-minus",
-            SensorDeviceClass.VOLUME_STORAGE,
-            SensorStateClass.MEASUREMENT,
-        ),
-        (
-            # current flow rate
-            "current_flow_rate",
-            "current flow rate",
-            "gpm",
-            "mdi:waves",
-            SensorDeviceClass.WATER,
-            SensorStateClass.MEASUREMENT,
-        ),
-        (
-            # requested by user
-            "days_salt_remaining",
-            "salt remaining",
-            UnitOfTime.DAYS,
-            "mdi:calendar-clock",
-            None,
-            SensorStateClass.MEASUREMENT,
-        ),
-        (
-            # manual salt level as displayed in the app
-            "manual_salt_level_rem_calc",
-            "salt remaining",
-            PERCENTAGE,
-            "mdi:calendar-clock",
-            None,
-            SensorStateClass.MEASUREMENT,
-        ),
-        (
-            # Salt dosage in lbs (storage size)
-            "salt_dosage_in_lbs",
-            "total salt capacity",
-            UnitOfMass.POUNDS,
-            "mdi:shaker-outline",
-            SensorDeviceClass.WEIGHT,
-            SensorStateClass.TOTAL,
-        ),
-        (
-            # days since last regeneration
-            "days_since_last_regen",
-            "days since last regeneration",
-            UnitOfTime.DAYS,
-            "mdi:calendar-refresh",
-            SensorDeviceClass.DATE,
-            SensorStateClass.MEASUREMENT,
-        ),
-        (
-            # exact date of last regeneration
-            "last_regen_date_time",
-            "last regeneration date",
-            FORMAT_DATETIME,
-            "mdi:calendar-check",
-            SensorDeviceClass.TIMESTAMP,
-            None,
-        ),
-        (
-            # date of next regen
-            "next_regen_on_date",
-            "next regeneration date",
-            None,  # FORMAT_DATETIME,
-            "mdi:calendar-arrow-right",
-            SensorDeviceClass.DATE,
-            None,
-        ),
-        (
-            # days between regenerations
-            # not applicable if smart sensing
-            "regen_interval_days_setting",
-            "programmed days between regenerations",
-            UnitOfTime.DAYS,
-            "mdi:calendar-refresh",
-            None,  # SensorDeviceClass.TIMESTAMP,
-            SensorStateClass.MEASUREMENT,
-        ),
-        (
-            # smart 'aqua sensor' Zmin
-            "aqua_sensor_Zmin",
-            "aqua sensor threshold",
-            "μS/cm",  # micro? Siemens per meter (conductivity)
-            "mdi:water-alert",
-            None,
-            SensorStateClass.TOTAL,
-        ),
-        (
-            # smart 'aqua sensor' Zcurrent
-            "aqua_sensor_Zratio_current",
-            "aqua sensor",
-            "μS/cm",  # micro? Siemens per meter (conductivity)
-            "mdi:water-opacity",
-            None,
-            SensorStateClass.MEASUREMENT,
-        ),
-        (
-            # average number of days between regens
-            "avg_no_of_days_btwn_reg",
-            "average days between regenerations",
-            UnitOfTime.DAYS,
-            "mdi:calendar",
-            None,  # SensorDeviceClass.TIMESTAMP,
-            SensorStateClass.MEASUREMENT,
-        ),
-        (
-            # hardness programmed in grains
-            "hardness_in_grains_per_gal",
-            "programmed water hardness",
-            "gpg",
-            "mdi:water-percent",
-            None,
-            SensorStateClass.TOTAL,
-        ),
-        (
-            # Wifi strength
-            "rssi",
-            "WiFi strength",
-            SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
-            "mdi:wifi-arrow-up-down",
-            SensorDeviceClass.SIGNAL_STRENGTH,
-            SensorStateClass.MEASUREMENT,
-        ),
-        (
-            # time remaining in valve position
-            "time_rem_in_position",
-            "valve position time remaining",
-            UnitOfTime.MINUTES,
-            "mdi:clock-end",
-            None,
-            SensorStateClass.MEASUREMENT,
-        ),
-        (
-            # Total gallons softened since install
-            "total_gallons_since_install",
-            "total gallons softened since install",
-            UnitOfVolume.GALLONS,
-            "mdi:cup-water",
-            SensorDeviceClass.WATER,
-            SensorStateClass.TOTAL_INCREASING,
-        ),
-        (
-            # Total regenerations since install
-            "total_regens_since_install",
-            "total regenerations since install",
-            None,
-            "mdi:refresh-circle",
-            None,
-            SensorStateClass.TOTAL_INCREASING,
-        ),
-        (
-            # Error codes
-            "error_flags",
-            "error codes",
-            None,
-            "mdi:alert-circle",
-            None,
-            None,
-        )
-        # (
-        #     # id
-        #     # description
-        #     # unit (of measurement)
-        #     # icon
-        #     # device_class
-        #     # state_class
-        # ),
-    ]
-
-    # add daily / hourly usages
-    for key in PROPERTY_VALUE_MAP.keys():
-        if key[:-1] == "daily_usage_day_":
-            day = key[-1]
-            softener_sensors += [(
-                key,
-                f"daily usage today - {day}d",
-                UnitOfVolume.GALLONS,
-                "mdi:cup-water",
-                SensorDeviceClass.WATER,
-                SensorStateClass.MEASUREMENT,
-            )]
-        elif key[:3] == "avg" and key[-3:] in ["sun","mon","tue","wed","thr","fri","sat"]:
-            day = key[-3:]
-            softener_sensors += [(
-                key,
-                f"average usage {day}",
-                UnitOfVolume.GALLONS,
-                "mdi:cup-water",
-                SensorDeviceClass.WATER,
-                SensorStateClass.MEASUREMENT,
-            )]
-        elif key[:17] == "hourly_usage_hour":
-            hour = key.split("_")[3]
-            softener_sensors += [(
-                key,
-                f"hourly usage now - {hour}h",
-                UnitOfVolume.GALLONS,
-                "mdi:cup-water",
-                SensorDeviceClass.WATER,
-                SensorStateClass.MEASUREMENT,
-            )]
-        else:
-            pass
+    compact_usage = config_entry.options.get(CONF_COMPACT_USAGE, DEFAULT_COMPACT_USAGE)
+    ro_exposed = _datapoint_filter(config_entry.options)
+    # dsn -> sensor ids that already have an entity
+    created: dict[str, set[str]] = {}
 
-    # Method two ... create individual sensors from a map of defined sensor attributes
-    for device in devices:
-        LOGGER.debug("Working on adding sensors device: %s", device._device_serial_number)
-        sensors = []
+    def _new_sensors(device: Device | CulliganIoTDevice, keys: Iterable[str]) -> list[SensorEntity]:
+        """Create sensors for the keys of one device that do not have an entity yet."""
+        device_created = created.setdefault(device.device_serial_number, set())
+        sensors: list[SensorEntity] = []
+        if DATA_AGE_ENTITY not in device_created:
+            device_created.add(DATA_AGE_ENTITY)
+            sensors += [DataAgeSensor(coordinator, device)]
 
         # Smart RO devices do not have a Home Assistant property map yet.
         # Expose their returned datapoints read-only so users can discover what the API provides.
         if isinstance(device, CulliganIoTRO):
-            for datapoint_id in sorted(_get_datapoint_properties(device).keys()):
-                LOGGER.debug("Smart RO datapoint sensor calling async_add: %s", datapoint_id)
-                sensors += [
-                    CulliganIoTROSensor(
-                        coordinator,
-                        device,
-                        datapoint_id,
-                    )
-                ]
-
-            if len(sensors) > 0:
-                async_add_devices(sensors)
-
-            LOGGER.debug("Finished Smart RO datapoint sensor async_add_devices")
-            continue
+            return sensors + _new_ro_sensors(coordinator, device, keys, device_created, ro_exposed)
+
+        return sensors + _new_softener_sensors(coordinator, device, compact_usage, keys, device_created)
 
-        for sensor in softener_sensors:
-            LOGGER.debug("sensor calling async_add: %s", sensor[0])
-            sensors += [
-                SoftenerSensor(
-                    coordinator,
-                    # config_entry,
-                    device,
-                    sensor[0],  # id
-                    sensor[1],  # description
-                    sensor[2],  # unit of measurement
-                    sensor[3],  # icon
-                    sensor[4],  # device class
-                    sensor[5],  # state class
-                )
-            ]
-
-        # add devices will add a new device (with area selection)
+    # Method two ... create individual sensors from the shared description catalog
+    sensors = []
+    for device in devices:
+        LOGGER.debug("Working on adding sensors device: %s", device._device_serial_number)
+        sensors += _new_sensors(device, coordinator.known_keys(device.device_serial_number))
+
+    # one batched add for the whole fleet, add devices will add a new device (with area selection)
+    if len(sensors) > 0:
+        async_add_devices(sensors)
+
+    LOGGER.debug("Finished sensor async_add_devices")
+
+    @callback
+    def _async_add_new_datapoints(dsn: str, keys: frozenset[str]) -> None:
+        """Add sensors for datapoints a device started reporting after setup, without a reload."""
+        device = coordinator.culligan_devices.get(dsn)
+        if device is None:
+            return
+        sensors = _new_sensors(device, keys)
         if len(sensors) > 0:
+            LOGGER.debug("Adding %d sensors for new datapoints of %s", len(sensors), dsn)
             async_add_devices(sensors)
 
-        LOGGER.debug("Finished sensor async_add_devices")
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_NEW_DATAPOINTS.format(config_entry.entry_id),
+            _async_add_new_datapoints,
+        )
+    )
+
+    @callback
+    def _async_forget_device(dsn: str) -> None:
+        """Forget the sensors of a retired device, so they are created again if it comes back."""
+        created.pop(dsn, None)
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_DEVICE_RETIRED.format(config_entry.entry_id),
+            _async_forget_device,
+        )
+    )
+
+
+def _new_ro_sensors(
+    coordinator: CulliganUpdateCoordinator,
+    device: CulliganIoTRO,
+    keys: Iterable[str],
+    created: set[str],
+    exposed: Callable[[str], bool],
+) -> list[SensorEntity]:
+    """Create read-only sensors for exposed Smart RO datapoints that do not have an entity yet.
+
+    The datapoints snapshot sensor is created once per device and carries the rest.
+    """
+    sensors = []
+    if RO_SNAPSHOT_ENTITY not in created:
+        created.add(RO_SNAPSHOT_ENTITY)
+        sensors += [SmartROSnapshotSensor(coordinator, device, exposed)]
+    for datapoint_id in sorted(set(keys) - created):
+        created.add(datapoint_id)
+        if not exposed(datapoint_id):
+            continue
+        LOGGER.debug("Smart RO datapoint sensor calling async_add: %s", datapoint_id)
+        sensors += [CulliganIoTROSensor(coordinator, device, datapoint_id)]
+    return sensors
+
+
+def _datapoint_filter(options: Mapping[str, Any]) -> Callable[[str], bool]:
+    """Return whether a Smart RO datapoint gets its own sensor under the allow/deny options."""
+    def _patterns(option: str) -> list[str]:
+        return [pattern.strip() for pattern in options.get(option, "").split(",") if pattern.strip()]
+
+    allow = _patterns(CONF_RO_DATAPOINT_ALLOWLIST)
+    deny = _patterns(CONF_RO_DATAPOINT_DENYLIST)
+
+    def exposed(datapoint_id: str) -> bool:
+        if allow and not any(fnmatchcase(datapoint_id, pattern) for pattern in allow):
+            return False
+        return not any(fnmatchcase(datapoint_id, pattern) for pattern in deny)
+
+    return exposed
+
+
+def _new_softener_sensors(
+    coordinator: CulliganUpdateCoordinator,
+    device: Device | CulliganIoTDevice,
+    compact_usage: bool,
+    keys: Iterable[str],
+    created: set[str],
+) -> list[SensorEntity]:
+    """Create sensors for the reported keys that do not have an entity yet.
+
+    Firmware differs in which datapoints it reports, so entities are only created for
+    keys present in a snapshot. The derived status sensor is always present.
+    """
+    keys = set(keys)
+    sensors = []
+    for description in SOFTENER_SENSORS:
+        if description.key not in keys or description.key in created:
+            continue
+        created.add(description.key)
+        LOGGER.debug("sensor calling async_add: %s", description.key)
+        sensors += [
+            SoftenerSensor(
+                coordinator,
+                device,
+                description,
+                enabled_default=not (compact_usage and description.key in USAGE_SLOT_KEYS),
+            )
+        ]
+
+    if compact_usage:
+        for description in USAGE_HISTOGRAMS:
+            if description.key in created or keys.isdisjoint(description.slot_keys):
+                continue
+            created.add(description.key)
+            LOGGER.debug("usage histogram calling async_add: %s", description.key)
+            sensors += [UsageHistogramSensor(coordinator, device, description)]
+    return sensors
 
 
 class CulliganIoTROSensor(CulliganBaseEntity, SensorEntity):
     """Read-only sensor for Smart RO CulliganIoT device datapoints."""
 
-    has_entity_name = True
-    use_device_name = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:water-circle"
+    _unrecorded_attributes = frozenset({"raw_value_preview"})
 
     def __init__(
         self,
@@ -381,43 +299,173 @@ class CulliganIoTROSensor(CulliganBaseEntity, SensorEntity):
         super().__init__(coordinator, device)
 
         self._attr_sensor_id = datapoint_id
-        self._attr_description = _describe_datapoint(datapoint_id)
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        self._attr_icon = "mdi:water-circle"
+        self.bind_properties(datapoint_id)
+        self._attr_name = _describe_datapoint(datapoint_id)
         self._attr_unique_id = f"{device.device_serial_number}_{_datapoint_unique_suffix(datapoint_id)}"
-        self.entity_id = generate_entity_id("sensor.{}", self._attr_unique_id, None, coordinator.hass)
-
-    @property
-    def native_value(self):
-        """Return the raw datapoint value."""
-        return _coerce_datapoint_state(_get_datapoint_properties(self.device).get(self._attr_sensor_id))
-
-    @property
-    def extra_state_attributes(self):
-        """Expose metadata for raw Smart RO datapoints."""
-        value = _get_datapoint_properties(self.device).get(self._attr_sensor_id)
-        attributes = {
+        self.entity_id = ENTITY_ID_FORMAT.format(slugify(self._attr_unique_id))
+        self._update_from_snapshot()
+
+    def _update_from_snapshot(self) -> None:
+        """Coerce the raw datapoint once per change rather than once per attribute."""
+        value = self.snapshot_value(self._attr_sensor_id)
+        self._attr_native_value = _coerce_datapoint_state(value)
+        self._attr_extra_state_attributes = {
             "datapoint_id": self._attr_sensor_id,
             "datapoint_type": type(value).__name__,
         }
-        if _coerce_datapoint_state(value) is None and value is not None:
-            attributes["raw_value_preview"] = str(value)[:255]
-        return attributes
+        if self._attr_native_value is None and value is not None:
+            self._attr_extra_state_attributes["raw_value_preview"] = str(value)[:255]
 
-    @property
-    def name(self) -> str | None:
-        """Define name as description. This shows in the Sensor Name column of entities."""
-        return self._attr_description
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Re-read the datapoint and write state."""
+        self._update_from_snapshot()
+        self.async_write_ha_state()
 
-    @property
-    def unique_id(self) -> str | None:
-        """Suggest the unique id of the entity. User never sees these."""
-        return self._attr_unique_id
+
+class SmartROSnapshotSensor(CulliganBaseEntity, SensorEntity):
+    """One diagnostic sensor carrying every Smart RO datapoint that has no sensor of its own.
+
+    The state is the number of datapoints the device reports. The datapoints attribute
+    is kept out of the recorder.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:database-eye-outline"
+    _attr_name = "datapoints"
+    _unrecorded_attributes = frozenset({"datapoints"})
+
+    def __init__(
+        self,
+        coordinator: CulliganUpdateCoordinator,
+        device: CulliganIoTRO,
+        exposed: Callable[[str], bool],
+    ) -> None:
+        """Initialize the Smart RO snapshot sensor."""
+        super().__init__(coordinator, device)
+
+        self._exposed = exposed
+        self._attr_unique_id = f"{device.device_serial_number}_datapoints"
+        self.entity_id = ENTITY_ID_FORMAT.format(slugify(self._attr_unique_id))
+        self._update_from_snapshot()
+
+    def _update_from_snapshot(self) -> None:
+        """Collect the datapoints that are not exposed as their own sensor."""
+        snapshot = self.snapshot
+        values = snapshot.values if snapshot else {}
+        self._attr_native_value = len(values)
+        self._attr_extra_state_attributes = {
+            "datapoints": {
+                datapoint_id: value
+                for datapoint_id, value in sorted(values.items())
+                if not self._exposed(datapoint_id)
+            }
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Re-collect the datapoints and write state."""
+        self._update_from_snapshot()
+        self.async_write_ha_state()
+
+
+class DataAgeSensor(CulliganBaseEntity, SensorEntity):
+    """Diagnostic sensor holding when the device's data was last confirmed by a poll or push.
+
+    Shown as an age by the frontend. The attributes tell whether the data is stale and
+    when each datapoint was last confirmed and last changed, the per-datapoint times
+    are kept out of the recorder.
+    """
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:clock-check-outline"
+    _attr_name = "Data age"
+    _unrecorded_attributes = frozenset({"last_confirmed", "last_changed"})
+
+    def __init__(self, coordinator: CulliganUpdateCoordinator, device: Device | CulliganIoTDevice) -> None:
+        """Initialize the data age sensor."""
+        super().__init__(coordinator, device)
+
+        self._attr_unique_id = f"{device.device_serial_number}_data_age"
+        self.entity_id = ENTITY_ID_FORMAT.format(slugify(self._attr_unique_id))
+        self.bind_properties(FRESHNESS_KEY)
+        self._written = self._update_from_freshness()
+
+    def _update_from_freshness(self) -> tuple:
+        """Read the confirmation times and staleness, returning what decides whether to write."""
+        freshness = self.coordinator.freshness(self._dsn)
+        self._attr_available = freshness is not None and freshness.confirmed is not None
+        if not self._attr_available:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return (False,)
+        stale = not self.coordinator.device_is_fresh(self._dsn)
+        times = freshness.as_dict()
+        self._attr_native_value = freshness.confirmed
+        self._attr_extra_state_attributes = {
+            "stale": stale,
+            "stale_after": self.coordinator.stale_after.total_seconds(),
+            "last_confirmed": times["last_confirmed"],
+            "last_changed": times["last_changed"],
+        }
+        return (True, freshness.confirmed, freshness.changed, stale)
 
     @property
-    def icon(self) -> str | None:
-        """Define the icon."""
-        return self._attr_icon
+    def available(self) -> bool:
+        """Available once data was confirmed, the age matters most while the device is unreachable."""
+        return self._attr_available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when the data was confirmed or changed, or went stale or fresh again."""
+        written = self._update_from_freshness()
+        if written != self._written:
+            self._written = written
+            self.async_write_ha_state()
+
+
+class UsageHistogramSensor(CulliganBaseEntity, SensorEntity):
+    """One sensor holding a whole rolling usage series as an attribute."""
+
+    _attr_device_class = SensorDeviceClass.WATER
+    _attr_native_unit_of_measurement = UnitOfVolume.GALLONS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: CulliganUpdateCoordinator,
+        device: Device | CulliganIoTDevice,
+        description: CulliganUsageHistogramEntityDescription,
+    ) -> None:
+        """Initialize the usage histogram sensor."""
+        super().__init__(coordinator, device)
+
+        self.entity_description = description
+        self._attr_name = description.name
+        self._attr_icon = description.icon
+        self._slot_keys = description.slot_keys
+        self._attr_unique_id = f"{device.device_serial_number}_{description.key}"
+        self.entity_id = ENTITY_ID_FORMAT.format(slugify(self._attr_unique_id))
+        self.bind_properties(*description.slot_keys)
+        self._update_from_snapshot()
+
+    def _update_from_snapshot(self) -> None:
+        """Total the reported slots and expose the whole series, slot 1 (most recent) first."""
+        snapshot = self.snapshot
+        if snapshot is None:
+            slot_values = [None] * len(self._slot_keys)
+        else:
+            slot_values = [snapshot.get(key) for key in self._slot_keys]
+        values = [value for value in slot_values if isinstance(value, (int, float))]
+        self._attr_native_value = sum(values) if values else None
+        self._attr_extra_state_attributes = {"values": slot_values}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Re-read the series and write state."""
+        self._update_from_snapshot()
+        self.async_write_ha_state()
 
 
 #class SoftenerSensor(CulliganWaterSoftenerEntity):
@@ -432,9 +480,7 @@ class SoftenerSensor(CulliganBaseEntity, SensorEntity):
     #   else use suggested_object_id
     #   suggested_object_id is config_entry id or device default name ... generates numbers if name is the same
 
-    # default ... sensor name is the property name alone (similar to specifying has_entity_name = True and use_device_name = False)
-    has_entity_name = True  # sensor name is Softener property name ... because device exists by default
-    use_device_name = False # sensor name is property name ... because device name is turned off by this flag
+    # default ... sensor name is the property name alone, has_entity_name is set on CulliganBaseEntity
 
     # should_poll should be provided by the UpdateCoordinator
 
@@ -443,112 +489,105 @@ class SoftenerSensor(CulliganBaseEntity, SensorEntity):
         coordinator: CulliganUpdateCoordinator,
         # config_entry: ConfigEntry,
         device: Device | CulliganIoTDevice,
-        sensor_id: str,
-        description: str,
-        unit_of_measurement: str | None,
-        icon: str,
-        device_class: SensorDeviceClass,
-        state_class: SensorStateClass | None,
+        description: CulliganSensorEntityDescription,
+        enabled_default: bool = True,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, device)
 
-        LOGGER.debug(f"Init for {description}")
-
-        self._attr_description                      = description
-        self._attr_device_class: SensorDeviceClass  = device_class
-        self._attr_icon                             = icon
-        self._attr_native_unit_of_measurement       = unit_of_measurement
-        self._attr_state_class:  SensorStateClass   = state_class
+        sensor_id                                   = description.key
+        self.entity_description                     = description
+        self._attr_name                             = description.name
+        self._attr_device_class: SensorDeviceClass  = description.device_class
+        self._attr_icon                             = description.icon
+        self._attr_native_unit_of_measurement       = description.native_unit_of_measurement
+        self._attr_state_class:  SensorStateClass   = description.state_class
+        self._attr_entity_registry_enabled_default  = enabled_default
 
         self._attr_unique_id                        = device._device_serial_number + "_" + sensor_id
-        self.entity_id                              = generate_entity_id("sensor.{}", self._attr_unique_id, None, coordinator.hass)
+        self.entity_id                              = ENTITY_ID_FORMAT.format(slugify(self._attr_unique_id))
+
+        self._attr_property_key                     = sensor_id             # snapshots are keyed by the ayla property map key
+        self.bind_properties(sensor_id)
 
+        self._write_filter                          = description.write_filter
+        self._written_at                            = 0.0
+        self._written_available                     = True
+        self._unsub_pending_write                   = None
         if self.io_culligan:
             self._attr_sensor_id                    = PROPERTY_VALUE_MAP[sensor_id]   # this is the mapped Culligan sensor data value
         else:
             self._attr_sensor_id                    = sensor_id             # this is the ayla property map key to get sensor data value
+        self._apply_state(self._decoded_state())
 
     @property
     def sensor_id(self):
         """Return the property key needed to get values"""
         return self._attr_sensor_id
 
-    @property
-    def state(self) -> int | None:
-        """Using devices stored property map, get the value from the dictionary"""
-        SENSOR_ID             = self.sensor_id
-        if self.io_culligan:
-            #BYPASS_PROPERTY   = PROPERTY_VALUE_MAP["actual_state_dealer_bypass"]
-            BYPASS_PROPERTY   = PROPERTY_VALUE_MAP["standard_bypass"]
-            VAC_MODE_PROPERTY = PROPERTY_VALUE_MAP["vacation_mode"]
-            LOGGER.debug(f"self is CULLIGAN")
-        else:
-            #BYPASS_PROPERTY   = "actual_state_dealer_bypass"
-            BYPASS_PROPERTY   = "standard_bypass"
-            VAC_MODE_PROPERTY = "vacation_mode"
-            LOGGER.debug(f"self is AYLA")
-        VALVE_BYPASS_TIME     = "time_rem_in_position"
-
-        if SENSOR_ID in ["status","unit_status_1","unit_status_tank_1"]:
-            vacation          = self.device.get_property_value(VAC_MODE_PROPERTY)
-            bypass            = self.device.get_property_value(BYPASS_PROPERTY)
-            bypass_time       = self.device.get_property_value(VALVE_BYPASS_TIME)
-            LOGGER.debug(f"For {SENSOR_ID} got: vac: {vacation} and bypass: {bypass} else: softening")
-            if vacation == 1 or vacation == 255:
-                state = "Vacation"
-                self._attr_icon = "mdi:airplane"
-            elif bypass in (True,1,2,3,4,5,6) or bypass_time > 0:
-                state = "Bypass"
-                self._attr_icon = "mdi:water-off"
-            else:
-                state = "Softening"
-                self._attr_icon = "mdi:water"
-            return state
-        elif SENSOR_ID == "current_flow_rate":
-            # need to divide by 10 to get current flow rate
-            LOGGER.debug(f"Attempting to get property value for: {SENSOR_ID} of len {len(SENSOR_ID)}")
-            flow_rate = self.device.get_property_value(SENSOR_ID)
-            LOGGER.debug(f"For {SENSOR_ID} Got {flow_rate}")
-            if flow_rate:
-                flow_rate = int(flow_rate)
-                if flow_rate == 0:
-                    return float(flow_rate)
-                else:
-                    return float(flow_rate / 10)
-            else:
-                # LOGGER.debug("UNABLE TO GET FLOW_RATE")
-                return 0
-        else:
-            LOGGER.debug(f"For {SENSOR_ID} got: {self.device.get_property_value(SENSOR_ID)}")
-            return self.device.get_property_value(SENSOR_ID)
-
-    @property
-    def unit_of_measurement(self) -> str | None:
-        """Define unit of measurement"""
-        return self._attr_native_unit_of_measurement
-
-    @property
-    def icon(self) -> str | None:
-        """Define the icon"""
-        return self._attr_icon
-
-    @property
-    def device_class(self) -> SensorDeviceClass | None:
-        """Define the device class"""
-        return self._attr_device_class
-    
-    @property
-    def state_class(self) -> SensorStateClass | None:
-        """Define the state class"""
-        return self._attr_state_class
+    def _decoded_state(self):
+        """Read the pre-decoded value from the coordinator snapshot, parsing dates"""
+        value = self.snapshot_value(self._attr_property_key)
+        if self._attr_property_key == "current_flow_rate" and value is None:
+            return 0
+        elif self._attr_device_class == SensorDeviceClass.TIMESTAMP:
+            return _as_datetime(value)
+        elif self._attr_device_class == SensorDeviceClass.DATE:
+            return _as_date(value)
+        return value
 
-    @property
-    def name(self) -> str | None:
-        """Define name as description. This shows in the Sensor Name column of entities."""
-        return f"{self._attr_description}"
-    
-    @property
-    def unique_id(self) -> str | None:
-        """Suggest the unique id of the entity. User never sees these."""
-        return f"{self._attr_unique_id}"
\ No newline at end of file
+    def _apply_state(self, value) -> None:
+        """Accept a decoded value as the sensor state, along with its icon"""
+        self._attr_native_value = value
+        if self._attr_property_key == "status":
+            self._attr_icon = STATUS_ICONS.get(value, "mdi:water")
+        self._written_at = monotonic()
+        self._written_available = self.available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Decode the new value once, and write it unless it is inside the sensor's deadband"""
+        value = self._decoded_state()
+        if self._write_filter is None:
+            self._apply_state(value)
+            self.async_write_ha_state()
+            return
+
+        # availability changes are never filtered
+        if self.available != self._written_available:
+            self._async_write_filtered(value)
+            return
+
+        if not self._write_filter.is_significant(self._attr_native_value, value):
+            if TRACER.enabled:
+                TRACER.record("sensor_write_filtered", entity=self.entity_id)
+            return
+
+        wait = self._written_at + self._write_filter.min_interval - monotonic()
+        if wait > 0:
+            if self._unsub_pending_write is None:
+                self._unsub_pending_write = async_call_later(self.hass, wait, self._async_write_pending)
+            return
+
+        self._async_write_filtered(value)
+
+    @callback
+    def _async_write_pending(self, _now) -> None:
+        """Write the change that was held back by the minimum write interval"""
+        self._unsub_pending_write = None
+        value = self._decoded_state()
+        if self._write_filter.is_significant(self._attr_native_value, value):
+            self._async_write_filtered(value)
+
+    @callback
+    def _async_write_filtered(self, value) -> None:
+        """Accept a value let through the write filter and write it to the state machine"""
+        self._apply_state(value)
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a held back write when the entity is removed"""
+        await super().async_will_remove_from_hass()
+        if self._unsub_pending_write is not None:
+            self._unsub_pending_write()
+            self._unsub_pending_write = None
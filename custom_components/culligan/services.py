@@ -0,0 +1,189 @@
+"""Culligan services: fleet commands and tracing."""
+from __future__ import annotations
+
+from .command_queue import PreparedCommand, bypass_command, vacation_command
+from .const import DOMAIN, LOGGER
+from .profiler import async_profile_cycles
+from .trace import DEFAULT_TRACE_SIZE, TRACER
+
+import asyncio
+from collections.abc import Callable
+from time import monotonic
+from typing import Any
+
+from ayla_iot_unofficial.device import Device, Softener
+from culligan.culliganiot_device import CulliganIoTDevice, CulliganIoTSoftener
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr, entity_registry as er
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+
+SERVICE_SET_VACATION_MODE = "set_vacation_mode"
+SERVICE_START_BYPASS = "start_bypass"
+SERVICE_CLEAR_BYPASS = "clear_bypass"
+SERVICE_START_TRACE = "start_trace"
+SERVICE_STOP_TRACE = "stop_trace"
+SERVICE_DUMP_TRACE = "dump_trace"
+SERVICE_PROFILE = "profile"
+
+ATTR_ENABLED = "enabled"
+ATTR_SIZE = "size"
+ATTR_SAMPLE_RATE = "sample_rate"
+ATTR_CYCLES = "cycles"
+
+# Devices commanded at the same time by one service call, the rest wait for a free slot
+MAX_CONCURRENT_COMMANDS = 4
+
+# Devices that accept vacation and bypass commands
+COMMAND_DEVICES = (Softener, CulliganIoTSoftener)
+
+SET_VACATION_MODE_SCHEMA = cv.make_entity_service_schema({vol.Required(ATTR_ENABLED): cv.boolean})
+TARGET_SCHEMA = cv.make_entity_service_schema({})
+START_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SIZE, default=DEFAULT_TRACE_SIZE): vol.All(vol.Coerce(int), vol.Range(min=1, max=100000)),
+        vol.Optional(ATTR_SAMPLE_RATE, default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0)),
+    }
+)
+PROFILE_SCHEMA = vol.Schema(
+    {vol.Optional(ATTR_CYCLES, default=3): vol.All(vol.Coerce(int), vol.Range(min=1, max=20))}
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Culligan fleet, tracing and profiling services."""
+
+    async def async_set_vacation_mode(call: ServiceCall) -> ServiceResponse:
+        enabled = call.data[ATTR_ENABLED]
+        return await _async_run_fleet_command(
+            hass, call, lambda device: vacation_command(device, enabled)
+        )
+
+    async def async_start_bypass(call: ServiceCall) -> ServiceResponse:
+        return await _async_run_fleet_command(hass, call, lambda device: bypass_command(device, True))
+
+    async def async_clear_bypass(call: ServiceCall) -> ServiceResponse:
+        return await _async_run_fleet_command(hass, call, lambda device: bypass_command(device, False))
+
+    for service, handler, schema in (
+        (SERVICE_SET_VACATION_MODE, async_set_vacation_mode, SET_VACATION_MODE_SCHEMA),
+        (SERVICE_START_BYPASS, async_start_bypass, TARGET_SCHEMA),
+        (SERVICE_CLEAR_BYPASS, async_clear_bypass, TARGET_SCHEMA),
+    ):
+        hass.services.async_register(
+            DOMAIN, service, handler, schema=schema, supports_response=SupportsResponse.OPTIONAL
+        )
+
+    async def async_start_trace(call: ServiceCall) -> None:
+        LOGGER.info("Tracing Culligan events into a buffer of %d", call.data[ATTR_SIZE])
+        TRACER.start(call.data[ATTR_SIZE], call.data[ATTR_SAMPLE_RATE])
+
+    async def async_stop_trace(call: ServiceCall) -> ServiceResponse:
+        TRACER.stop()
+        return {"events": TRACER.dump()}
+
+    async def async_dump_trace(call: ServiceCall) -> ServiceResponse:
+        return {"enabled": TRACER.enabled, "events": TRACER.dump()}
+
+    hass.services.async_register(DOMAIN, SERVICE_START_TRACE, async_start_trace, schema=START_TRACE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN, SERVICE_STOP_TRACE, async_stop_trace, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_DUMP_TRACE, async_dump_trace, supports_response=SupportsResponse.ONLY
+    )
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        coordinators = [entry_data["coordinator"] for entry_data in hass.data.get(DOMAIN, {}).values()]
+        if not coordinators:
+            raise ServiceValidationError("No Culligan accounts are loaded")
+        return await async_profile_cycles(hass, coordinators, call.data[ATTR_CYCLES])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _targeted_dsns(hass: HomeAssistant, call: ServiceCall) -> set[str]:
+    """Return the serial numbers of the devices targeted by a call.
+
+    Entities and areas are resolved to their devices, the serial number is the
+    identifier each device was registered with.
+    """
+    selected = async_extract_referenced_entity_ids(hass, call)
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+
+    device_ids = set(selected.referenced_devices)
+    for entity_id in selected.referenced | selected.indirectly_referenced:
+        entry = entity_registry.async_get(entity_id)
+        if entry is not None and entry.platform == DOMAIN and entry.device_id is not None:
+            device_ids.add(entry.device_id)
+
+    dsns = set()
+    for device_id in device_ids:
+        if (device_entry := device_registry.async_get(device_id)) is None:
+            continue
+        dsns.update(identifier for domain, identifier in device_entry.identifiers if domain == DOMAIN)
+    return dsns
+
+
+async def _async_run_fleet_command(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    build: Callable[[Device | CulliganIoTDevice], PreparedCommand],
+) -> ServiceResponse:
+    """Send a command to every targeted device, a few at a time, and report each outcome."""
+    dsns = _targeted_dsns(hass, call)
+    if not dsns:
+        raise ServiceValidationError("No Culligan devices were targeted")
+
+    coordinators = {
+        dsn: entry_data["coordinator"]
+        for entry_data in hass.data.get(DOMAIN, {}).values()
+        for dsn in entry_data["coordinator"].culligan_devices
+        if dsn in dsns
+    }
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMMANDS)
+
+    async def async_command_device(dsn: str) -> dict[str, Any]:
+        result: dict[str, Any] = {"dsn": dsn, "success": False, "superseded": False, "error": None}
+        if (coordinator := coordinators.get(dsn)) is None:
+            result["error"] = "device is not loaded"
+            return result
+        device = coordinator.culligan_devices[dsn]
+        if not isinstance(device, COMMAND_DEVICES):
+            result["error"] = "device does not support this command"
+            return result
+
+        async with semaphore:
+            started = monotonic()
+            try:
+                sent = await coordinator.async_run_command(dsn, *build(device))
+            except Exception as err:  # pylint: disable=broad-except
+                LOGGER.warning("%s command failed for %s: %s", call.service, dsn, err)
+                result["error"] = str(err) or type(err).__name__
+            else:
+                # a newer command for the device replaced this one before it was sent
+                result["success"] = sent
+                result["superseded"] = not sent
+            result["duration_ms"] = round((monotonic() - started) * 1000)
+        return result
+
+    results = await asyncio.gather(*(async_command_device(dsn) for dsn in sorted(dsns)))
+    LOGGER.debug(
+        "%s sent to %d devices, %d failed, %d superseded",
+        call.service,
+        len(results),
+        sum(result["error"] is not None for result in results),
+        sum(result["superseded"] for result in results),
+    )
+    return {"results": list(results)}
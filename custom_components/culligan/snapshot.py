@@ -0,0 +1,202 @@
+"""Immutable per-device state snapshots published by the coordinator."""
+from __future__ import annotations
+
+from .const import PROPERTY_VALUE_MAP
+
+from ayla_iot_unofficial.device import Device, Softener
+from culligan.culliganiot_device import CulliganIoTDevice, CulliganIoTRO
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any
+
+# Vacation mode is 0 (off) or 1/255 (on)
+# Bypass is 255 (off) or 1-6 (on) or false/true, as the vacation switch also reads it
+VACATION_ON_VALUES = (1, 255)
+SWITCH_ON_VALUES = (True, 1, 2, 3, 4, 5, 6)
+
+STATUS_VACATION = "Vacation"
+STATUS_BYPASS = "Bypass"
+STATUS_SOFTENING = "Softening"
+
+# Snapshot keys that are computed rather than reported, and the properties they are read from
+DERIVED_INPUTS: dict[str, frozenset[str]] = {
+    "status": frozenset({"vacation_mode", "standard_bypass", "time_rem_in_position"}),
+}
+
+
+@dataclass(frozen=True)
+class DeviceSnapshot:
+    """Decoded, read-only view of one device taken after a refresh.
+
+    Softener values are keyed by the Ayla property names used in PROPERTY_VALUE_MAP,
+    regardless of which cloud reported them. Smart RO values are keyed by raw datapoint ID.
+    Only properties the device actually reported are present.
+    """
+
+    dsn: str
+    values: Mapping[str, Any]
+    updated_at: datetime
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a decoded value, or default if the device did not report it."""
+        return self.values.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.values
+
+
+def _read_ayla_properties(device: Softener) -> dict[str, Any]:
+    """Read every mapped property an Ayla softener reported, resolving alternate names."""
+    reported = device.properties_full
+    alternates = getattr(device, "alternate_mapping", None) or {}
+    values = {}
+    for key in PROPERTY_VALUE_MAP:
+        name = key if key in reported else alternates.get(key)
+        if name is not None and name in reported:
+            values[key] = device.property_values[name]
+    return values
+
+
+def _read_culliganiot_properties(device: CulliganIoTDevice) -> dict[str, Any]:
+    """Read every mapped property a CulliganIoT softener reported, keyed by Ayla name."""
+    reported = _get_raw_datapoints(device)
+    return {
+        key: reported[mapped]
+        for key, mapped in PROPERTY_VALUE_MAP.items()
+        if mapped and mapped in reported
+    }
+
+
+def _get_raw_datapoints(device: CulliganIoTDevice) -> dict:
+    """Return a CulliganIoT device's datapoint dictionary if available."""
+    properties = getattr(device, "properties", {})
+    return properties if isinstance(properties, dict) else {}
+
+
+def merge_datapoints(device: Device | CulliganIoTDevice, datapoints: Mapping[str, Any]) -> frozenset[str]:
+    """Write datapoint values keyed like snapshot values into a device object.
+
+    This is the reverse of what build_snapshot reads, so pushed updates look like a
+    refresh. Values are decoded like snapshot values and encoded back into what the
+    cloud reports. Returns the keys that were written, derived keys and keys the
+    device never reported are skipped.
+    """
+    applied = set()
+    if isinstance(device, CulliganIoTRO):
+        properties = getattr(device, "properties", None)
+        if not isinstance(properties, dict):
+            return frozenset()
+        properties.update(datapoints)
+        return frozenset(datapoints)
+
+    if isinstance(device, CulliganIoTDevice):
+        properties = getattr(device, "properties", None)
+        if not isinstance(properties, dict):
+            return frozenset()
+        for key, value in datapoints.items():
+            name = PROPERTY_VALUE_MAP.get(key)
+            if name and key not in DERIVED_INPUTS:
+                properties[name] = _encode(key, value)
+                applied.add(key)
+        return frozenset(applied)
+
+    reported = device.properties_full
+    alternates = getattr(device, "alternate_mapping", None) or {}
+    for key, value in datapoints.items():
+        name = key if key in reported else alternates.get(key)
+        if name is not None and name in reported and key not in DERIVED_INPUTS:
+            reported[name]["value"] = _encode(key, value)
+            applied.add(key)
+    return frozenset(applied)
+
+
+def _encode(key: str, value: Any) -> Any:
+    """Return the raw value the cloud reports for a decoded snapshot value."""
+    if key == "current_flow_rate" and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return encode_flow_rate(value)
+    return value
+
+
+def decode_status(values: Mapping[str, Any]) -> str:
+    """Derive the overall softener status from vacation and bypass state."""
+    vacation = values.get("vacation_mode")
+    bypass = values.get("standard_bypass")
+    bypass_time = values.get("time_rem_in_position") or 0
+    if vacation in VACATION_ON_VALUES:
+        return STATUS_VACATION
+    if bypass in SWITCH_ON_VALUES or bypass_time > 0:
+        return STATUS_BYPASS
+    return STATUS_SOFTENING
+
+
+def decode_flow_rate(raw) -> float:
+    """Softeners report flow rate in tenths of a gallon per minute."""
+    if not raw:
+        return 0
+    return float(int(raw) / 10)
+
+
+def encode_flow_rate(value: float) -> int:
+    """Reverse of decode_flow_rate."""
+    return round(value * 10)
+
+
+def build_snapshot(device: Device | CulliganIoTDevice, updated_at: datetime) -> DeviceSnapshot:
+    """Build an immutable snapshot from a device object that has just been updated."""
+    if isinstance(device, CulliganIoTRO):
+        values = dict(_get_raw_datapoints(device))
+    else:
+        if isinstance(device, CulliganIoTDevice):
+            values = _read_culliganiot_properties(device)
+        else:
+            values = _read_ayla_properties(device)
+        values["status"] = decode_status(values)
+        if "current_flow_rate" in values:
+            values["current_flow_rate"] = decode_flow_rate(values["current_flow_rate"])
+
+    return DeviceSnapshot(
+        dsn=device.device_serial_number,
+        values=MappingProxyType(values),
+        updated_at=updated_at,
+    )
+
+
+def switch_is_on(key: str, snapshot: DeviceSnapshot | None) -> bool:
+    """Return whether the vacation_mode or standard_bypass switch is on in a snapshot.
+
+    Permanent bypass is position 6 or a remaining valve time of 255.
+    """
+    if snapshot is None:
+        return False
+    value = snapshot.get(key)
+    if key == "standard_bypass":
+        return value == 6 or (snapshot.get("time_rem_in_position") or 0) == 255
+    return value in SWITCH_ON_VALUES
+
+
+def with_overrides(snapshot: DeviceSnapshot, overrides: Mapping[str, Any]) -> DeviceSnapshot:
+    """Return a copy of a softener snapshot with some values replaced, re-deriving status."""
+    values = {**snapshot.values, **overrides}
+    values["status"] = decode_status(values)
+    return DeviceSnapshot(
+        dsn=snapshot.dsn,
+        values=MappingProxyType(values),
+        updated_at=snapshot.updated_at,
+    )
+
+
+def diff_snapshots(previous: DeviceSnapshot | None, current: DeviceSnapshot) -> frozenset[str] | None:
+    """Return the keys whose value differs between two snapshots.
+
+    None means there is no previous snapshot to compare against, so everything is new.
+    """
+    if previous is None:
+        return None
+    old, new = previous.values, current.values
+    return frozenset(
+        key for key in old.keys() | new.keys()
+        if key not in old or key not in new or old[key] != new[key]
+    )
@@ -0,0 +1,46 @@
+"""Structured tracing of refreshes, commands and entity updates into a ring buffer."""
+from __future__ import annotations
+
+from collections import deque
+from random import random
+from time import time
+from typing import Any
+
+DEFAULT_TRACE_SIZE = 500
+
+
+class Tracer:
+    """Sampled, bounded in-memory event trace.
+
+    Disabled by default. Call sites guard with `if TRACER.enabled:` so that a
+    disabled tracer costs one attribute read, no arguments are built.
+    """
+
+    def __init__(self) -> None:
+        """Start disabled with an empty buffer."""
+        self.enabled = False
+        self.sample_rate = 1.0
+        self._events: deque[tuple[float, str, dict[str, Any]]] = deque(maxlen=DEFAULT_TRACE_SIZE)
+
+    def start(self, size: int = DEFAULT_TRACE_SIZE, sample_rate: float = 1.0) -> None:
+        """Clear the buffer and start recording."""
+        self._events = deque(maxlen=size)
+        self.sample_rate = sample_rate
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Stop recording, keeping what was recorded."""
+        self.enabled = False
+
+    def record(self, event: str, **fields: Any) -> None:
+        """Record an event, subject to the sample rate."""
+        if self.sample_rate < 1.0 and random() >= self.sample_rate:
+            return
+        self._events.append((time(), event, fields))
+
+    def dump(self) -> list[dict[str, Any]]:
+        """Return the recorded events, oldest first."""
+        return [{"time": at, "event": event, **fields} for at, event, fields in self._events]
+
+
+TRACER = Tracer()
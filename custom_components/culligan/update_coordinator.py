@@ -1,6 +1,35 @@
 """Data update coordinator for Culligan devices."""
 from __future__ import annotations
-from .const import API_TIMEOUT, DOMAIN, LOGGER, PLATFORMS
+from .const import (
+    API_TIMEOUT,
+    CONF_PUSH_UPDATES,
+    CONF_UPDATE_INTERVAL,
+    DAILY_USAGE_KEYS,
+    DEFAULT_PUSH_UPDATES,
+    DOMAIN,
+    EVENT_DATAPOINTS_CHANGED,
+    HOURLY_USAGE_KEYS,
+    LOGGER,
+    PLATFORMS,
+    PROPERTY_VALUE_MAP,
+    SIGNAL_DEVICE_RETIRED,
+    SIGNAL_NEW_DATAPOINTS,
+    SIGNAL_NEW_DEVICES,
+)
+from .command_queue import DeviceCommand, DeviceCommandQueue
+from .connectivity import DeviceConnectivity, listed_online
+from .freshness import FRESHNESS_KEY, STALE_INTERVALS, DeviceFreshness
+from .metrics import CoordinatorMetrics
+from .trace import TRACER
+from .snapshot import (
+    DERIVED_INPUTS,
+    DeviceSnapshot,
+    build_snapshot,
+    diff_snapshots,
+    merge_datapoints,
+    with_overrides,
+)
+from .usage_statistics import UsageStatisticsImporter
 
 import asyncio
 from async_timeout import timeout
@@ -11,15 +40,66 @@ from culligan import CulliganApi
 from culligan.exc import CulliganAuthError, CulliganNotAuthedError, CulliganAuthExpiringError
 from culligan.culliganiot_device import CulliganIoTDevice, CulliganIoTRO, CulliganIoTSoftener
 
+from collections.abc import Callable, Mapping
 from datetime import datetime, timedelta
+from time import monotonic
+from typing import Any, NamedTuple
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+# Filtered refreshes only fetch what entities need, so new datapoints are only
+# discovered by a full fetch. Do one at least this often per device.
+FULL_FETCH_INTERVAL = timedelta(hours=1)
 
-class CulliganUpdateCoordinator(DataUpdateCoordinator[bool]):
+# After a command, refresh only that device this often until the cloud reflects
+# the change, giving up on the optimistic state after the timeout
+CONFIRM_INTERVAL = 5
+CONFIRM_TIMEOUT = 60
+# polling interval while a push transport delivers updates, polls then only reconcile
+PUSH_RECONCILE_INTERVAL = timedelta(minutes=15)
+# seconds an unload waits for cancelled refreshes and commands to stop
+UNLOAD_TIMEOUT = 5
+# devices updated at the same time by one refresh, the stalest devices get the first slots
+MAX_CONCURRENT_POLLS = 4
+# change set of a device whose data was confirmed without any value changing
+ONLY_FRESHNESS = frozenset({FRESHNESS_KEY})
+# consecutive device listings of its cloud a device must be missing from before it is retired
+RETIRE_AFTER_LISTINGS = 3
+
+
+def _backend(device: Device | CulliganIoTDevice) -> str:
+    """Return which cloud a device talks to, for request metrics."""
+    return "culligan" if isinstance(device, CulliganIoTDevice) else "ayla"
+
+
+class OptimisticState(NamedTuple):
+    """Values shown for a device until a command is confirmed by the cloud."""
+
+    overrides: Mapping[str, Any]
+    confirmed: Callable[[DeviceSnapshot], bool]
+    deadline: float
+
+
+class ListenerContext(NamedTuple):
+    """Which device properties a coordinator listener depends on.
+
+    A properties value of None binds the listener to every property of the device, an
+    empty set to none of them, so it only wakes when the whole device changes (e.g. it
+    goes offline, comes back or its data goes stale).
+    """
+
+    dsn: str
+    properties: frozenset[str] | None = None
+
+
+class CulliganUpdateCoordinator(DataUpdateCoordinator[dict[str, DeviceSnapshot]]):
     """Define a wrapper class to update Culligan data."""
 
     def __init__(
@@ -34,52 +114,570 @@ class CulliganUpdateCoordinator(DataUpdateCoordinator[bool]):
 
         self.culligan_api = culligan_api
 
-        LOGGER.debug(f"Culligan_devices: {culligan_devices}")
         # make a dict of serials with their device objects
         self.culligan_devices = {
             softener.device_serial_number: softener for softener in culligan_devices
         }
-        LOGGER.debug(f"self culligan_devices map: {self.culligan_devices}")
+        LOGGER.debug("Coordinating %d Culligan device(s)", len(self.culligan_devices))
 
         self._config_entry = config_entry
         self._hass = hass
         self._online_dsns: set[str] = set()
+        # dsn -> connectivity and probe backoff, offline devices are not polled every refresh
+        # self.culligan_devices is only supported_devices as of 1.3.1, double check before polling anything
+        SUPPORTED_DEVICE_CLASSES = [Softener, CulliganIoTSoftener, CulliganIoTRO]
+        self._connectivity: dict[str, DeviceConnectivity] = {
+            dsn: DeviceConnectivity(dsn)
+            for dsn, device in self.culligan_devices.items()
+            if type(device) in SUPPORTED_DEVICE_CLASSES
+        }
+        # devices that went offline or came back since the last published refresh
+        self._connectivity_changed: set[str] = set()
+        # dsn -> when its data was last confirmed and changed, per device and datapoint
+        self._freshness: dict[str, DeviceFreshness] = {
+            dsn: DeviceFreshness() for dsn in self.culligan_devices
+        }
+        # dsn -> cancels the wake-up of its entities once its data goes stale
+        self._stale_timers: dict[str, CALLBACK_TYPE] = {}
+        # dsn -> snapshot keys the refresh in progress fetches, None for every key
+        self._fetched_keys: dict[str, frozenset[str] | None] = {}
+        # refresh timings, cloud request counts and error history for diagnostics
+        self.metrics = CoordinatorMetrics()
         self.platforms = PLATFORMS
 
-        update_interval = config_entry.data["user_input"]["update_interval"]
+        # property -> listener index, so a refresh only wakes entities whose inputs changed
+        #     dsn -> property -> {remove_listener: update_callback}
+        self._property_listeners: dict[str, dict[str, dict[CALLBACK_TYPE, CALLBACK_TYPE]]] = {}
+        #     dsn -> {remove_listener: update_callback} for listeners bound to the whole device
+        self._device_listeners: dict[str, dict[CALLBACK_TYPE, CALLBACK_TYPE]] = {}
+        #     dsn -> {remove_listener: update_callback} for listeners bound to no property
+        self._availability_listeners: dict[str, dict[CALLBACK_TYPE, CALLBACK_TYPE]] = {}
+        self._indexed_listeners: set[CALLBACK_TYPE] = set()
+        # changed properties per dsn from the latest refresh, None for a dsn means everything
+        self._pending_changes: dict[str, frozenset[str] | None] | None = None
+        # changed datapoint values per dsn from the latest refresh, fired as events
+        self._pending_deltas: dict[str, dict[str, Any]] = {}
+        # every datapoint key each device has reported so far, so platforms can add
+        # entities when a datapoint shows up after setup
+        self._known_keys: dict[str, frozenset[str]] = {}
+        self._pending_new_keys: dict[str, frozenset[str]] = {}
+        # dsn -> time of the last unfiltered property fetch
+        self._last_full_fetch: dict[str, datetime] = {}
+        # dsn -> consecutive device listings of its cloud that did not include it
+        self._missing_listings: dict[str, int] = {}
+        # dsn -> command slot -> optimistic values of an unconfirmed command
+        self._optimistic: dict[str, dict[str, OptimisticState]] = {}
+        # dsn -> confirmation refresh loop, while any command of the device is unconfirmed
+        self._confirm_tasks: dict[str, asyncio.Task] = {}
+        # the coordinator's own tasks running refreshes in progress, cancelled on shutdown
+        self._poll_tasks: set[asyncio.Task] = set()
+        # dsn -> queue serializing commands with refreshes of the device
+        self._command_queues: dict[str, DeviceCommandQueue] = {
+            dsn: DeviceCommandQueue(hass, device)
+            for dsn, device in self.culligan_devices.items()
+        }
+        # long-term statistics importers for the rolling usage windows of softeners
+        self._usage_importers: dict[str, UsageStatisticsImporter] = {
+            dsn: UsageStatisticsImporter(hass, dsn, device.name)
+            for dsn, device in self.culligan_devices.items()
+            if not isinstance(device, CulliganIoTRO)
+        }
 
         super().__init__(
             hass,
             LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=update_interval),
+            update_interval=self._options_update_interval(config_entry.options),
         )
         LOGGER.debug("coordinator setup complete")
 
+    def _options_update_interval(self, options: Mapping[str, Any]) -> timedelta:
+        """Return the polling interval from the options, falling back to the setup value."""
+        update_interval = timedelta(
+            seconds=options.get(
+                CONF_UPDATE_INTERVAL, self._config_entry.data["user_input"][CONF_UPDATE_INTERVAL]
+            )
+        )
+        if options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES):
+            return max(update_interval, PUSH_RECONCILE_INTERVAL)
+        return update_interval
+
+    @callback
+    def async_apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply changed LIVE_OPTIONS to the running coordinator."""
+        update_interval = self._options_update_interval(options)
+        if update_interval != self.update_interval:
+            LOGGER.debug("Updating update-interval to: %s", update_interval)
+            self.update_interval = update_interval
+            # replace the refresh already scheduled with the old interval
+            self._schedule_refresh()
+
     @property
     def online_dsns(self) -> set[str]:
         """Get the set of all online DSNs."""
         # LOGGER.debug("property set: online_dsns")
         return self._online_dsns
 
+    def known_keys(self, dsn: str) -> frozenset[str]:
+        """Return every datapoint key a device has reported since setup."""
+        return self._known_keys.get(dsn, frozenset())
+
+    def get_snapshot(self, dsn: str) -> DeviceSnapshot | None:
+        """Return the latest published snapshot for a device dsn."""
+        if self.data is None:
+            return None
+        return self.data.get(dsn)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, indexing listeners by the properties they depend on."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if not isinstance(context, ListenerContext):
+            return remove_listener
+
+        if context.properties is None:
+            buckets = [self._device_listeners.setdefault(context.dsn, {})]
+        elif not context.properties:
+            buckets = [self._availability_listeners.setdefault(context.dsn, {})]
+        else:
+            device_index = self._property_listeners.setdefault(context.dsn, {})
+            buckets = [device_index.setdefault(key, {}) for key in context.properties]
+        for bucket in buckets:
+            bucket[remove_listener] = update_callback
+        self._indexed_listeners.add(remove_listener)
+
+        @callback
+        def remove_indexed_listener() -> None:
+            """Remove the listener from the coordinator and the property index."""
+            remove_listener()
+            self._indexed_listeners.discard(remove_listener)
+            for bucket in buckets:
+                bucket.pop(remove_listener, None)
+
+        return remove_indexed_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners bound to properties that changed in the last refresh.
+
+        Anything other than a successful refresh with a computed change set (errors,
+        recoveries, manual updates) falls back to updating every listener.
+        """
+        changes, self._pending_changes = self._pending_changes, None
+        if changes is None or not self.last_update_success:
+            super().async_update_listeners()
+            self._async_publish_changes()
+            return
+
+        to_call: dict[CALLBACK_TYPE, CALLBACK_TYPE] = {}
+        for dsn, keys in changes.items():
+            if keys is not None and not keys:
+                continue
+            # a confirmation without changes only concerns listeners following freshness
+            if keys != ONLY_FRESHNESS:
+                to_call.update(self._device_listeners.get(dsn, {}))
+            device_index = self._property_listeners.get(dsn, {})
+            if keys is None:
+                to_call.update(self._availability_listeners.get(dsn, {}))
+                for bucket in device_index.values():
+                    to_call.update(bucket)
+            else:
+                for key in keys:
+                    to_call.update(device_index.get(key, {}))
+
+        # listeners without a ListenerContext are not indexed and always update
+        for remove_listener, (update_callback, _) in list(self._listeners.items()):
+            if remove_listener not in self._indexed_listeners:
+                to_call[remove_listener] = update_callback
+
+        started = monotonic()
+        if TRACER.enabled:
+            TRACER.record(
+                "listeners",
+                changed={dsn: sorted(keys) if keys is not None else None for dsn, keys in changes.items()},
+                woken=len(to_call),
+                registered=len(self._listeners),
+            )
+        for update_callback in to_call.values():
+            update_callback()
+        self.metrics.observe("listeners", monotonic() - started)
+        self.metrics.count_listener_updates(len(to_call))
+
+        self._async_publish_changes()
+
+    @callback
+    def _async_publish_changes(self) -> None:
+        """Announce the datapoints the last refresh changed or reported for the first time."""
+        self._async_fire_deltas()
+        new_keys, self._pending_new_keys = self._pending_new_keys, {}
+        for dsn, keys in new_keys.items():
+            async_dispatcher_send(
+                self.hass,
+                SIGNAL_NEW_DATAPOINTS.format(self._config_entry.entry_id),
+                dsn,
+                keys,
+            )
+
+    @callback
+    def _async_fire_deltas(self) -> None:
+        """Fire one event per device carrying only the datapoints that changed."""
+        deltas, self._pending_deltas = self._pending_deltas, {}
+        for dsn, datapoints in deltas.items():
+            self.hass.bus.async_fire(
+                EVENT_DATAPOINTS_CHANGED,
+                {
+                    "entry_id": self._config_entry.entry_id,
+                    "dsn": dsn,
+                    "datapoints": datapoints,
+                },
+            )
+
+    def needed_properties(self, dsn: str) -> frozenset[str] | None:
+        """Return the snapshot keys enabled entities of a device depend on.
+
+        Disabled entities are never added to hass and so never listen, which makes the
+        listener index an exact, live picture of what is needed. None means everything
+        is needed: a listener is bound to the whole device, or nothing has bound yet.
+        """
+        if self._device_listeners.get(dsn):
+            return None
+        keys = {
+            key
+            for key, bucket in self._property_listeners.get(dsn, {}).items()
+            if bucket
+        }
+        if not keys:
+            return None
+        for derived, inputs in DERIVED_INPUTS.items():
+            if derived in keys:
+                keys |= inputs
+        if dsn in self._usage_importers:
+            keys.update(HOURLY_USAGE_KEYS, DAILY_USAGE_KEYS)
+        return frozenset(keys)
+
+    def _properties_to_fetch(self, dsn: str) -> list[str] | None:
+        """Return the Ayla property names to request for a device, None to fetch all."""
+        device = self.culligan_devices[dsn]
+        self._fetched_keys[dsn] = None
+        if not isinstance(device, Softener):
+            # the CulliganIoT API always returns every property of a device
+            return None
+
+        now = dt_util.utcnow()
+        needed = self.needed_properties(dsn)
+        last_full = self._last_full_fetch.get(dsn)
+        if needed is None or last_full is None or now - last_full >= FULL_FETCH_INTERVAL:
+            self._last_full_fetch[dsn] = now
+            return None
+
+        self._fetched_keys[dsn] = needed
+
+        # properties_full is keyed by cleaned names, the cloud filters on the real ones
+        # (set_vacation_mode rather than vacation_mode). Properties missing from the
+        # last full fetch have no known name and wait for the next one.
+        reported = device.properties_full
+        alternates = getattr(device, "alternate_mapping", None) or {}
+        names = set()
+        for key in needed:
+            if key not in PROPERTY_VALUE_MAP:
+                continue
+            cleaned = key if key in reported else alternates.get(key)
+            if cleaned in reported and "name" in reported[cleaned]:
+                names.add(reported[cleaned]["name"])
+        if not names:
+            self._fetched_keys[dsn] = None
+            return None
+        return sorted(names)
+
+    async def async_run_command(
+        self,
+        dsn: str,
+        slot: str,
+        command: DeviceCommand,
+        overrides: Mapping[str, Any],
+        confirmed: Callable[[DeviceSnapshot], bool],
+    ) -> bool:
+        """Send a device command, showing its expected result right away.
+
+        The command goes through the device's command queue, where a newer command
+        for the same slot replaces it if it has not been sent yet, in which case
+        False is returned. The overrides are published immediately and kept until a
+        snapshot of the device satisfies confirmed, or CONFIRM_TIMEOUT passes.
+        Meanwhile only this device is refreshed, every CONFIRM_INTERVAL seconds.
+        """
+        state = OptimisticState(overrides, confirmed, self.hass.loop.time() + CONFIRM_TIMEOUT)
+        self._optimistic.setdefault(dsn, {})[slot] = state
+        self._async_publish_device(dsn)
+        try:
+            with self.metrics.track_request(_backend(self.culligan_devices[dsn]), "command"):
+                sent = await self._command_queues[dsn].async_submit(slot, command)
+        except Exception:
+            if self._optimistic.get(dsn, {}).get(slot) is state:
+                del self._optimistic[dsn][slot]
+            self._async_publish_device(dsn)
+            raise
+
+        if dsn not in self._confirm_tasks:
+            self._confirm_tasks[dsn] = self._config_entry.async_create_background_task(
+                self.hass,
+                self._async_confirm_commands(dsn),
+                f"{DOMAIN} confirm commands {dsn}",
+            )
+        return sent
+
+    async def _async_confirm_commands(self, dsn: str) -> None:
+        """Refresh one device until its optimistic states are confirmed or expire."""
+        try:
+            while self._optimistic.get(dsn):
+                await asyncio.sleep(CONFIRM_INTERVAL)
+                try:
+                    await self._async_update_device(dsn, self._properties_to_fetch(dsn))
+                except Exception as err:  # pylint: disable=broad-except
+                    LOGGER.debug("Refresh of %s while confirming commands failed: %s", dsn, err)
+                    # expired optimistic states still need to be withdrawn
+                    self._async_publish_device(dsn)
+                    continue
+                self._async_publish_device(dsn, polled=True)
+        finally:
+            self._confirm_tasks.pop(dsn, None)
+
+    def _device_snapshot(self, dsn: str, updated_at: datetime) -> DeviceSnapshot:
+        """Build a device snapshot, applying the overrides of unconfirmed commands.
+
+        Commands that are confirmed by the snapshot, or past their deadline, are dropped.
+        """
+        snapshot = build_snapshot(self.culligan_devices[dsn], updated_at)
+        states = self._optimistic.get(dsn)
+        if not states:
+            return snapshot
+        now = self.hass.loop.time()
+        overrides: dict[str, Any] = {}
+        for slot, state in list(states.items()):
+            if state.confirmed(snapshot):
+                LOGGER.debug("%s command for %s confirmed", slot, dsn)
+                del states[slot]
+            elif now >= state.deadline:
+                LOGGER.debug("%s command for %s was not confirmed in time", slot, dsn)
+                del states[slot]
+            else:
+                overrides.update(state.overrides)
+        return with_overrides(snapshot, overrides) if overrides else snapshot
+
+    @callback
+    def _async_publish_device(
+        self, dsn: str, polled: bool = False, pushed: frozenset[str] = frozenset()
+    ) -> None:
+        """Publish a new snapshot of a single device outside the regular refresh.
+
+        A poll confirms the datapoints it fetched and a push the ones it carried.
+        Optimistic command state alone does not make the data any fresher.
+        """
+        now = dt_util.utcnow()
+        previous = self.get_snapshot(dsn)
+        snapshot = self._device_snapshot(dsn, now)
+        changed = diff_snapshots(previous, snapshot)
+        self._freshness[dsn].record_changes(now, snapshot, changed)
+        self.data = {**(self.data or {}), dsn: snapshot}
+        if changed is None:
+            self._pending_deltas = {dsn: dict(snapshot.values)}
+        elif changed:
+            self._pending_deltas = {dsn: {key: snapshot.get(key) for key in changed}}
+        if polled or pushed:
+            self._confirm_device(dsn, now, self._confirmed_keys(dsn, snapshot) if polled else pushed)
+            if changed is not None:
+                changed |= {FRESHNESS_KEY}
+        self._pending_changes = {dsn: changed}
+        self._track_new_keys(dsn, snapshot)
+        self.async_update_listeners()
+
+    @callback
+    def async_push_datapoints(self, dsn: str, datapoints: Mapping[str, Any]) -> bool:
+        """Merge datapoints pushed by a transport into a device and publish it.
+
+        Datapoints are keyed like snapshot values. Returns False if the dsn is not
+        one of this coordinator's devices.
+        """
+        if (device := self.culligan_devices.get(dsn)) is None:
+            return False
+        applied = merge_datapoints(device, datapoints)
+        if TRACER.enabled:
+            TRACER.record("push", dsn=dsn, received=len(datapoints), applied=sorted(applied))
+        if applied:
+            self._async_publish_device(dsn, pushed=applied)
+        return True
+
+    async def async_sync_devices(
+        self, devices: list[Softener] | list[CulliganIoTRO] | list[CulliganIoTSoftener]
+    ) -> None:
+        """Attach devices added to the account and retire the ones removed from it.
+
+        New devices are announced with SIGNAL_NEW_DEVICES so platforms add their
+        entities. A device is retired, and removed from the device registry together
+        with its entities, once RETIRE_AFTER_LISTINGS consecutive listings of its cloud
+        did not include it. A cloud that listed none of its devices is taken to have
+        had a hiccup, and does not count towards that.
+        """
+        current = {device.device_serial_number: device for device in devices}
+        listed_backends = {_backend(device) for device in devices}
+        added = [device for dsn, device in current.items() if dsn not in self.culligan_devices]
+
+        for dsn, device in list(self.culligan_devices.items()):
+            if dsn in current:
+                self._missing_listings.pop(dsn, None)
+                continue
+            if _backend(device) not in listed_backends:
+                continue
+            missing = self._missing_listings.get(dsn, 0) + 1
+            if missing < RETIRE_AFTER_LISTINGS:
+                LOGGER.debug("Culligan device %s was not listed (%d/%d)", dsn, missing, RETIRE_AFTER_LISTINGS)
+                self._missing_listings[dsn] = missing
+                continue
+            self._retire_device(dsn)
+        if not added:
+            return
+
+        for device in added:
+            dsn = device.device_serial_number
+            LOGGER.info("Attaching Culligan device %s (%s)", device.name, dsn)
+            self.culligan_devices[dsn] = device
+            self._connectivity[dsn] = DeviceConnectivity(dsn)
+            self._freshness[dsn] = DeviceFreshness()
+            self._command_queues[dsn] = DeviceCommandQueue(self.hass, device)
+            if not isinstance(device, CulliganIoTRO):
+                self._usage_importers[dsn] = UsageStatisticsImporter(self.hass, dsn, device.name)
+        async_dispatcher_send(
+            self.hass, SIGNAL_NEW_DEVICES.format(self._config_entry.entry_id), added
+        )
+        # fetch the new devices now, their datapoint sensors follow SIGNAL_NEW_DATAPOINTS
+        await self.async_request_refresh()
+
+    @callback
+    def _retire_device(self, dsn: str) -> None:
+        """Stop tracking a device that left the account and remove it from the registry."""
+        LOGGER.info("Retiring Culligan device %s, it is no longer on the account", dsn)
+        device_registry = dr.async_get(self.hass)
+        if (device_entry := device_registry.async_get_device(identifiers={(DOMAIN, dsn)})) is not None:
+            device_registry.async_update_device(
+                device_entry.id, remove_config_entry_id=self._config_entry.entry_id
+            )
+
+        if (queue := self._command_queues.pop(dsn, None)) is not None:
+            queue.cancel()
+        if (task := self._confirm_tasks.pop(dsn, None)) is not None:
+            task.cancel()
+        if (cancel_stale_timer := self._stale_timers.pop(dsn, None)) is not None:
+            cancel_stale_timer()
+        for tracked in (
+            self.culligan_devices,
+            self._connectivity,
+            self._freshness,
+            self._fetched_keys,
+            self._optimistic,
+            self._usage_importers,
+            self._known_keys,
+            self._pending_new_keys,
+            self._pending_deltas,
+            self._last_full_fetch,
+            self._missing_listings,
+            self._property_listeners,
+            self._device_listeners,
+            self._availability_listeners,
+        ):
+            tracked.pop(dsn, None)
+        self._online_dsns.discard(dsn)
+        self._connectivity_changed.discard(dsn)
+        if self.data and dsn in self.data:
+            self.data = {key: snapshot for key, snapshot in self.data.items() if key != dsn}
+        async_dispatcher_send(self.hass, SIGNAL_DEVICE_RETIRED.format(self._config_entry.entry_id), dsn)
+
+    def connectivity(self, dsn: str) -> DeviceConnectivity | None:
+        """Return the connectivity and probe backoff state of a device."""
+        return self._connectivity.get(dsn)
+
     def device_is_online(self, dsn: str) -> bool:
         """Return the online state of a given device dsn."""
-        LOGGER.debug("check: device_is_online")
         return dsn in self._online_dsns
 
+    def device_is_listed_offline(self, dsn: str) -> bool:
+        """Return whether the cloud listing last reported a device offline."""
+        connectivity = self._connectivity.get(dsn)
+        return connectivity is not None and connectivity.listed_offline
+
+    def freshness(self, dsn: str) -> DeviceFreshness | None:
+        """Return when the data of a device was last confirmed and changed."""
+        return self._freshness.get(dsn)
+
+    @property
+    def stale_after(self) -> timedelta:
+        """Return how long unconfirmed data stays fresh."""
+        return STALE_INTERVALS * self.update_interval
+
+    def device_is_fresh(self, dsn: str) -> bool:
+        """Return whether the data of a device was confirmed within stale_after."""
+        freshness = self._freshness.get(dsn)
+        if freshness is None or freshness.confirmed is None:
+            return False
+        return dt_util.utcnow() - freshness.confirmed <= self.stale_after
+
+    def _confirmed_keys(self, dsn: str, snapshot: DeviceSnapshot) -> frozenset[str]:
+        """Return the snapshot keys the latest poll of a device fetched."""
+        fetched = self._fetched_keys.pop(dsn, None)
+        if fetched is None:
+            return frozenset(snapshot.values)
+        return fetched & snapshot.values.keys()
+
+    @callback
+    def _confirm_device(self, dsn: str, now: datetime, keys: frozenset[str]) -> None:
+        """Record confirmed data of a device and wake its entities once it goes stale."""
+        self._freshness[dsn].confirm(now, keys)
+        if (cancel_stale_timer := self._stale_timers.pop(dsn, None)) is not None:
+            cancel_stale_timer()
+
+        @callback
+        def async_went_stale(_now: datetime) -> None:
+            """Re-evaluate availability of every entity of the device."""
+            self._stale_timers.pop(dsn, None)
+            LOGGER.debug("Data of %s is stale", dsn)
+            self._pending_changes = {dsn: None}
+            self.async_update_listeners()
+
+        self._stale_timers[dsn] = async_call_later(self.hass, self.stale_after, async_went_stale)
+
+    async def _async_update_device(self, dsn: str, property_list: list[str] | None = None) -> None:
+        """Update one device, waiting for any command being sent to it."""
+        async with self._command_queues[dsn].lock:
+            device = self.culligan_devices[dsn]
+            started = monotonic()
+            try:
+                with self.metrics.track_request(_backend(device), "device_update"):
+                    await self._async_update_softener(device, property_list)
+            except Exception as err:
+                if TRACER.enabled:
+                    TRACER.record("device_update", dsn=dsn, error=repr(err), duration=monotonic() - started)
+                raise
+            if TRACER.enabled:
+                TRACER.record(
+                    "device_update",
+                    dsn=dsn,
+                    properties=len(property_list) if property_list is not None else None,
+                    duration=monotonic() - started,
+                )
+
     @staticmethod
-    async def _async_update_softener(softener: Softener | CulliganIoTRO | CulliganIoTSoftener) -> None:
-        """Asynchronously update the data for a single device."""
-        dsn = softener.device_serial_number
-        LOGGER.debug(
-            "async_update_softener: Updating Culligan data for device DSN %s", dsn
-        )
+    async def _async_update_softener(
+        softener: Softener | CulliganIoTRO | CulliganIoTSoftener,
+        property_list: list[str] | None = None,
+    ) -> None:
+        """Asynchronously update the data for a single device.
 
+        Ayla devices only fetch the properties in property_list when one is given.
+        """
         # Ayla connected Softeners need to send a wifi_report to trigger up-to-date information
         if isinstance(softener, Softener):
             async with timeout(API_TIMEOUT):
                 try:
-                    LOGGER.debug("sending batch_datapoints")
                     poll = await softener.async_send_poll()
                 except Exception as err:
                     LOGGER.exception(
@@ -91,8 +689,7 @@ class CulliganUpdateCoordinator(DataUpdateCoordinator[bool]):
             if poll:
                 async with timeout(API_TIMEOUT):
                     try:
-                        LOGGER.debug("starting async_update")
-                        return await softener.async_update()
+                        return await softener.async_update(property_list)
                     except Exception as err:
                         LOGGER.exception(
                             "Unexpected error updating Culligan devices.  Attempting re-auth"
@@ -104,10 +701,8 @@ class CulliganUpdateCoordinator(DataUpdateCoordinator[bool]):
                 )
 
         if isinstance(softener, CulliganIoTDevice):
-            LOGGER.debug("updating culliganiot device")
             async with timeout(API_TIMEOUT):
                 try:
-                    LOGGER.debug("starting async_update")
                     return await softener.async_update()
                 except Exception as err:
                     LOGGER.exception(
@@ -115,37 +710,66 @@ class CulliganUpdateCoordinator(DataUpdateCoordinator[bool]):
                     )
                     raise UpdateFailed(err) from err
 
-    async def _async_update_data(self) -> bool:
-        """Loop through online DSNs and call update_softener. CulliganApi has an instance of AylaApi, which is what we really care about updating until Culligan takes ownership."""
-        LOGGER.debug("_async_update_data")
+    async def async_shutdown(self) -> None:
+        """Stop polling and cancel in-flight refreshes and commands.
 
-        # If configuration options have changed ... update them now:
-        config_entry = self.hass.config_entries.async_get_entry(
-            self._config_entry.entry_id
-        )
-        # LOGGER.debug("Config entry data: %s", config_entry.data)
-        # LOGGER.debug("Config entry options: %s", config_entry.options)
-        if "update_interval" in config_entry.options.keys():
-            if self.update_interval != timedelta(
-                seconds=config_entry.options["update_interval"]
-            ):
-                LOGGER.debug(
-                    "Updating update-interval to: %i",
-                    config_entry.options["update_interval"],
-                )
-                self.update_interval = timedelta(
-                    seconds=config_entry.options["update_interval"]
-                )
+        Waits at most UNLOAD_TIMEOUT seconds for the cancelled work to stop, so an
+        unload never blocks on cloud requests running into their API_TIMEOUT.
+        """
+        await super().async_shutdown()
+        for queue in self._command_queues.values():
+            queue.cancel()
+        self._optimistic.clear()
+        for cancel_stale_timer in self._stale_timers.values():
+            cancel_stale_timer()
+        self._stale_timers.clear()
+        tasks = [
+            task
+            for task in (*self._poll_tasks, *self._confirm_tasks.values())
+            if not task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=UNLOAD_TIMEOUT)
+            if pending:
+                LOGGER.warning("%d Culligan tasks did not stop within %ss", len(pending), UNLOAD_TIMEOUT)
 
+    async def _async_update_data(self) -> dict[str, DeviceSnapshot]:
+        """Run one refresh in a task of its own that async_shutdown can cancel.
+
+        Refreshes are requested from the scheduler, services and platforms. Only the
+        coordinator's poll is cancelled on shutdown, never the task that asked for it.
+        """
+        poll_task = self.hass.async_create_task(self._async_poll_devices(), f"{DOMAIN} refresh")
+        self._poll_tasks.add(poll_task)
+        started = monotonic()
+        try:
+            return await poll_task
+        except asyncio.CancelledError:
+            if (task := asyncio.current_task()) is not None and task.cancelling():
+                raise
+            raise UpdateFailed("Refresh was cancelled by shutdown") from None
+        except Exception as err:
+            self.metrics.record_error(err)
+            raise
+        finally:
+            self._poll_tasks.discard(poll_task)
+            self.metrics.observe("refresh", monotonic() - started)
+
+    async def _async_poll_devices(self) -> dict[str, DeviceSnapshot]:
+        """Loop through online DSNs and call update_softener. CulliganApi has an instance of AylaApi, which is what we really care about updating until Culligan takes ownership."""
         # Check auth and refresh if needed of Culligan IoT
+        started = monotonic()
         try:
-            LOGGER.debug("checking CulliganIoT auth token expiry")
             if self.culligan_api.token_expiring_soon:
-                await self.culligan_api.async_refresh_auth()
+                with self.metrics.track_request("culligan", "refresh_auth"):
+                    await self.culligan_api.async_refresh_auth()
             elif datetime.now() > self.culligan_api.auth_expiration - timedelta(
                 seconds=600
             ):
-                await self.culligan_api.async_refresh_auth()
+                with self.metrics.track_request("culligan", "refresh_auth"):
+                    await self.culligan_api.async_refresh_auth()
         except (
             CulliganAuthError,
             CulliganNotAuthedError,
@@ -158,22 +782,29 @@ class CulliganUpdateCoordinator(DataUpdateCoordinator[bool]):
                 "Unexpected error updating Culligan devices.  Attempting re-auth"
             )
             raise UpdateFailed(err) from err
+        self.metrics.observe("culligan_auth", monotonic() - started)
 
         # Check online devices
         all_online_devices = []
-        
+
         # Check auth and refresh if needed of Ayla
         if self.culligan_api.Ayla:
             try:
-                LOGGER.debug("checking Ayla auth token expiry")
+                started = monotonic()
                 if self.culligan_api.Ayla.token_expiring_soon:
-                    await self.culligan_api.Ayla.async_refresh_auth()
+                    with self.metrics.track_request("ayla", "refresh_auth"):
+                        await self.culligan_api.Ayla.async_refresh_auth()
                 elif datetime.now() > self.culligan_api.Ayla.auth_expiration - timedelta(
                     seconds=600
                 ):
-                    await self.culligan_api.Ayla.async_refresh_auth()
+                    with self.metrics.track_request("ayla", "refresh_auth"):
+                        await self.culligan_api.Ayla.async_refresh_auth()
+                self.metrics.observe("ayla_auth", monotonic() - started)
                 # Add online devices from Ayla
-                all_online_devices += await self.culligan_api.Ayla.async_list_devices()
+                started = monotonic()
+                with self.metrics.track_request("ayla", "list_devices"):
+                    all_online_devices += await self.culligan_api.Ayla.async_list_devices()
+                self.metrics.observe("ayla_listing", monotonic() - started)
             except (
                 AylaAuthError,
                 AylaNotAuthedError,
@@ -188,44 +819,133 @@ class CulliganUpdateCoordinator(DataUpdateCoordinator[bool]):
                 raise UpdateFailed(err) from err
 
         # Add online devices from Culligan
-        all_online_devices += (await self.culligan_api.async_get_device_registry())["data"]["devices"]
+        started = monotonic()
+        with self.metrics.track_request("culligan", "device_registry"):
+            all_online_devices += (await self.culligan_api.async_get_device_registry())["data"]["devices"]
+        self.metrics.observe("culligan_listing", monotonic() - started)
 
-        # self.culligan_devices is now only supported_devices as of 1.3.1, need another check here to not update 'online but not supported' devices
-        temp = {}
-        SUPPORTED_DEVICE_CLASSES = [Softener, CulliganIoTSoftener, CulliganIoTRO]
+        listed: dict[str, bool] = {}
         for device in all_online_devices:
-            dsn = ""
             # check DSN for Ayla, serialNumber for CulliganIoT
-            if "dsn" in device.keys():
-                dsn = device["dsn"]
-            elif "serialNumber" in device.keys():
-                dsn = device["serialNumber"]
+            dsn = device.get("dsn") or device.get("serialNumber")
+            if dsn is None:
+                LOGGER.debug("Device listing has no dsn or serialNumber property! %s", device)
+            elif dsn in self.culligan_devices:
+                listed[dsn] = listed_online(device)
             else:
-                LOGGER.debug(f"all_online_devices has no dsn or serialNumber property! {device}")
+                LOGGER.debug("Unsupported or untracked device: %s", dsn)
 
-            # if a dsn is online and matches the supported devices passed to the coordinator upon init, track it
-            if dsn in self.culligan_devices.keys():
-                temp[dsn] = "online"
-            elif type(device) in SUPPORTED_DEVICE_CLASSES:
-                LOGGER.debug(f"Device with DSN {dsn} is supported {type(device)}, but was not tracked for some reason.")
-            else:
-                LOGGER.debug(f"offline or unsupported device: {dsn}")
-        LOGGER.debug(f"Added online DSNs to temp dict {temp}")
-        self._online_dsns = temp.keys()
-        LOGGER.debug(f"online_dsns is keys() {self.online_dsns}")
+        # devices listed offline are not polled, ones whose last poll failed only
+        # when their next probe is due
+        now = self.hass.loop.time()
+        to_poll = []
+        for dsn, connectivity in self._connectivity.items():
+            if not listed.get(dsn):
+                if connectivity.mark_listed_offline():
+                    self._connectivity_changed.add(dsn)
+                    self.metrics.record_connectivity(dsn, False, None)
+            elif connectivity.should_poll(now):
+                to_poll.append(dsn)
 
-        if len(self.online_dsns) > 0:
-            # Update all online devices
-            # get the objects by dsn from the culligan_devices dict
-            LOGGER.debug(f"async_update_data: Updating Culligan device data for {len(all_online_devices)} devices")
-            online_devices = (self.culligan_devices[dsn] for dsn in self._online_dsns)
+        if to_poll:
+            # Update the devices, each waits for a command being sent to it.
+            # Never confirmed devices go first, then the ones with the oldest data.
+            to_poll.sort(key=lambda dsn: self._freshness[dsn].confirmed or datetime.min.replace(tzinfo=dt_util.UTC))
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
 
-            try:
-                return await asyncio.gather(
-                    *(self._async_update_softener(v) for v in online_devices)
+            async def async_poll_device(dsn: str) -> None:
+                async with semaphore:
+                    await self._async_update_device(dsn, self._properties_to_fetch(dsn))
+
+            started = monotonic()
+            results = await asyncio.gather(
+                *(async_poll_device(dsn) for dsn in to_poll),
+                return_exceptions=True,
+            )
+            self.metrics.observe("devices", monotonic() - started)
+            errors = []
+            for dsn, result in zip(to_poll, results):
+                if isinstance(result, ConfigEntryAuthFailed):
+                    raise result
+                if isinstance(result, Exception):
+                    LOGGER.debug("Updating %s failed: %s", dsn, result)
+                    self.metrics.record_error(result, dsn)
+                    errors.append(result)
+                self._set_connectivity(dsn, not isinstance(result, Exception), now)
+            if len(errors) == len(to_poll):
+                raise UpdateFailed(errors[0]) from errors[0]
+        self._online_dsns = {dsn for dsn, connectivity in self._connectivity.items() if connectivity.online}
+        if TRACER.enabled:
+            TRACER.record(
+                "refresh",
+                listed=len(listed),
+                polled=to_poll,
+                online=sorted(self._online_dsns),
+            )
+        return self._build_snapshots()
+
+    def _set_connectivity(self, dsn: str, online: bool, now: float) -> None:
+        """Record a poll outcome of a device, and any change in availability."""
+        connectivity = self._connectivity[dsn]
+        if online:
+            if connectivity.mark_online():
+                self._connectivity_changed.add(dsn)
+                self.metrics.record_connectivity(dsn, True, None)
+            return
+        if connectivity.mark_offline(now):
+            self._connectivity_changed.add(dsn)
+        self.metrics.record_connectivity(dsn, False, connectivity.next_probe - now)
+
+    def _track_new_keys(self, dsn: str, snapshot: DeviceSnapshot) -> None:
+        """Remember datapoints a device reports for the first time, to announce them."""
+        known = self._known_keys.get(dsn, frozenset())
+        new_keys = snapshot.values.keys() - known
+        if new_keys:
+            self._known_keys[dsn] = known | new_keys
+            self._pending_new_keys[dsn] = frozenset(new_keys)
+
+    def _build_snapshots(self) -> dict[str, DeviceSnapshot]:
+        """Decode updated devices into a fresh snapshot dict.
+
+        Offline devices keep their previous snapshot. The new dict is built completely
+        before it is returned, so entities only ever see whole snapshots.
+        """
+        started = monotonic()
+        now = dt_util.utcnow()
+        previous = self.data or {}
+        snapshots = dict(previous)
+        changes: dict[str, frozenset[str] | None] = {}
+        deltas: dict[str, dict[str, Any]] = {}
+        for dsn in self._online_dsns:
+            snapshot = snapshots[dsn] = self._device_snapshot(dsn, now)
+            changed = changes[dsn] = diff_snapshots(previous.get(dsn), snapshot)
+            self._freshness[dsn].record_changes(now, snapshot, changed)
+            self._confirm_device(dsn, now, self._confirmed_keys(dsn, snapshot))
+            if changed is None:
+                deltas[dsn] = dict(snapshot.values)
+            elif changed:
+                deltas[dsn] = {key: snapshot.get(key) for key in changed}
+        self._pending_deltas = deltas
+        # availability of every entity of a device that went offline or came back changes
+        changed_connectivity, self._connectivity_changed = self._connectivity_changed, set()
+        for dsn in changed_connectivity:
+            changes[dsn] = None
+
+        for dsn in self._online_dsns:
+            self._track_new_keys(dsn, snapshots[dsn])
+
+        for dsn in self._online_dsns:
+            if dsn in self._usage_importers and changes[dsn] != frozenset():
+                self._config_entry.async_create_background_task(
+                    self.hass,
+                    self._usage_importers[dsn].async_import(snapshots[dsn]),
+                    f"{DOMAIN} usage statistics import {dsn}",
                 )
-            except Exception as err:
-                LOGGER.exception("Unexpected error updating Culligan devices")
-                raise UpdateFailed(err) from err
-        else:
-            LOGGER.debug("No online devices were parsed, no updates to make.")
+        # confirmed devices also wake the listeners that follow data freshness
+        for dsn in self._online_dsns:
+            if changes[dsn] is not None:
+                changes[dsn] = changes[dsn] | {FRESHNESS_KEY}
+        # recovering from a failed refresh changes availability of every entity
+        self._pending_changes = changes if self.last_update_success else None
+        self.metrics.observe("snapshots", monotonic() - started)
+        return snapshots
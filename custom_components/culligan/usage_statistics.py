@@ -0,0 +1,142 @@
+"""Import rolling softener usage windows into long-term statistics."""
+from __future__ import annotations
+
+from .const import DAILY_USAGE_KEYS, DOMAIN, HOURLY_USAGE_KEYS, LOGGER
+from .snapshot import DeviceSnapshot
+
+import asyncio
+from datetime import datetime, timedelta
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.components.recorder.util import get_instance
+from homeassistant.const import UnitOfVolume
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+# Devices roll their windows on their own clock, wait a little past each boundary
+# before trusting that slot 2 holds the period that just completed
+ROLLOVER_GRACE = timedelta(minutes=5)
+
+
+def hourly_slot_starts(now: datetime) -> list[datetime]:
+    """Return the UTC start of each hourly usage slot, slot 1 (the current hour) first."""
+    current_hour = now.replace(minute=0, second=0, microsecond=0)
+    return [current_hour - timedelta(hours=slot) for slot in range(len(HOURLY_USAGE_KEYS))]
+
+
+def daily_slot_starts(now: datetime) -> list[datetime]:
+    """Return the UTC start of each daily usage slot, slot 1 (today) first.
+
+    Statistics rows must start on a UTC hour. Where local midnight is not on one
+    (half and quarter hour offsets), the row starts at the next UTC hour, which
+    still falls on the local day it holds.
+    """
+    today = dt_util.start_of_local_day(dt_util.as_local(now))
+    starts = []
+    for slot in range(len(DAILY_USAGE_KEYS)):
+        start = dt_util.as_utc(today - timedelta(days=slot))
+        if start.minute or start.second:
+            start = start.replace(minute=0, second=0) + timedelta(hours=1)
+        starts.append(start)
+    return starts
+
+
+class UsageStatisticsImporter:
+    """Turn one softener's hourly and daily usage windows into external statistics.
+
+    Slot 1 of each window is the period still in progress, so only slots 2..N are
+    imported, each timestamped from the start of the current hour or local day
+    (see daily_slot_starts for local days that do not start on a UTC hour).
+    Every call imports the completed periods newer than the last imported row, which
+    also backfills any gap after downtime as far back as the window reaches.
+    """
+
+    def __init__(self, hass: HomeAssistant, dsn: str, device_name: str) -> None:
+        """Initialize the importer for one device."""
+        self.hass = hass
+        self._device_name = device_name
+        self._hourly_id = f"{DOMAIN}:{slugify(dsn)}_hourly_water_usage"
+        self._daily_id = f"{DOMAIN}:{slugify(dsn)}_daily_water_usage"
+        # statistic_id -> (start timestamp, sum) of the newest row written, None if there is none
+        self._last_rows: dict[str, tuple[float, float] | None] = {}
+        self._lock = asyncio.Lock()
+
+    async def async_import(self, snapshot: DeviceSnapshot) -> None:
+        """Import any newly completed hours and days from a snapshot."""
+        if self._lock.locked():
+            # the previous import is still waiting on the recorder, the next refresh will catch up
+            return
+        async with self._lock:
+            now = dt_util.utcnow() - ROLLOVER_GRACE
+            await self._async_import_window(
+                self._hourly_id,
+                f"{self._device_name} hourly water usage",
+                snapshot,
+                HOURLY_USAGE_KEYS,
+                hourly_slot_starts(now),
+            )
+            await self._async_import_window(
+                self._daily_id,
+                f"{self._device_name} daily water usage",
+                snapshot,
+                DAILY_USAGE_KEYS,
+                daily_slot_starts(now),
+            )
+
+    async def _async_import_window(
+        self,
+        statistic_id: str,
+        name: str,
+        snapshot: DeviceSnapshot,
+        slot_keys: list[str],
+        slot_starts: list[datetime],
+    ) -> None:
+        """Write the completed slots of one window that are newer than the last row."""
+        if statistic_id not in self._last_rows:
+            self._last_rows[statistic_id] = await self._async_get_last_row(statistic_id)
+        last_row = self._last_rows[statistic_id]
+        last_start, total = last_row if last_row else (0.0, 0.0)
+
+        statistics = []
+        # oldest completed slot first, skipping slot 1 which is still accumulating
+        for key, start in reversed(list(zip(slot_keys, slot_starts))[1:]):
+            if start.timestamp() <= last_start:
+                continue
+            value = snapshot.get(key)
+            if not isinstance(value, (int, float)):
+                continue
+            total += value
+            last_start = start.timestamp()
+            statistics.append(StatisticData(start=start, state=value, sum=total))
+
+        if not statistics:
+            return
+
+        LOGGER.debug("Importing %d rows into %s", len(statistics), statistic_id)
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=name,
+                source=DOMAIN,
+                statistic_id=statistic_id,
+                unit_of_measurement=UnitOfVolume.GALLONS,
+            ),
+            statistics,
+        )
+        self._last_rows[statistic_id] = (last_start, total)
+
+    async def _async_get_last_row(self, statistic_id: str) -> tuple[float, float] | None:
+        """Return start timestamp and sum of the newest stored row, if any."""
+        last_stats = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, True, {"sum"}
+        )
+        if not last_stats:
+            return None
+        row = last_stats[statistic_id][0]
+        return row["start"], row.get("sum") or 0.0
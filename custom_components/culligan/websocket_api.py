@@ -0,0 +1,100 @@
+"""Websocket commands for Culligan datapoint streams and queries."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DOMAIN, EVENT_DATAPOINTS_CHANGED
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the Culligan websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe_datapoints)
+    websocket_api.async_register_command(hass, ws_get_datapoints)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "culligan/get_datapoints",
+        vol.Required("dsn"): str,
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def ws_get_datapoints(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the latest snapshot of one device, including datapoints without a sensor."""
+    entry_id = msg.get("entry_id")
+    for config_entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
+        if entry_id is not None and entry_id != config_entry_id:
+            continue
+        snapshot = entry_data["coordinator"].get_snapshot(msg["dsn"])
+        if snapshot is not None:
+            connection.send_result(
+                msg["id"],
+                {
+                    "entry_id": config_entry_id,
+                    "dsn": snapshot.dsn,
+                    "updated_at": snapshot.updated_at.isoformat(),
+                    "datapoints": dict(snapshot.values),
+                },
+            )
+            return
+
+    connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, f"No datapoints for device {msg['dsn']}")
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "culligan/subscribe_datapoints",
+        vol.Optional("entry_id"): str,
+        vol.Optional("dsn"): str,
+    }
+)
+@callback
+def ws_subscribe_datapoints(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream changed datapoints, one message per device per refresh.
+
+    The first messages carry the full current snapshot of every matching device,
+    after that only the datapoints that changed are sent.
+    """
+    entry_id = msg.get("entry_id")
+    dsn = msg.get("dsn")
+
+    def _matches(event_entry_id: str, event_dsn: str) -> bool:
+        return (entry_id is None or entry_id == event_entry_id) and (dsn is None or dsn == event_dsn)
+
+    @callback
+    def _forward(event: Event) -> None:
+        if _matches(event.data["entry_id"], event.data["dsn"]):
+            connection.send_message(websocket_api.event_message(msg["id"], event.data))
+
+    connection.subscriptions[msg["id"]] = hass.bus.async_listen(EVENT_DATAPOINTS_CHANGED, _forward)
+    connection.send_result(msg["id"])
+
+    for config_entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
+        coordinator = entry_data["coordinator"]
+        for snapshot in (coordinator.data or {}).values():
+            if _matches(config_entry_id, snapshot.dsn):
+                connection.send_message(
+                    websocket_api.event_message(
+                        msg["id"],
+                        {
+                            "entry_id": config_entry_id,
+                            "dsn": snapshot.dsn,
+                            "datapoints": dict(snapshot.values),
+                        },
+                    )
+                )
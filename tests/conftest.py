@@ -0,0 +1,188 @@
+"""Shared fixtures for the behaviour tests.
+
+Tests that need Home Assistant and the cloud libraries skip themselves with
+pytest.importorskip, so nothing here imports them at module level.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+UPDATE_INTERVAL = 30
+
+
+@pytest.fixture
+async def hass(tmp_path):
+    """Return a bare Home Assistant instance running on the test loop."""
+    from homeassistant.core import HomeAssistant
+
+    hass = HomeAssistant(str(tmp_path))
+    yield hass
+    await hass.async_stop(force=True)
+
+
+@pytest.fixture
+def make_softener():
+    """Return a factory for Ayla softeners holding the given raw properties.
+
+    Properties are (real Ayla name, value, base type) as the cloud lists them, and go
+    through the library's own update handling, so names are cleaned the same way.
+    """
+    from ayla_iot_unofficial.device import Softener
+
+    def make(dsn: str = "AC000W000000001", properties=()):
+        device = Softener(
+            None,
+            {
+                "dsn": dsn,
+                "key": 1,
+                "oem_model": "culligan",
+                "model": "AY008ABC1",
+                "mac": "",
+                "lan_ip": "",
+                "product_name": "Softener",
+            },
+        )
+        device._do_update(
+            True,
+            [{"property": {"name": name, "value": value, "base_type": base_type}} for name, value, base_type in properties],
+        )
+        return device
+
+    return make
+
+
+def _iot_factory(device_class):
+    """Return a factory for CulliganIoT devices of one class holding the given datapoints."""
+
+    def make(serial: str = "CS000000001", datapoints=None, online: bool = True):
+        device = device_class(
+            None,
+            {
+                "name": device_class.__name__,
+                "serialNumber": serial,
+                "model": "SmartHE",
+                "generation": "1",
+                "swVersion": "1.0",
+                "region": {"code": "US"},
+                "status": {"connection": {"online": online}},
+            },
+        )
+        device.properties = dict(datapoints or {})
+        return device
+
+    return make
+
+
+@pytest.fixture
+def make_iot_softener():
+    """Return a factory for CulliganIoT softeners holding the given datapoints."""
+    from culligan.culliganiot_device import CulliganIoTSoftener
+
+    return _iot_factory(CulliganIoTSoftener)
+
+
+@pytest.fixture
+def make_iot_ro():
+    """Return a factory for Smart RO devices holding the given datapoints."""
+    from culligan.culliganiot_device import CulliganIoTRO
+
+    return _iot_factory(CulliganIoTRO)
+
+
+def _make_config_entry(options=None):
+    """Return a stand-in config entry with the attributes the coordinator reads."""
+
+    def create_background_task(hass, target, name):
+        # the usage statistics import needs the recorder, which these tests do not run
+        target.close()
+
+    entry = SimpleNamespace(
+        entry_id="entry",
+        pref_disable_new_entities=False,
+        options={"update_interval": UPDATE_INTERVAL, **(options or {})},
+        data={"user_input": {"update_interval": UPDATE_INTERVAL}},
+        async_create_background_task=create_background_task,
+        on_unload=[],
+    )
+    entry.async_on_unload = entry.on_unload.append
+    return entry
+
+
+@pytest.fixture
+def make_config_entry():
+    """Return a factory for stand-in config entries."""
+    return _make_config_entry
+
+
+@pytest.fixture
+def make_coordinator(hass):
+    """Return a factory for coordinators of the given devices, with a stand-in API."""
+    from custom_components.culligan.update_coordinator import CulliganUpdateCoordinator
+
+    def make(devices, api=None, options=None):
+        return CulliganUpdateCoordinator(hass, _make_config_entry(options), api or SimpleNamespace(), devices)
+
+    return make
+
+
+@pytest.fixture
+def setup_platform(hass):
+    """Return a function that sets up a platform for a coordinator's entry.
+
+    It returns the list of entities of every call the platform made to add them.
+    """
+
+    async def setup(platform, coordinator) -> list[list]:
+        config_entry = coordinator._config_entry
+        hass.data.setdefault("culligan", {})[config_entry.entry_id] = {"coordinator": coordinator}
+        batches = []
+        await platform.async_setup_entry(hass, config_entry, batches.append)
+        return batches
+
+    return setup
+
+
+class _CloudAPI:
+    """Stand-in for the cloud APIs, with current tokens and a settable Ayla device listing."""
+
+    token_expiring_soon = False
+    auth_expiration = datetime.max
+
+    def __init__(self) -> None:
+        self.ayla_listing = []
+        self.Ayla = self
+
+    async def async_list_devices(self) -> list:
+        return self.ayla_listing
+
+    async def async_get_device_registry(self) -> dict:
+        return {"data": {"devices": []}}
+
+
+@pytest.fixture
+def cloud_api():
+    """Return a stand-in cloud API whose Ayla listing the test sets."""
+    return _CloudAPI()
+
+
+@pytest.fixture
+def record_fetches():
+    """Return a function that answers a device's cloud reads, recording what each fetched."""
+
+    def record(device) -> list:
+        fetches = []
+
+        async def async_send_poll():
+            return True
+
+        async def async_update(property_list=None):
+            fetches.append(property_list)
+
+        device.async_send_poll = async_send_poll
+        device.async_update = async_update
+        return fetches
+
+    return record
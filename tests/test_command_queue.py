@@ -0,0 +1,104 @@
+"""Behaviour of the per-device command queue."""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.culligan import command_queue
+from custom_components.culligan.command_queue import DeviceCommandQueue, bypass_command, vacation_command
+
+
+@pytest.fixture(autouse=True)
+def short_coalesce_window(monkeypatch):
+    """Flush queued commands right away."""
+    monkeypatch.setattr(command_queue, "COMMAND_COALESCE_WINDOW", 0.01)
+
+
+class _AylaAPI:
+    """Stand-in Ayla API that records every request body and answers with a status."""
+
+    def __init__(self, status: int = 201) -> None:
+        self.status = status
+        self.requests = []
+
+    async def async_request(self, method, url, json=None):
+        self.requests.append(json)
+
+        @asynccontextmanager
+        async def response():
+            yield SimpleNamespace(status=self.status)
+
+        return response()
+
+
+async def test_queued_ayla_writes_go_out_in_one_request(hass, make_softener):
+    device = make_softener("A", [("set_vacation_mode", 0, "integer"), ("set_standard_bypass", 255, "integer")])
+    device.ayla_api = _AylaAPI()
+    queue = DeviceCommandQueue(hass, device)
+
+    results = await asyncio.gather(
+        queue.async_submit(*vacation_command(device, True)[:2]),
+        queue.async_submit(*bypass_command(device, True)[:2]),
+    )
+
+    assert results == [True, True]
+    (request,) = device.ayla_api.requests
+    assert [(point["name"], point["datapoint"]["value"]) for point in request["batch_datapoints"]] == [
+        ("set_vacation_mode", 1),
+        ("set_standard_bypass", 6),
+    ]
+
+
+async def test_failed_ayla_batch_fails_every_command_in_it(hass, make_softener):
+    device = make_softener("A", [("set_vacation_mode", 0, "integer"), ("set_standard_bypass", 255, "integer")])
+    device.ayla_api = _AylaAPI(status=500)
+    queue = DeviceCommandQueue(hass, device)
+
+    results = await asyncio.gather(
+        queue.async_submit(*vacation_command(device, True)[:2]),
+        queue.async_submit(*bypass_command(device, True)[:2]),
+        return_exceptions=True,
+    )
+
+    assert [type(result) for result in results] == [HomeAssistantError, HomeAssistantError]
+
+
+async def test_a_newer_command_replaces_an_unsent_one_for_the_same_slot(hass, make_iot_softener):
+    device = make_iot_softener("A")
+    sent = []
+
+    async def send(on):
+        sent.append(on)
+        return True
+
+    device.async_start_vacation_mode = lambda: send(True)
+    device.async_stop_vacation_mode = lambda: send(False)
+    queue = DeviceCommandQueue(hass, device)
+
+    results = await asyncio.gather(
+        queue.async_submit(*vacation_command(device, True)[:2]),
+        queue.async_submit(*vacation_command(device, False)[:2]),
+    )
+
+    assert results == [False, True]
+    assert sent == [False]
+
+
+async def test_commands_the_cloud_rejects_fail(hass, make_iot_softener):
+    device = make_iot_softener("A")
+
+    async def rejected():
+        return False
+
+    device.async_start_vacation_mode = rejected
+    queue = DeviceCommandQueue(hass, device)
+
+    with pytest.raises(HomeAssistantError):
+        await queue.async_submit(*vacation_command(device, True)[:2])
@@ -0,0 +1,69 @@
+"""Behaviour of the compact usage option and the usage series sensors."""
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.culligan import sensor as sensor_platform
+from custom_components.culligan.const import CONF_COMPACT_USAGE, HOURLY_USAGE_KEYS
+from custom_components.culligan.entity_descriptions import USAGE_HISTOGRAMS
+from custom_components.culligan.sensor import SoftenerSensor, UsageHistogramSensor, _new_softener_sensors
+from custom_components.culligan.snapshot import build_snapshot
+
+NOW = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+async def test_softener_sensors_follow_reported_keys_and_compact_usage(make_coordinator, make_iot_softener):
+    device = make_iot_softener()
+    coordinator = make_coordinator([device])
+    keys = {"days_salt_remaining", *HOURLY_USAGE_KEYS[:2]}
+    created = set()
+
+    sensors = _new_softener_sensors(coordinator, device, True, keys, created)
+
+    by_key = {sensor.entity_description.key: sensor for sensor in sensors}
+    assert set(by_key) == {*keys, "hourly_usage"}
+    assert isinstance(by_key["hourly_usage"], UsageHistogramSensor)
+    assert isinstance(by_key["days_salt_remaining"], SoftenerSensor)
+    assert by_key["days_salt_remaining"].entity_registry_enabled_default
+    assert not by_key[HOURLY_USAGE_KEYS[0]].entity_registry_enabled_default
+    assert _new_softener_sensors(coordinator, device, True, keys, created) == []
+
+    full = _new_softener_sensors(coordinator, device, False, keys, set())
+    assert all(sensor.entity_registry_enabled_default for sensor in full)
+    assert "hourly_usage" not in {sensor.entity_description.key for sensor in full}
+
+
+async def test_usage_histogram_totals_the_reported_slots(make_coordinator, make_iot_softener):
+    device = make_iot_softener(datapoints={"hourly_usage_hour_01": 3, "hourly_usage_hour_02": 4})
+    coordinator = make_coordinator([device])
+    coordinator.data = {device.device_serial_number: build_snapshot(device, NOW)}
+
+    histogram = UsageHistogramSensor(coordinator, device, USAGE_HISTOGRAMS[0])
+
+    assert histogram.native_value == 7
+    values = histogram.extra_state_attributes["values"]
+    assert len(values) == 24 and values[:3] == [3, 4, None]
+
+
+@pytest.mark.parametrize(("options", "compact"), [({}, False), ({CONF_COMPACT_USAGE: True}, True)])
+async def test_usage_slot_sensors_are_enabled_unless_compact_usage_is_turned_on(
+    hass, make_coordinator, make_softener, cloud_api, record_fetches, setup_platform, options, compact
+):
+    await er.async_load(hass)
+    device = make_softener("A", [(HOURLY_USAGE_KEYS[0], 3, "integer")])
+    record_fetches(device)
+    cloud_api.ayla_listing = [{"dsn": "A", "connection_status": "Online"}]
+    coordinator = make_coordinator([device], api=cloud_api, options=options)
+    await coordinator.async_refresh()
+
+    (sensors,) = await setup_platform(sensor_platform, coordinator)
+
+    by_key = {sensor.entity_description.key: sensor for sensor in sensors if hasattr(sensor, "entity_description")}
+    assert by_key[HOURLY_USAGE_KEYS[0]].entity_registry_enabled_default is not compact
+    assert ("hourly_usage" in by_key) is compact
@@ -0,0 +1,122 @@
+"""Behaviour of device connectivity and the probing of devices whose polls fail."""
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.connectivity import (
+    PROBE_BACKOFF_BASE,
+    PROBE_BACKOFF_MAX,
+    DeviceConnectivity,
+    listed_online,
+)
+
+ONLINE = {"dsn": "A", "connection_status": "Online"}
+OFFLINE = {"dsn": "A", "connection_status": "Offline"}
+
+
+def test_connectivity_backs_off_exponentially_up_to_the_maximum():
+    connectivity = DeviceConnectivity("A")
+    assert connectivity.should_poll(0)
+
+    assert connectivity.mark_offline(0)
+    assert not connectivity.should_poll(PROBE_BACKOFF_BASE - 1)
+    assert connectivity.should_poll(PROBE_BACKOFF_BASE)
+
+    assert not connectivity.mark_offline(100)
+    assert connectivity.next_probe == 100 + 2 * PROBE_BACKOFF_BASE
+
+    for _ in range(10):
+        connectivity.mark_offline(1000)
+    assert connectivity.next_probe == 1000 + PROBE_BACKOFF_MAX
+
+
+def test_connectivity_resets_the_backoff_when_back_online():
+    connectivity = DeviceConnectivity("A")
+    connectivity.mark_offline(0)
+    connectivity.mark_offline(0)
+
+    assert connectivity.mark_online()
+    assert not connectivity.mark_online()
+    assert connectivity.failures == 0
+
+    connectivity.mark_offline(0)
+    assert connectivity.next_probe == PROBE_BACKOFF_BASE
+
+
+def test_an_offline_listing_starts_the_backoff_over():
+    connectivity = DeviceConnectivity("A")
+    connectivity.mark_offline(0)
+    connectivity.mark_offline(0)
+
+    assert not connectivity.mark_listed_offline()
+    assert connectivity.should_poll(0)
+    assert connectivity.failures == 0
+
+    assert DeviceConnectivity("B").mark_listed_offline()
+
+
+def test_listed_online_reads_both_backends():
+    assert listed_online({"connection_status": "Online"})
+    assert not listed_online({"connection_status": "Offline"})
+    assert listed_online({"status": {"connection": {"online": True}}})
+    assert not listed_online({"status": {"connection": {"online": False}}})
+    assert listed_online({"dsn": "A"})
+
+
+async def test_devices_whose_poll_failed_are_only_probed_even_when_listed_online(
+    make_coordinator, make_softener, cloud_api, record_fetches
+):
+    device = make_softener("A", [("days_salt_remaining", 40, "integer")])
+    coordinator = make_coordinator([device], api=cloud_api)
+    fetches = record_fetches(device)
+    connectivity = coordinator.connectivity("A")
+    cloud_api.ayla_listing = [ONLINE]
+    await coordinator.async_refresh()
+    assert coordinator.device_is_online("A")
+
+    async def async_send_poll():
+        raise ConnectionError
+
+    device.async_send_poll = async_send_poll
+    await coordinator.async_refresh()
+    assert not connectivity.online
+    assert connectivity.failures == 1
+
+    # listed online, but the probe is not due yet
+    await coordinator.async_refresh()
+    assert connectivity.failures == 1
+
+    connectivity.next_probe = 0
+    await coordinator.async_refresh()
+    assert connectivity.failures == 2
+
+    record_fetches(device)
+    connectivity.next_probe = 0
+    await coordinator.async_refresh()
+    assert coordinator.device_is_online("A")
+    assert connectivity.failures == 0
+    assert len(fetches) == 1
+
+
+async def test_devices_listed_offline_are_not_polled_until_listed_online(
+    make_coordinator, make_softener, cloud_api, record_fetches
+):
+    device = make_softener("A", [("days_salt_remaining", 40, "integer")])
+    coordinator = make_coordinator([device], api=cloud_api)
+    fetches = record_fetches(device)
+    cloud_api.ayla_listing = [ONLINE]
+    await coordinator.async_refresh()
+
+    cloud_api.ayla_listing = [OFFLINE]
+    for _ in range(3):
+        await coordinator.async_refresh()
+        assert not coordinator.device_is_online("A")
+    assert len(fetches) == 1
+    assert len(coordinator.metrics.connectivity) == 1
+
+    cloud_api.ayla_listing = [ONLINE]
+    await coordinator.async_refresh()
+    assert coordinator.device_is_online("A")
+    assert len(fetches) == 2
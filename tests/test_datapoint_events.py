@@ -0,0 +1,57 @@
+"""Behaviour of the datapoint delta events and the websocket API."""
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.const import EVENT_DATAPOINTS_CHANGED
+from custom_components.culligan.websocket_api import ws_get_datapoints
+
+
+class _Connection:
+    """Stand-in websocket connection that records what it was sent."""
+
+    def __init__(self) -> None:
+        self.results = []
+        self.errors = []
+
+    def send_result(self, msg_id, result=None) -> None:
+        self.results.append((msg_id, result))
+
+    def send_error(self, msg_id, code, message) -> None:
+        self.errors.append((msg_id, code))
+
+
+async def test_delta_events_carry_only_changed_datapoints(hass, make_coordinator, make_softener):
+    device = make_softener("A", [("days_salt_remaining", 40, "integer"), ("total_gallons_today", 10, "integer")])
+    coordinator = make_coordinator([device])
+    events = []
+    hass.bus.async_listen(EVENT_DATAPOINTS_CHANGED, lambda event: events.append(event.data))
+
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 40})
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 39})
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 39})
+    await hass.async_block_till_done()
+
+    assert [event["datapoints"] for event in events] == [
+        {"days_salt_remaining": 40, "total_gallons_today": 10, "status": "Softening"},
+        {"days_salt_remaining": 39},
+    ]
+    assert {(event["entry_id"], event["dsn"]) for event in events} == {("entry", "A")}
+
+
+async def test_websocket_get_datapoints_returns_the_latest_snapshot(hass, make_coordinator, make_softener):
+    coordinator = make_coordinator([make_softener("A", [("days_salt_remaining", 40, "integer")])])
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 39})
+    hass.data["culligan"] = {"entry": {"coordinator": coordinator}}
+    connection = _Connection()
+
+    ws_get_datapoints(hass, connection, {"id": 1, "dsn": "A"})
+    ws_get_datapoints(hass, connection, {"id": 2, "dsn": "B"})
+    ws_get_datapoints(hass, connection, {"id": 3, "dsn": "A", "entry_id": "other"})
+
+    assert [(msg_id, result["datapoints"]) for msg_id, result in connection.results] == [
+        (1, {"days_salt_remaining": 39, "status": "Softening"})
+    ]
+    assert [msg_id for msg_id, _code in connection.errors] == [2, 3]
@@ -0,0 +1,58 @@
+"""Behaviour of the periodic discovery of devices added to and removed from the account."""
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.culligan import sensor as sensor_platform
+from custom_components.culligan.update_coordinator import RETIRE_AFTER_LISTINGS, ListenerContext
+
+
+async def test_devices_are_retired_after_consecutive_listings_without_them(
+    hass, make_coordinator, make_softener, make_iot_softener
+):
+    await dr.async_load(hass)
+    kept, removed, other_cloud = make_softener("A"), make_softener("B"), make_iot_softener("C")
+    coordinator = make_coordinator([kept, removed, other_cloud])
+    coordinator.async_add_listener(lambda: None, ListenerContext("B", frozenset({"status"})))
+    coordinator.async_add_listener(lambda: None, ListenerContext("B"))
+
+    for _ in range(RETIRE_AFTER_LISTINGS - 1):
+        await coordinator.async_sync_devices([kept])
+    # listed again, which starts the count over
+    await coordinator.async_sync_devices([kept, removed])
+    for _ in range(RETIRE_AFTER_LISTINGS - 1):
+        await coordinator.async_sync_devices([kept])
+    assert set(coordinator.culligan_devices) == {"A", "B", "C"}
+
+    await coordinator.async_sync_devices([kept])
+
+    # C's cloud listed none of its devices, which does not count as a listing
+    assert set(coordinator.culligan_devices) == {"A", "C"}
+    assert "B" not in coordinator._property_listeners
+    assert "B" not in coordinator._device_listeners
+    assert coordinator.needed_properties("B") is None
+
+
+async def test_a_device_that_comes_back_gets_its_sensors_again(
+    hass, make_coordinator, make_softener, setup_platform
+):
+    await dr.async_load(hass)
+    device, kept = make_softener("A", [("days_salt_remaining", 40, "integer")]), make_softener("B")
+    coordinator = make_coordinator([device, kept])
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 40})
+    batches = await setup_platform(sensor_platform, coordinator)
+    assert "A_days_salt_remaining" in {sensor.unique_id for sensor in batches[0]}
+
+    for _ in range(RETIRE_AFTER_LISTINGS):
+        await coordinator.async_sync_devices([kept])
+    assert "A" not in coordinator.culligan_devices
+    await coordinator.async_sync_devices([kept, device])
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 39})
+    await hass.async_block_till_done()
+
+    (_, added) = batches
+    assert {"A_data_age", "A_days_salt_remaining"} <= {sensor.unique_id for sensor in added}
@@ -0,0 +1,63 @@
+"""Behaviour of the config entry and device diagnostics."""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.culligan.diagnostics import (
+    async_get_config_entry_diagnostics,
+    async_get_device_diagnostics,
+)
+
+
+@pytest.fixture
+async def coordinator(hass, make_coordinator, make_softener, cloud_api, record_fetches):
+    """Return a loaded coordinator of two devices after a refresh in which A's poll failed."""
+    await er.async_load(hass)
+    healthy = make_softener("A", [("days_salt_remaining", 40, "integer")])
+    failing = make_softener("B", [("days_salt_remaining", 20, "integer")])
+    record_fetches(healthy)
+
+    async def async_send_poll():
+        raise ConnectionError("no answer")
+
+    failing.async_send_poll = async_send_poll
+    cloud_api.ayla_listing = [{"dsn": dsn, "connection_status": "Online"} for dsn in ("A", "B")]
+    coordinator = make_coordinator([healthy, failing], api=cloud_api)
+    config_entry = coordinator._config_entry
+    config_entry.data = {"user_input": {"update_interval": 30, CONF_USERNAME: "me", CONF_PASSWORD: "secret"}}
+    hass.data["culligan"] = {config_entry.entry_id: {"coordinator": coordinator}}
+    await coordinator.async_refresh()
+    return coordinator
+
+
+async def test_entry_diagnostics_carry_redacted_settings_metrics_and_every_device(hass, coordinator):
+    diagnostics = await async_get_config_entry_diagnostics(hass, coordinator._config_entry)
+
+    user_input = diagnostics["entry"]["data"]["user_input"]
+    assert (user_input[CONF_USERNAME], user_input[CONF_PASSWORD]) == (REDACTED, REDACTED)
+    assert diagnostics["coordinator"]["online_devices"] == ["A"]
+    assert diagnostics["metrics"]["requests"]["ayla/list_devices"]["count"] == 1
+    assert diagnostics["devices"]["A"]["snapshot"]["days_salt_remaining"] == 40
+    assert diagnostics["devices"]["A"]["freshness"]["confirmed"] is not None
+    assert diagnostics["devices"]["B"]["probe_failures"] == 1
+    json.dumps(diagnostics, default=str)
+
+
+async def test_device_diagnostics_only_carry_the_history_of_that_device(hass, coordinator):
+    config_entry = coordinator._config_entry
+
+    healthy = await async_get_device_diagnostics(hass, config_entry, SimpleNamespace(identifiers={("culligan", "A")}))
+    failing = await async_get_device_diagnostics(hass, config_entry, SimpleNamespace(identifiers={("culligan", "B")}))
+
+    assert healthy["A"]["errors"] == [] and healthy["A"]["connectivity_history"] == []
+    assert [error["dsn"] for error in failing["B"]["errors"]] == ["B"]
+    assert [change["online"] for change in failing["B"]["connectivity_history"]] == [False]
@@ -0,0 +1,39 @@
+"""Behaviour of the batched entity setup of every platform."""
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from homeassistant.util import slugify
+
+from custom_components.culligan import binary_sensor, button, number, sensor, switch
+
+PROPERTIES = [
+    ("set_vacation_mode", 0, "integer"),
+    ("set_standard_bypass", 255, "integer"),
+    ("days_salt_remaining", 40, "integer"),
+    ("total_gallons_today", 10, "integer"),
+]
+
+
+@pytest.mark.parametrize("platform", [binary_sensor, button, number, sensor, switch])
+async def test_each_platform_adds_the_whole_fleet_in_one_batch(
+    hass, make_coordinator, make_softener, make_iot_softener, cloud_api, record_fetches, setup_platform, platform
+):
+    fleet = [make_softener(f"A{index}", PROPERTIES) for index in range(2)]
+    for device in fleet:
+        record_fetches(device)
+    cloud_api.ayla_listing = [{"dsn": device.device_serial_number, "connection_status": "Online"} for device in fleet]
+    fleet += [make_iot_softener(f"C{index}", {"days_salt_remaining": 12, "vacation_mode": 0}) for index in range(2)]
+    coordinator = make_coordinator(fleet, api=cloud_api)
+    await coordinator.async_refresh()
+
+    batches = await setup_platform(platform, coordinator)
+
+    (entities,) = batches
+    assert len({entity._dsn for entity in entities}) > 1
+    domain = platform.__name__.rsplit(".", 1)[-1]
+    for entity in entities:
+        # derived from the unique ID rather than looked up against existing states
+        assert entity.entity_id == f"{domain}.{slugify(entity.unique_id)}"
@@ -0,0 +1,75 @@
+"""Behaviour of the entity state cached on coordinator updates."""
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.binary_sensor import SoftenerBinarySensor
+from custom_components.culligan.const import HOURLY_USAGE_KEYS
+from custom_components.culligan.entity_descriptions import SOFTENER_BINARY_SENSORS, SOFTENER_SENSORS, USAGE_HISTOGRAMS
+from custom_components.culligan.sensor import SoftenerSensor, UsageHistogramSensor
+
+
+def _recording(hass, entity, state):
+    """Make an entity record its state writes instead of making them."""
+    entity.hass = hass
+    entity.writes = []
+    entity.async_write_ha_state = lambda: entity.writes.append(state(entity))
+    return entity
+
+
+def _softener_sensor(hass, coordinator, key: str) -> SoftenerSensor:
+    """Create a softener sensor that records its state writes instead of making them."""
+    description = next(description for description in SOFTENER_SENSORS if description.key == key)
+    sensor = SoftenerSensor(coordinator, coordinator.culligan_devices["A"], description)
+    return _recording(hass, sensor, lambda sensor: (sensor.native_value, sensor.icon))
+
+
+async def test_softener_sensor_state_and_icon_follow_coordinator_updates(hass, make_coordinator, make_softener):
+    coordinator = make_coordinator([make_softener("A", [("set_vacation_mode", 0, "integer")])])
+    coordinator.async_push_datapoints("A", {"vacation_mode": 0})
+    sensor = _softener_sensor(hass, coordinator, "status")
+    assert (sensor.native_value, sensor.icon) == ("Softening", "mdi:water")
+
+    coordinator.async_push_datapoints("A", {"vacation_mode": 1})
+    # the snapshot alone does not change the state, the coordinator update does
+    assert sensor.native_value == "Softening"
+    sensor._handle_coordinator_update()
+
+    assert sensor.writes == [("Vacation", "mdi:airplane")]
+
+
+async def test_usage_histogram_state_follows_coordinator_updates(hass, make_coordinator, make_iot_softener):
+    coordinator = make_coordinator([make_iot_softener("A")])
+    coordinator.async_push_datapoints("A", {HOURLY_USAGE_KEYS[0]: 3, HOURLY_USAGE_KEYS[1]: 4})
+    histogram = _recording(
+        hass,
+        UsageHistogramSensor(coordinator, coordinator.culligan_devices["A"], USAGE_HISTOGRAMS[0]),
+        lambda sensor: (sensor.native_value, sensor.extra_state_attributes["values"][:3]),
+    )
+    assert histogram.native_value == 7
+
+    coordinator.async_push_datapoints("A", {HOURLY_USAGE_KEYS[2]: 5})
+    assert histogram.native_value == 7
+    histogram._handle_coordinator_update()
+
+    assert histogram.writes == [(12, [3, 4, 5])]
+
+
+async def test_binary_sensor_state_follows_coordinator_updates(hass, make_coordinator, make_iot_softener):
+    coordinator = make_coordinator([make_iot_softener("A")])
+    coordinator.async_push_datapoints("A", {"vacation_mode": 0})
+    description = next(description for description in SOFTENER_BINARY_SENSORS if description.key == "vacation_mode")
+    binary_sensor = _recording(
+        hass,
+        SoftenerBinarySensor(coordinator, None, coordinator.culligan_devices["A"], description),
+        lambda sensor: sensor.is_on,
+    )
+    assert not binary_sensor.is_on
+
+    coordinator.async_push_datapoints("A", {"vacation_mode": 1})
+    assert not binary_sensor.is_on
+    binary_sensor._handle_coordinator_update()
+
+    assert binary_sensor.writes == [True]
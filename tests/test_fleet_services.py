@@ -0,0 +1,126 @@
+"""Behaviour of the fleet command services."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from homeassistant.helpers import area_registry as ar, device_registry as dr, entity_registry as er
+
+from custom_components.culligan import command_queue
+from custom_components.culligan.services import (
+    MAX_CONCURRENT_COMMANDS,
+    SERVICE_SET_VACATION_MODE,
+    SERVICE_START_BYPASS,
+    async_setup_services,
+)
+
+
+@pytest.fixture
+async def fleet(hass, make_coordinator, make_iot_softener, monkeypatch):
+    """Return a factory for a loaded account of CulliganIoT softeners, with the services set up.
+
+    It returns the device registry ids of the devices by serial number.
+    """
+    monkeypatch.setattr(command_queue, "COMMAND_COALESCE_WINDOW", 0.01)
+    await ar.async_load(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    async_setup_services(hass)
+
+    def make(devices) -> dict[str, str]:
+        coordinator = make_coordinator(devices)
+        config_entry = coordinator._config_entry
+        hass.config_entries = SimpleNamespace(async_get_entry=lambda entry_id: config_entry)
+        hass.data["culligan"] = {config_entry.entry_id: {"coordinator": coordinator}}
+        device_registry = dr.async_get(hass)
+        return {
+            device.device_serial_number: device_registry.async_get_or_create(
+                config_entry_id=config_entry.entry_id, identifiers={("culligan", device.device_serial_number)}
+            ).id
+            for device in devices
+        }
+
+    return make
+
+
+async def _call(hass, service, device_ids, **data) -> dict:
+    response = await hass.services.async_call(
+        "culligan", service, {"device_id": list(device_ids), **data}, blocking=True, return_response=True
+    )
+    return {result.pop("dsn"): result for result in response["results"]}
+
+
+async def test_each_device_reports_whether_its_command_was_sent(hass, make_iot_softener, fleet):
+    devices = [make_iot_softener(serial) for serial in ("OK", "REJECTED", "BROKEN")]
+
+    async def accepted():
+        return True
+
+    async def rejected():
+        return False
+
+    async def broken():
+        raise ConnectionError("cloud unreachable")
+
+    for device, send in zip(devices, (accepted, rejected, broken)):
+        device.async_start_bypass_mode = send
+    device_ids = fleet(devices)
+
+    results = await _call(hass, SERVICE_START_BYPASS, device_ids.values())
+
+    assert {dsn: (result["success"], result["superseded"]) for dsn, result in results.items()} == {
+        "OK": (True, False),
+        "REJECTED": (False, False),
+        "BROKEN": (False, False),
+    }
+    assert results["OK"]["error"] is None
+    assert results["REJECTED"]["error"] is not None
+    assert results["BROKEN"]["error"] == "cloud unreachable"
+
+
+async def test_commands_replaced_before_they_were_sent_are_reported_superseded(hass, make_iot_softener, fleet):
+    device = make_iot_softener("A")
+    sent = []
+
+    async def send(on):
+        sent.append(on)
+        return True
+
+    device.async_start_vacation_mode = lambda: send(True)
+    device.async_stop_vacation_mode = lambda: send(False)
+    device_ids = fleet([device])
+
+    first, second = await asyncio.gather(
+        _call(hass, SERVICE_SET_VACATION_MODE, device_ids.values(), enabled=True),
+        _call(hass, SERVICE_SET_VACATION_MODE, device_ids.values(), enabled=False),
+    )
+
+    assert (first["A"]["success"], first["A"]["superseded"], first["A"]["error"]) == (False, True, None)
+    assert (second["A"]["success"], second["A"]["superseded"]) == (True, False)
+    assert sent == [False]
+
+
+async def test_only_a_few_devices_are_commanded_at_a_time(hass, make_iot_softener, fleet):
+    devices = [make_iot_softener(f"S{index}") for index in range(MAX_CONCURRENT_COMMANDS * 2 + 1)]
+    in_flight, most_in_flight = 0, 0
+
+    async def send():
+        nonlocal in_flight, most_in_flight
+        in_flight += 1
+        most_in_flight = max(most_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return True
+
+    for device in devices:
+        device.async_start_bypass_mode = send
+    device_ids = fleet(devices)
+
+    results = await _call(hass, SERVICE_START_BYPASS, device_ids.values())
+
+    assert all(result["success"] for result in results.values())
+    assert most_in_flight == MAX_CONCURRENT_COMMANDS
@@ -0,0 +1,76 @@
+"""Behaviour of the data age sensor and of entity availability while data is fresh."""
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.entity import CulliganBaseEntity
+from custom_components.culligan.sensor import DataAgeSensor
+
+ONLINE = {"dsn": "A", "connection_status": "Online"}
+OFFLINE = {"dsn": "A", "connection_status": "Offline"}
+
+
+async def test_data_age_sensor_holds_the_last_confirmation(hass, make_coordinator, make_softener):
+    coordinator = make_coordinator([make_softener("A", [("days_salt_remaining", 40, "integer")])])
+    sensor = DataAgeSensor(coordinator, coordinator.culligan_devices["A"])
+    sensor.hass = hass
+    writes = []
+    sensor.async_write_ha_state = lambda: writes.append((sensor.native_value, sensor.extra_state_attributes))
+    coordinator.async_add_listener(sensor._handle_coordinator_update, sensor.coordinator_context)
+    assert not sensor.available
+    assert sensor.name == "Data age"
+
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 39})
+    freshness = coordinator.freshness("A")
+    assert sensor.available
+    state, attributes = writes[-1]
+    assert state == freshness.confirmed
+    assert attributes["stale"] is False
+    assert attributes["last_confirmed"]["days_salt_remaining"] == freshness.confirmed.isoformat()
+    assert attributes["last_changed"]["days_salt_remaining"] == freshness.changed.isoformat()
+
+    # a confirmation without a change still moves the state
+    freshness.confirmed -= timedelta(seconds=5)
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 39})
+    assert writes[-1][0] == freshness.confirmed
+    assert freshness.changed < freshness.confirmed
+    assert len(writes) == 2
+
+    # nothing new, nothing written
+    sensor._handle_coordinator_update()
+    assert len(writes) == 2
+
+    freshness.confirmed -= coordinator.stale_after + timedelta(seconds=1)
+    sensor._handle_coordinator_update()
+    assert writes[-1][1]["stale"] is True
+    assert len(writes) == 3
+
+
+async def test_entities_stay_available_through_failed_polls_but_not_offline_listings(
+    make_coordinator, make_softener, cloud_api, record_fetches
+):
+    device = make_softener("A", [("days_salt_remaining", 40, "integer")])
+    coordinator = make_coordinator([device], api=cloud_api)
+    record_fetches(device)
+    entity = CulliganBaseEntity(coordinator, device)
+    cloud_api.ayla_listing = [ONLINE]
+    await coordinator.async_refresh()
+    assert entity.available
+
+    async def async_send_poll():
+        raise ConnectionError
+
+    device.async_send_poll = async_send_poll
+    await coordinator.async_refresh()
+    assert not coordinator.connectivity("A").online
+    assert coordinator.device_is_fresh("A")
+    assert entity.available
+
+    cloud_api.ayla_listing = [OFFLINE]
+    await coordinator.async_refresh()
+    assert coordinator.device_is_fresh("A")
+    assert not entity.available
@@ -0,0 +1,60 @@
+"""Behaviour of the coordinator's property -> listener index."""
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.update_coordinator import ListenerContext
+
+
+async def test_listeners_only_wake_for_properties_that_changed(make_coordinator, make_softener):
+    device = make_softener(
+        "A", [("days_salt_remaining", 40, "integer"), ("total_gallons_today", 10, "integer")]
+    )
+    coordinator = make_coordinator([device])
+    calls = []
+    contexts = {
+        "salt": ListenerContext("A", frozenset({"days_salt_remaining"})),
+        "usage": ListenerContext("A", frozenset({"total_gallons_today"})),
+        "device": ListenerContext("A"),
+        "nothing": ListenerContext("A", frozenset()),
+        "other_device": ListenerContext("B"),
+        "unindexed": None,
+    }
+    for name, context in contexts.items():
+        coordinator.async_add_listener(lambda name=name: calls.append(name), context)
+
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 40})
+    assert sorted(calls) == ["device", "nothing", "salt", "unindexed", "usage"]
+
+    calls.clear()
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 39})
+    assert sorted(calls) == ["device", "salt", "unindexed"]
+
+    calls.clear()
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 39})
+    assert calls == ["unindexed"]
+
+
+async def test_listeners_bound_to_no_property_wake_when_the_device_goes_offline(
+    make_coordinator, make_softener, cloud_api, record_fetches
+):
+    device = make_softener("A", [("days_salt_remaining", 40, "integer")])
+    coordinator = make_coordinator([device], api=cloud_api)
+    record_fetches(device)
+    calls = []
+    coordinator.async_add_listener(lambda: calls.append("nothing"), ListenerContext("A", frozenset()))
+    coordinator.async_add_listener(
+        lambda: calls.append("salt"), ListenerContext("A", frozenset({"days_salt_remaining"}))
+    )
+    cloud_api.ayla_listing = [{"dsn": "A", "connection_status": "Online"}]
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    calls.clear()
+    cloud_api.ayla_listing = [{"dsn": "A", "connection_status": "Offline"}]
+    await coordinator.async_refresh()
+
+    assert sorted(calls) == ["nothing", "salt"]
+    assert not coordinator.device_is_online("A")
@@ -0,0 +1,75 @@
+"""Behaviour of the coordinator counters and their OpenMetrics export."""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.metrics import TIMING_BUCKETS, CoordinatorMetrics, TimingHistogram
+from custom_components.culligan.openmetrics import render_openmetrics
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = TimingHistogram()
+    for seconds in (0.005, 0.2, 0.2, 60):
+        histogram.observe(seconds)
+
+    summary = histogram.as_dict()
+
+    assert summary["count"] == 4
+    assert summary["buckets"]["0.01"] == 1
+    assert summary["buckets"]["0.25"] == 3
+    assert summary["buckets"][str(TIMING_BUCKETS[-1])] == 3
+    assert summary["buckets"]["+Inf"] == 4
+
+
+def test_requests_in_flight_can_be_reported():
+    metrics = CoordinatorMetrics()
+
+    with metrics.track_request("ayla", "list_devices"):
+        in_flight = metrics.as_dict()["requests"]["ayla/list_devices"]
+
+    assert in_flight["count"] == 1
+    assert in_flight["timing"]["count"] == 0
+    assert metrics.as_dict()["requests"]["ayla/list_devices"]["timing"]["count"] == 1
+
+
+def test_failed_requests_are_counted_and_timed():
+    metrics = CoordinatorMetrics()
+
+    with pytest.raises(RuntimeError), metrics.track_request("culligan", "command"):
+        raise RuntimeError
+
+    assert metrics.requests["culligan", "command"] == 1
+    assert metrics.request_errors["culligan", "command"] == 1
+    assert metrics.request_timings["culligan", "command"].count == 1
+
+
+def _coordinator(metrics: CoordinatorMetrics) -> SimpleNamespace:
+    """Stand-in coordinator without devices."""
+    return SimpleNamespace(metrics=metrics, culligan_devices={})
+
+
+def test_openmetrics_lists_a_histogram_for_every_counted_request():
+    metrics = CoordinatorMetrics()
+    metrics.observe("refresh", 0.3)
+    with metrics.track_request("ayla", "refresh_auth"):
+        text = render_openmetrics({"entry": _coordinator(metrics)})
+
+    lines = text.splitlines()
+    assert lines[-1] == "# EOF"
+    assert 'culligan_requests_total{entry="entry",backend="ayla",endpoint="refresh_auth"} 1' in lines
+    assert 'culligan_request_seconds_count{entry="entry",backend="ayla",endpoint="refresh_auth"} 0' in lines
+    assert 'culligan_token_refreshes_total{entry="entry",backend="ayla"} 1' in lines
+    assert 'culligan_refresh_phase_seconds_count{entry="entry",phase="refresh"} 1' in lines
+
+
+def test_openmetrics_escapes_label_values():
+    metrics = CoordinatorMetrics()
+    metrics.observe("refresh", 0.3)
+
+    text = render_openmetrics({'a"b\\c': _coordinator(metrics)})
+
+    assert 'culligan_refresh_phase_seconds_count{entry="a\\"b\\\\c",phase="refresh"} 1' in text.splitlines()
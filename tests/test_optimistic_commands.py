@@ -0,0 +1,80 @@
+"""Behaviour of the optimistic command state and its confirmation refreshes."""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan import update_coordinator
+from custom_components.culligan.command_queue import SLOT_BYPASS, SLOT_VACATION, bypass_command, vacation_command
+from custom_components.culligan.snapshot import STATUS_BYPASS, STATUS_SOFTENING, DeviceSnapshot
+
+NOW = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _snapshot(**values) -> DeviceSnapshot:
+    return DeviceSnapshot(dsn="A", values=values, updated_at=NOW)
+
+
+def test_command_builders_carry_optimistic_state(make_softener):
+    device = make_softener()
+
+    vacation = vacation_command(device, True)
+    assert vacation.slot == SLOT_VACATION
+    assert vacation.command.datapoint == ("vacation_mode", 1)
+    assert vacation.confirmed(_snapshot(vacation_mode=1))
+    assert not vacation.confirmed(_snapshot(vacation_mode=0))
+
+    clear = bypass_command(device, False)
+    assert clear.slot == SLOT_BYPASS
+    assert clear.overrides == {"standard_bypass": 255, "time_rem_in_position": 0}
+    assert clear.confirmed(_snapshot(status=STATUS_SOFTENING))
+    assert not clear.confirmed(_snapshot(status=STATUS_BYPASS))
+
+
+async def _send_vacation_command(coordinator, device) -> None:
+    """Run a vacation command whose send succeeds but is never confirmed."""
+
+    async def async_submit(slot, command):
+        return True
+
+    coordinator._command_queues[device.device_serial_number].async_submit = async_submit
+    await coordinator.async_run_command(device.device_serial_number, *vacation_command(device, True))
+
+
+async def test_failed_confirmation_refreshes_keep_going_until_the_deadline(
+    monkeypatch, make_coordinator, make_softener
+):
+    monkeypatch.setattr(update_coordinator, "CONFIRM_INTERVAL", 0)
+    monkeypatch.setattr(update_coordinator, "CONFIRM_TIMEOUT", 0.05)
+    device = make_softener("A", [("set_vacation_mode", 0, "integer")])
+    coordinator = make_coordinator([device])
+    attempts = []
+
+    async def async_update_device(dsn, property_list=None):
+        # what an API_TIMEOUT expiring around a hung request raises
+        attempts.append(dsn)
+        raise asyncio.TimeoutError
+
+    coordinator._async_update_device = async_update_device
+    await _send_vacation_command(coordinator, device)
+    assert coordinator.get_snapshot("A").get("vacation_mode") == 1
+
+    await asyncio.wait_for(coordinator._async_confirm_commands("A"), 1)
+
+    assert len(attempts) > 1
+    assert coordinator.get_snapshot("A").get("vacation_mode") == 0
+
+
+async def test_snapshots_drop_overrides_past_their_deadline(monkeypatch, make_coordinator, make_softener):
+    monkeypatch.setattr(update_coordinator, "CONFIRM_TIMEOUT", 0)
+    device = make_softener("A", [("set_vacation_mode", 0, "integer"), ("days_salt_remaining", 40, "integer")])
+    coordinator = make_coordinator([device])
+
+    await _send_vacation_command(coordinator, device)
+    coordinator.async_push_datapoints("A", {"days_salt_remaining": 39})
+
+    assert coordinator.get_snapshot("A").get("vacation_mode") == 0
@@ -0,0 +1,21 @@
+"""Behaviour of options applied without reloading the integration."""
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.update_coordinator import PUSH_RECONCILE_INTERVAL
+
+
+async def test_live_options_change_the_update_interval(make_coordinator, make_softener):
+    coordinator = make_coordinator([make_softener()])
+    assert coordinator.update_interval == timedelta(seconds=30)
+
+    coordinator.async_apply_options({"update_interval": 60})
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+    coordinator.async_apply_options({"update_interval": 60, "push_updates": True})
+    assert coordinator.update_interval == PUSH_RECONCILE_INTERVAL
@@ -0,0 +1,29 @@
+"""Behaviour of the on-demand refresh profiler."""
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.profiler import async_profile_cycles
+
+
+class _CountingCoordinator:
+    """Stand-in coordinator that counts its refreshes."""
+
+    def __init__(self) -> None:
+        self.refreshes = 0
+
+    async def async_refresh(self) -> None:
+        self.refreshes += 1
+
+
+async def test_profile_runs_the_requested_cycles_and_writes_reports(hass, tmp_path):
+    coordinators = [_CountingCoordinator(), _CountingCoordinator()]
+
+    result = await async_profile_cycles(hass, coordinators, 2)
+
+    assert [coordinator.refreshes for coordinator in coordinators] == [2, 2]
+    assert result["cycles"] == 2
+    assert (tmp_path / result["stats_file"]).exists()
+    assert (tmp_path / result["allocations_file"]).exists()
@@ -0,0 +1,68 @@
+"""Behaviour of the property fetches filtered to what enabled entities need."""
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.update_coordinator import ListenerContext
+
+
+async def test_needed_properties_follow_bound_listeners(make_coordinator, make_iot_softener):
+    coordinator = make_coordinator([make_iot_softener("A")])
+    assert coordinator.needed_properties("A") is None
+
+    remove_status = coordinator.async_add_listener(lambda: None, ListenerContext("A", frozenset({"status"})))
+    coordinator.async_add_listener(lambda: None, ListenerContext("A", frozenset({"days_salt_remaining"})))
+    needed = coordinator.needed_properties("A")
+    assert {"status", "vacation_mode", "standard_bypass", "time_rem_in_position", "days_salt_remaining"} <= needed
+
+    remove_status()
+    assert "vacation_mode" not in coordinator.needed_properties("A")
+
+    remove_device = coordinator.async_add_listener(lambda: None, ListenerContext("A"))
+    assert coordinator.needed_properties("A") is None
+    remove_device()
+    assert coordinator.needed_properties("A") is not None
+
+
+async def test_filtered_fetches_request_real_ayla_property_names(make_coordinator, make_softener, record_fetches):
+    device = make_softener(
+        "A",
+        [
+            ("set_vacation_mode", 0, "integer"),
+            ("set_standard_bypass", 255, "integer"),
+            ("time_rem_in_position", 0, "integer"),
+            ("days_salt_remaining", 40, "integer"),
+        ],
+    )
+    # reports vacation mode under its alternate name
+    other = make_softener("B", [("set_away_mode", 0, "integer"), ("days_salt_remaining", 40, "integer")])
+    coordinator = make_coordinator([device, other])
+    coordinator.async_add_listener(lambda: None, ListenerContext("A", frozenset({"status"})))
+    coordinator.async_add_listener(lambda: None, ListenerContext("B", frozenset({"vacation_mode"})))
+    fetches = {"A": record_fetches(device), "B": record_fetches(other)}
+
+    for _ in range(2):
+        for dsn in fetches:
+            await coordinator._async_update_device(dsn, coordinator._properties_to_fetch(dsn))
+
+    # the first fetch of each device is a full one
+    assert fetches == {
+        "A": [None, ["set_standard_bypass", "set_vacation_mode", "time_rem_in_position"]],
+        "B": [None, ["set_away_mode"]],
+    }
+
+
+async def test_fetches_everything_when_no_needed_property_was_reported(
+    make_coordinator, make_softener, record_fetches
+):
+    device = make_softener("A", [("days_salt_remaining", 40, "integer")])
+    coordinator = make_coordinator([device])
+    coordinator.async_add_listener(lambda: None, ListenerContext("A", frozenset({"total_gallons_today"})))
+    fetches = record_fetches(device)
+
+    for _ in range(2):
+        await coordinator._async_update_device("A", coordinator._properties_to_fetch("A"))
+
+    assert fetches == [None, None]
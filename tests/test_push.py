@@ -0,0 +1,102 @@
+"""Behaviour of pushed datapoint updates and the push options."""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from homeassistant.const import CONF_WEBHOOK_ID
+
+from custom_components.culligan.config_flow import CulliganOptionsFlowHandler
+from custom_components.culligan.const import CONF_PUSH_UPDATES, EVENT_DATAPOINTS_CHANGED
+from custom_components.culligan.push import PushTransport
+
+
+class _StandInPusher(PushTransport):
+    """Transport fed payloads directly by the test."""
+
+    def async_start(self) -> None:
+        """Nothing to start."""
+
+    def async_stop(self) -> None:
+        """Nothing to stop."""
+
+
+def test_transports_must_implement_start_and_stop():
+    with pytest.raises(TypeError):
+        PushTransport(None, None)
+
+
+async def test_pushed_payloads_update_known_devices(hass, make_coordinator, make_softener, make_iot_ro):
+    coordinator = make_coordinator(
+        [make_softener("A", [("days_salt_remaining", 40, "integer")]), make_iot_ro("RO", {"tds": 5})]
+    )
+    pusher = _StandInPusher(hass, coordinator)
+
+    assert pusher.async_ingest({"dsn": "A", "datapoints": {"days_salt_remaining": 39}}) == 1
+    assert pusher.async_ingest(
+        [{"dsn": "RO", "datapoints": {"tds": 6}}, {"dsn": "unknown", "datapoints": {"tds": 1}}]
+    ) == 1
+    assert pusher.async_ingest({"dsn": "A"}) is None
+    assert pusher.async_ingest([{"dsn": "A", "datapoints": {}}, "junk"]) is None
+
+    assert coordinator.get_snapshot("A").get("days_salt_remaining") == 39
+    assert coordinator.get_snapshot("RO").get("tds") == 6
+
+
+@pytest.mark.parametrize("ayla", [True, False])
+async def test_pushed_values_are_decoded_like_event_values(
+    hass, make_coordinator, make_softener, make_iot_softener, ayla
+):
+    # the cloud reports flow rate in tenths of a gallon per minute
+    if ayla:
+        device = make_softener("A", [("current_flow_rate", 25, "integer")])
+    else:
+        device = make_iot_softener("A", {"current_flow_rate": 25})
+    coordinator = make_coordinator([device])
+    pusher = _StandInPusher(hass, coordinator)
+    events = []
+    hass.bus.async_listen(EVENT_DATAPOINTS_CHANGED, lambda event: events.append(event.data))
+
+    pusher.async_ingest({"dsn": "A", "datapoints": {"current_flow_rate": 3.5}})
+    await hass.async_block_till_done()
+    assert coordinator.get_snapshot("A").get("current_flow_rate") == 3.5
+
+    # an event payload pushed back as is changes nothing, the derived status included
+    events.clear()
+    pusher.async_ingest({"dsn": "A", "datapoints": dict(coordinator.get_snapshot("A").values)})
+    await hass.async_block_till_done()
+    assert events == []
+    assert coordinator.get_snapshot("A").get("current_flow_rate") == 3.5
+
+
+async def _submit_options(hass, options, user_input):
+    """Run the options step of an entry with the given options, returning the new ones."""
+    entry = SimpleNamespace(
+        entry_id="entry", options=options, data={"user_input": {"update_interval": 30}}
+    )
+    updates = []
+    hass.config_entries = SimpleNamespace(
+        async_get_entry=lambda entry_id: entry,
+        async_update_entry=lambda entry, options: updates.append(options),
+    )
+    flow = CulliganOptionsFlowHandler(entry)
+    flow.hass = hass
+    flow.handler = "entry"
+    await flow.async_step_init(dict(user_input))
+    return updates[-1]
+
+
+async def test_turning_push_off_keeps_the_webhook_id(hass):
+    options = await _submit_options(
+        hass, {CONF_PUSH_UPDATES: True, CONF_WEBHOOK_ID: "hook"}, {CONF_PUSH_UPDATES: False}
+    )
+    assert options == {CONF_PUSH_UPDATES: False, CONF_WEBHOOK_ID: "hook"}
+
+    options = await _submit_options(hass, options, {CONF_PUSH_UPDATES: True})
+    assert options[CONF_WEBHOOK_ID] == "hook"
+
+    options = await _submit_options(hass, {}, {CONF_PUSH_UPDATES: False})
+    assert CONF_WEBHOOK_ID not in options
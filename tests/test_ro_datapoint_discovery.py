@@ -0,0 +1,24 @@
+"""Behaviour of sensors added for Smart RO datapoints reported after setup."""
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan import sensor as sensor_platform
+
+
+async def test_datapoints_reported_after_setup_get_sensors_without_a_reload(
+    hass, make_coordinator, make_iot_ro, setup_platform
+):
+    coordinator = make_coordinator([make_iot_ro("RO")])
+    coordinator.async_push_datapoints("RO", {"tds_out": 12})
+    batches = await setup_platform(sensor_platform, coordinator)
+    assert "tds out" in {sensor.name for sensor in batches[0]}
+
+    coordinator.async_push_datapoints("RO", {"tds_out": 11, "tds_in": 140})
+    coordinator.async_push_datapoints("RO", {"tds_in": 141})
+    await hass.async_block_till_done()
+
+    (added,) = batches[1:]
+    assert [sensor.name for sensor in added] == ["tds in"]
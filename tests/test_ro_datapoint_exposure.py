@@ -0,0 +1,51 @@
+"""Behaviour of the Smart RO datapoint exposure options and the aggregate datapoints sensor."""
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.const import CONF_RO_DATAPOINT_ALLOWLIST, CONF_RO_DATAPOINT_DENYLIST
+from custom_components.culligan.sensor import (
+    RO_SNAPSHOT_ENTITY,
+    CulliganIoTROSensor,
+    SmartROSnapshotSensor,
+    _datapoint_filter,
+    _new_ro_sensors,
+)
+from custom_components.culligan.snapshot import build_snapshot
+
+NOW = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_datapoint_filter_applies_allow_then_deny_patterns():
+    exposed = _datapoint_filter(
+        {CONF_RO_DATAPOINT_ALLOWLIST: "tds_*, flow_rate", CONF_RO_DATAPOINT_DENYLIST: "tds_raw*"}
+    )
+
+    assert exposed("tds_out")
+    assert exposed("flow_rate")
+    assert not exposed("tds_raw_in")
+    assert not exposed("filter_life")
+
+    assert _datapoint_filter({})("anything")
+    assert not _datapoint_filter({CONF_RO_DATAPOINT_DENYLIST: "debug_*"})("debug_counter")
+
+
+async def test_ro_sensors_are_added_once_per_exposed_datapoint(make_coordinator, make_iot_ro):
+    device = make_iot_ro(datapoints={"tds_out": 12, "debug_counter": 3})
+    coordinator = make_coordinator([device])
+    coordinator.data = {device.device_serial_number: build_snapshot(device, NOW)}
+    exposed = _datapoint_filter({CONF_RO_DATAPOINT_DENYLIST: "debug_*"})
+    created = set()
+
+    sensors = _new_ro_sensors(coordinator, device, ["tds_out", "debug_counter"], created, exposed)
+
+    assert [type(sensor) for sensor in sensors] == [SmartROSnapshotSensor, CulliganIoTROSensor]
+    assert sensors[1].native_value == 12
+    assert sensors[0].native_value == 2
+    assert sensors[0].extra_state_attributes == {"datapoints": {"debug_counter": 3}}
+    assert created == {RO_SNAPSHOT_ENTITY, "tds_out", "debug_counter"}
+    assert _new_ro_sensors(coordinator, device, ["tds_out", "debug_counter"], created, exposed) == []
@@ -0,0 +1,46 @@
+"""Behaviour of sensor creation for the datapoints a device reports."""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.culligan import async_remove_config_entry_device
+from custom_components.culligan import sensor as sensor_platform
+
+
+async def test_setup_only_creates_reported_sensors_and_keeps_other_registry_entries(
+    hass, make_coordinator, make_softener, cloud_api, record_fetches, setup_platform
+):
+    await er.async_load(hass)
+    entity_registry = er.async_get(hass)
+    device = make_softener("A", [("days_salt_remaining", 40, "integer")])
+    record_fetches(device)
+    cloud_api.ayla_listing = [{"dsn": "A", "connection_status": "Online"}]
+    coordinator = make_coordinator([device], api=cloud_api)
+    await coordinator.async_refresh()
+    # what an earlier version created for a datapoint the device does not report
+    unreported = entity_registry.async_get_or_create(
+        "sensor", "culligan", "A_total_gallons_today", config_entry=coordinator._config_entry
+    )
+
+    (sensors,) = await setup_platform(sensor_platform, coordinator)
+
+    assert "A_days_salt_remaining" in {sensor.unique_id for sensor in sensors}
+    assert "A_total_gallons_today" not in {sensor.unique_id for sensor in sensors}
+    assert entity_registry.async_get(unreported.entity_id) is not None
+
+
+async def test_only_devices_the_account_no_longer_has_can_be_removed(hass, make_coordinator, make_softener):
+    coordinator = make_coordinator([make_softener("A")])
+    config_entry = coordinator._config_entry
+    hass.data["culligan"] = {config_entry.entry_id: {"coordinator": coordinator}}
+
+    assert not await async_remove_config_entry_device(
+        hass, config_entry, SimpleNamespace(identifiers={("culligan", "A")})
+    )
+    assert await async_remove_config_entry_device(hass, config_entry, SimpleNamespace(identifiers={("culligan", "B")}))
@@ -0,0 +1,86 @@
+"""Behaviour of the immutable per-device snapshots."""
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.snapshot import (
+    STATUS_BYPASS,
+    STATUS_SOFTENING,
+    STATUS_VACATION,
+    DeviceSnapshot,
+    build_snapshot,
+    decode_status,
+    diff_snapshots,
+    switch_is_on,
+    with_overrides,
+)
+
+NOW = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _snapshot(**values) -> DeviceSnapshot:
+    return DeviceSnapshot(dsn="A", values=values, updated_at=NOW)
+
+
+def test_ayla_snapshot_resolves_alternate_names_and_derives_status(make_softener):
+    device = make_softener(
+        properties=[
+            ("away_mode", 1, "integer"),
+            ("current_flow_rate", 25, "integer"),
+            ("days_salt_remaining", 40, "integer"),
+        ]
+    )
+
+    snapshot = build_snapshot(device, NOW)
+
+    assert snapshot.dsn == "AC000W000000001"
+    assert snapshot.get("vacation_mode") == 1
+    assert snapshot.get("status") == STATUS_VACATION
+    assert snapshot.get("current_flow_rate") == 2.5
+    assert snapshot.get("days_salt_remaining") == 40
+    assert "total_gallons_today" not in snapshot
+
+
+def test_culliganiot_snapshot_is_keyed_by_ayla_names(make_iot_softener):
+    device = make_iot_softener(datapoints={"days_salt_remaining": 12, "away_mode": 0, "unmapped": 1})
+
+    snapshot = build_snapshot(device, NOW)
+
+    assert snapshot.get("days_salt_remaining") == 12
+    assert snapshot.get("vacation_mode") == 0
+    assert snapshot.get("status") == STATUS_SOFTENING
+    assert "unmapped" not in snapshot.values
+
+
+def test_snapshot_values_are_read_only(make_softener):
+    snapshot = build_snapshot(make_softener(), NOW)
+
+    with pytest.raises(TypeError):
+        snapshot.values["status"] = STATUS_BYPASS
+
+
+def test_diff_snapshots_reports_changed_added_and_removed_keys():
+    previous = _snapshot(a=1, b=2, c=3)
+
+    assert diff_snapshots(None, previous) is None
+    assert diff_snapshots(previous, _snapshot(a=1, b=2, c=3)) == frozenset()
+    assert diff_snapshots(previous, _snapshot(a=1, b=5, d=4)) == {"b", "c", "d"}
+
+
+def test_overrides_re_derive_status():
+    snapshot = _snapshot(vacation_mode=0, standard_bypass=255, time_rem_in_position=0, status=STATUS_SOFTENING)
+
+    overridden = with_overrides(snapshot, {"standard_bypass": 6, "time_rem_in_position": 255})
+
+    assert overridden.get("status") == STATUS_BYPASS
+    assert snapshot.get("status") == STATUS_SOFTENING
+
+
+@pytest.mark.parametrize(("value", "on"), [(True, True), (1, True), (6, True), (0, False), (255, False), (False, False)])
+def test_status_and_switches_read_the_same_on_values(value, on):
+    assert (decode_status({"standard_bypass": value}) == STATUS_BYPASS) is on
+    assert switch_is_on("vacation_mode", _snapshot(vacation_mode=value)) is on
@@ -0,0 +1,25 @@
+"""Behaviour of the structured event tracer."""
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.trace import Tracer
+
+
+def test_tracer_is_bounded_and_sampled():
+    tracer = Tracer()
+    assert not tracer.enabled
+
+    tracer.start(size=2)
+    for index in range(3):
+        tracer.record("refresh", index=index)
+    assert [event["index"] for event in tracer.dump()] == [1, 2]
+
+    tracer.start(size=10, sample_rate=0.0)
+    tracer.record("refresh")
+    assert tracer.dump() == []
+
+    tracer.stop()
+    assert not tracer.enabled
@@ -0,0 +1,63 @@
+"""Behaviour of unloading an entry and shutting its coordinator down."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan import async_unload_entry
+from custom_components.culligan.const import DATA_SESSIONS
+
+
+async def test_shutdown_cancels_the_poll_but_not_the_task_that_asked_for_it(
+    make_coordinator, make_softener, cloud_api
+):
+    listing = asyncio.Event()
+
+    async def async_get_device_registry() -> dict:
+        listing.set()
+        await asyncio.Event().wait()
+
+    cloud_api.async_get_device_registry = async_get_device_registry
+    coordinator = make_coordinator([make_softener("A")], api=cloud_api)
+    caller = asyncio.create_task(coordinator.async_refresh())
+    await asyncio.wait_for(listing.wait(), 1)
+
+    await coordinator.async_shutdown()
+    await asyncio.wait_for(caller, 1)
+
+    assert not caller.cancelled()
+    assert not coordinator.last_update_success
+    assert not coordinator._poll_tasks
+
+
+@pytest.mark.parametrize("unloads", [True, False])
+async def test_the_coordinator_is_shut_down_only_once_every_platform_unloaded(
+    hass, make_coordinator, make_softener, unloads
+):
+    coordinator = make_coordinator([make_softener("A")])
+    config_entry = coordinator._config_entry
+    hass.data["culligan"] = {config_entry.entry_id: {"coordinator": coordinator}}
+    calls = []
+
+    async def async_forward_entry_unload(entry, platform):
+        calls.append(platform)
+        return unloads or platform != "sensor"
+
+    async def async_shutdown():
+        calls.append("shutdown")
+
+    hass.config_entries = SimpleNamespace(async_forward_entry_unload=async_forward_entry_unload)
+    coordinator.async_shutdown = async_shutdown
+
+    assert await async_unload_entry(hass, config_entry) is unloads
+
+    assert ("shutdown" in calls) is unloads
+    if unloads:
+        assert calls[-1] == "shutdown"
+        assert config_entry.entry_id in hass.data[DATA_SESSIONS]
+    else:
+        assert config_entry.entry_id in hass.data["culligan"]
@@ -0,0 +1,71 @@
+"""Timestamps of the usage windows imported into long-term statistics."""
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.culligan.const import DAILY_USAGE_KEYS, HOURLY_USAGE_KEYS
+from custom_components.culligan.usage_statistics import daily_slot_starts, hourly_slot_starts
+
+NOW = datetime(2024, 3, 10, 12, 34, 56, 789, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def time_zone():
+    """Switch the local time zone for one test."""
+    default = dt_util.DEFAULT_TIME_ZONE
+    yield lambda name: dt_util.set_default_time_zone(ZoneInfo(name))
+    dt_util.set_default_time_zone(default)
+
+
+def test_hourly_slots_start_on_the_current_and_previous_hours():
+    starts = hourly_slot_starts(NOW)
+
+    assert len(starts) == len(HOURLY_USAGE_KEYS)
+    assert starts[0] == datetime(2024, 3, 10, 12, tzinfo=timezone.utc)
+    assert starts[1] == datetime(2024, 3, 10, 11, tzinfo=timezone.utc)
+    assert starts[-1] == starts[0] - timedelta(hours=23)
+
+
+@pytest.mark.parametrize(
+    ("zone", "today"),
+    [
+        ("UTC", datetime(2024, 3, 10, 0, tzinfo=timezone.utc)),
+        ("America/New_York", datetime(2024, 3, 10, 5, tzinfo=timezone.utc)),
+        # +05:30, local midnight is 18:30 UTC
+        ("Asia/Kolkata", datetime(2024, 3, 9, 19, tzinfo=timezone.utc)),
+        # +05:45
+        ("Asia/Kathmandu", datetime(2024, 3, 9, 19, tzinfo=timezone.utc)),
+        # +10:30 in daylight saving time
+        ("Australia/Adelaide", datetime(2024, 3, 9, 14, tzinfo=timezone.utc)),
+        # -03:30
+        ("America/St_Johns", datetime(2024, 3, 10, 4, tzinfo=timezone.utc)),
+    ],
+)
+def test_daily_slots_start_on_a_utc_hour_within_the_local_day(time_zone, zone, today):
+    time_zone(zone)
+
+    starts = daily_slot_starts(NOW)
+
+    assert len(starts) == len(DAILY_USAGE_KEYS)
+    assert starts[0] == today
+    for slot, start in enumerate(starts):
+        assert (start.minute, start.second, start.microsecond) == (0, 0, 0)
+        local_day = dt_util.as_local(NOW).date() - timedelta(days=slot)
+        assert dt_util.as_local(start).date() == local_day
+
+
+def test_daily_slots_follow_daylight_saving_changes(time_zone):
+    # New York moved to daylight saving time early on 2024-03-10
+    time_zone("America/New_York")
+
+    starts = daily_slot_starts(NOW + timedelta(days=1))
+
+    assert starts[0] == datetime(2024, 3, 11, 4, tzinfo=timezone.utc)
+    assert starts[1] == datetime(2024, 3, 10, 5, tzinfo=timezone.utc)
@@ -0,0 +1,76 @@
+"""Behaviour of the deadband filtering of noisy sensor writes."""
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("ayla_iot_unofficial")
+pytest.importorskip("culligan")
+
+from custom_components.culligan.entity_descriptions import SOFTENER_SENSORS, WriteFilter
+from custom_components.culligan.sensor import SoftenerSensor
+
+
+def test_write_filter_absolute_deadband():
+    write_filter = WriteFilter(absolute=0.5)
+
+    assert not write_filter.is_significant(10, 10)
+    assert not write_filter.is_significant(10, 10.4)
+    assert write_filter.is_significant(10, 10.5)
+    assert write_filter.is_significant(10, 9.5)
+
+
+def test_write_filter_percent_deadband():
+    write_filter = WriteFilter(percent=10)
+
+    assert not write_filter.is_significant(50, 54)
+    assert write_filter.is_significant(50, 55)
+    # any move away from zero is significant, there is no percentage of it
+    assert write_filter.is_significant(0, 0.1)
+
+
+def test_write_filter_passes_any_change_without_a_deadband():
+    write_filter = WriteFilter(min_interval=30)
+
+    assert write_filter.is_significant(1, 1.01)
+    assert not write_filter.is_significant(1, 1)
+
+
+def test_write_filter_compares_non_numeric_values_for_equality():
+    write_filter = WriteFilter(absolute=5)
+
+    assert write_filter.is_significant(None, 3)
+    assert write_filter.is_significant(3, None)
+    assert not write_filter.is_significant("a", "a")
+    assert write_filter.is_significant("a", "b")
+
+
+def _softener_sensor(hass, coordinator, key: str) -> SoftenerSensor:
+    """Create a softener sensor that records its state writes instead of making them."""
+    description = next(description for description in SOFTENER_SENSORS if description.key == key)
+    sensor = SoftenerSensor(coordinator, coordinator.culligan_devices["A"], description)
+    sensor.hass = hass
+    sensor.writes = []
+    sensor.async_write_ha_state = lambda: sensor.writes.append((sensor.native_value, sensor.icon))
+    return sensor
+
+
+async def test_softener_sensor_writes_only_significant_changes(hass, make_coordinator, make_softener):
+    coordinator = make_coordinator([make_softener("A", [("current_flow_rate", 20, "integer")])])
+    coordinator.async_push_datapoints("A", {"current_flow_rate": 2.0})
+    sensor = _softener_sensor(hass, coordinator, "current_flow_rate")
+    sensor._written_at -= 60
+
+    coordinator.async_push_datapoints("A", {"current_flow_rate": 2.1})
+    sensor._handle_coordinator_update()
+    assert sensor.native_value == 2.0
+
+    coordinator.async_push_datapoints("A", {"current_flow_rate": 2.5})
+    sensor._handle_coordinator_update()
+    # held back by the minimum write interval
+    coordinator.async_push_datapoints("A", {"current_flow_rate": 3.0})
+    sensor._handle_coordinator_update()
+
+    assert sensor.writes == [(2.5, sensor.icon)]
+    # run the held back write now rather than when its timer fires
+    sensor._unsub_pending_write()
+    sensor._async_write_pending(None)
+    assert [value for value, _icon in sensor.writes] == [2.5, 3.0]